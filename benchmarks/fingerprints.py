@@ -0,0 +1,46 @@
+"""
+Micro-benchmarks for the fingerprints that resources compute for every cache lookup.
+Run from the repository root with: python benchmarks/fingerprints.py
+"""
+from timeit import repeat
+from urllib.parse import urlencode
+
+from urlobject import URLObject
+
+from datagrowth.utils.fingerprints import (FINGERPRINT_ALGORITHMS, normalize_uri, normalize_legacy_uri,
+                                           hash_legacy_data, hash_signature, xxhash)
+
+
+URL = "https://example.com/api/v1/search?query=data+growth&page=3&size=100&sort=date;lang=en&filter=%C3%A9"
+DATA = {
+    "query": "data growth",
+    "filters": {"language": "en", "years": [2020, 2021, 2022], "nested": {"deep": True}},
+    "page": 3,
+    "fields": ["title", "description", "authors"],
+}
+SIGNATURE_DATA = dict(DATA, document=b"0" * 4096)
+
+
+def urlobject_uri(url: str) -> str:
+    # The URLObject based normalization that legacy resources used before normalize_legacy_uri
+    url = URLObject(url)
+    params = sorted(url.query.dict.items(), key=lambda item: item[0])
+    url = url.with_query(urlencode(params))
+    return str(url).replace(url.scheme + "://", "")
+
+
+def report(name: str, statement, number: int = 20000) -> None:
+    best = min(repeat(statement, number=number, repeat=5))
+    print(f"{name:<40} {best / number * 1000000:8.2f} µs")
+
+
+if __name__ == "__main__":
+    report("URLObject uri", lambda: urlobject_uri(URL))
+    report("normalize_legacy_uri", lambda: normalize_legacy_uri(URL))
+    report("normalize_uri", lambda: normalize_uri(URL))
+    for algorithm in FINGERPRINT_ALGORITHMS:
+        if algorithm == "xxh3_128" and xxhash is None:
+            print(f"Skipping {algorithm}, because the xxhash package is not installed")
+            continue
+        report(f"hash_legacy_data ({algorithm})", lambda: hash_legacy_data(DATA, algorithm))
+        report(f"hash_signature ({algorithm})", lambda: hash_signature(URL, SIGNATURE_DATA, algorithm))
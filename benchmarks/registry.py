@@ -0,0 +1,61 @@
+"""
+Micro-benchmarks for the registry lookups that happen whenever resources or processors get created.
+Run from the repository root with: python benchmarks/registry.py
+"""
+from timeit import repeat
+from typing import cast
+
+from datagrowth.configuration import create_config
+from datagrowth.protocols import ProcessorProtocol
+from datagrowth.registry import DATAGROWTH_REGISTRY, Registry, Tag
+from datagrowth.registry.types import _import_class
+from datagrowth.processors import Processor
+from datagrowth.resources.http.extractors.requests import RequestsExtractor
+
+
+class BenchmarkProcessor(Processor):
+    pass
+
+
+def uncached_tag(string: str) -> Tag:
+    # The parsing that tag strings went through before tags got interned
+    category, value = string.split(":")
+    return Tag(category=category.lower(), value=value.lower())
+
+
+def uncached_get_extractor(registry: Registry, tag_string: str) -> RequestsExtractor:
+    # The lookups that get_extractor did before tags and imports got remembered
+    tag = uncached_tag(tag_string)
+    extractor_cls = _import_class(registry.classes[tag])
+    overrides = create_config(extractor_cls.config._namespace, {})
+    base = registry.configurations[tag]
+    config = create_config(base._namespace, base.to_dict(private=True, protected=True))
+    config.update(overrides.to_dict(protected=True))
+    return extractor_cls(config=config)
+
+
+def uncached_create_processor(registry: Registry, processor_name: str) -> Processor:
+    processor_class = _import_class(registry.classes[uncached_tag(f"processor:{processor_name}")])
+    return processor_class(config={})
+
+
+def report(name: str, statement, number: int = 20000) -> None:
+    best = min(repeat(statement, number=number, repeat=5))
+    print(f"{name:<40} {best / number * 1000000:8.2f} µs")
+
+
+if __name__ == "__main__":
+    registry = Registry()
+    registry.register_extractor("extractor:benchmark", RequestsExtractor, {"timeout": 10, "backoff_delays": [1, 2]})
+    # Processors accept configurations as dicts, which ProcessorProtocol doesn't describe
+    DATAGROWTH_REGISTRY.register_processor(
+        "processor:benchmarkprocessor", cast(type[ProcessorProtocol], BenchmarkProcessor)
+    )
+
+    report("Tag parsing (uncached)", lambda: uncached_tag("extractor:benchmark"))
+    report("Tag.from_string", lambda: Tag.from_string("extractor:benchmark"))
+    report("get_extractor (uncached)", lambda: uncached_get_extractor(registry, "extractor:benchmark"), 2000)
+    report("get_extractor", lambda: registry.get_extractor("extractor:benchmark"), 2000)
+    report("get_shared_extractor", lambda: registry.get_shared_extractor("extractor:benchmark"))
+    report("create_processor (uncached)", lambda: uncached_create_processor(DATAGROWTH_REGISTRY, "benchmarkprocessor"))
+    report("create_processor", lambda: Processor.create_processor("benchmarkprocessor", {}))
@@ -4,6 +4,9 @@ class DGResourceException(Exception):
         super().__init__(message)
         self.resource = resource
 
+    def __reduce__(self):
+        return self.__class__, (*self.args, self.resource,), self.__dict__
+
 
 class DGShellError(DGResourceException):
     pass
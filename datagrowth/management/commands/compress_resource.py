@@ -0,0 +1,45 @@
+import logging
+
+from django.core.management.base import CommandError, LabelCommand
+from django.apps import apps
+
+from datagrowth.resources.http.generic import CompressedBodyMixin
+from datagrowth.utils.compression import compress
+
+
+log = logging.getLogger("datagrowth.command")
+
+
+class Command(LabelCommand):
+    """
+    Moves uncompressed bodies of a HttpResource with the CompressedBodyMixin into its compressed body column in chunks
+    """
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("-a", "--algorithm", type=str, default="zlib", choices=["zlib", "lzma", "zstd"])
+        parser.add_argument("-b", "--batch-size", type=int, default=500)
+
+    def handle_label(self, label, **options):
+        Resource = apps.get_model(label)
+        if not issubclass(Resource, CompressedBodyMixin):
+            raise CommandError(f"{label} needs the CompressedBodyMixin to store compressed bodies")
+        algorithm = options["algorithm"]
+        batch_size = options["batch_size"]
+        queryset = Resource.objects.filter(body__isnull=False, body_compressed__isnull=True) \
+            .only("id", "body", "body_compressed") \
+            .order_by("id")
+        last_id = 0
+        count = 0
+        while True:
+            # Filtering on id instead of slicing with offsets keeps every chunk query fast
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            for resource in batch:
+                resource.body_compressed = compress(resource.body.encode("utf-8"), algorithm)
+                resource.body = None
+            Resource.objects.bulk_update(batch, ["body", "body_compressed"])
+            last_id = batch[-1].id
+            count += len(batch)
+            log.info(f"Compressed {count} {Resource.get_name()} bodies")
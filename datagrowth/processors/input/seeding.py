@@ -5,6 +5,7 @@ from requests import Session
 
 from datagrowth.datatypes.documents.db.collection import CollectionBase
 from datagrowth.configuration import create_config, ConfigurationType
+from datagrowth.resources.buffers import ResourceBuffer
 from datagrowth.resources.http.iterators import send_serie_iterator
 from datagrowth.processors.base import Processor, ProcessorFactory
 from datagrowth.processors.input.iterators import content_iterator
@@ -217,8 +218,12 @@ class HttpSeedingProcessor(ResourceSeedingProcessor):
 
     resource_type = "http_resource"
 
-    def get_session(self) -> Session:
-        return Session()
+    def get_session(self) -> Session | None:
+        """
+        Override this method to provide a session with for instance authentication to all resources.
+        By default None is returned, which lets resources use the shared sessions from the session pool.
+        """
+        return None
 
     def get_resource_iterator(self, args_list: List[Any], kwargs_list: List[Dict],
                               resource_config: ConfigurationType) -> Iterator:
@@ -226,7 +231,8 @@ class HttpSeedingProcessor(ResourceSeedingProcessor):
             args_list, kwargs_list,
             method=resource_config.method,
             config=resource_config,
-            session=self.get_session()
+            session=self.get_session(),
+            buffer=ResourceBuffer.from_config(resource_config)
         )
 
 
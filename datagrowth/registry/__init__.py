@@ -1,4 +1,10 @@
+import os
+
 from datagrowth.registry.types import Registry, Tag
 
 
 DATAGROWTH_REGISTRY = Registry()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DATAGROWTH_REGISTRY.reset_shared)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, cast
+from typing import Any, Callable, ClassVar, cast
+import json
 import importlib
+from threading import Lock
 from dataclasses import dataclass, field
 from pydantic import BaseModel
 
@@ -43,16 +45,24 @@ class Tag(BaseModel):
     category: str
     value: str
 
+    # Tags parsed from the same string are the same instance, which makes parsing tag strings cheap
+    interned: ClassVar[dict[str, Tag]] = {}
+
     @classmethod
     def from_strings(cls, *args: str) -> list[Tag]:
         return [cls.from_string(string) for string in args]
 
     @classmethod
     def from_string(cls, string: str) -> Tag:
+        tag = cls.interned.get(string)
+        if tag is not None and type(tag) is cls:
+            return tag
         assert string.count(":") == 1, \
             "Expected Tag string to contain a single semicolon separating categories and values"
         category, value = string.split(":")
-        return cls(category=category.lower(), value=value.lower())
+        tag = cls(category=category.lower(), value=value.lower())
+        cls.interned[string] = tag
+        return tag
 
     #####################
     # Pydantic plumbing
@@ -66,7 +76,7 @@ class Tag(BaseModel):
         return f"{self.category}:{self.value}"
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return hash((self.category, self.value,))
 
 
 @dataclass
@@ -75,6 +85,9 @@ class Registry:
     namespaces: set[Tag] = field(default_factory=set)
     classes: dict[Tag, str] = field(default_factory=dict)
     configurations: dict[Tag, ConfigurationType] = field(default_factory=dict)
+    imports: dict[Tag, tuple[str, type]] = field(default_factory=dict)
+    shared: dict[tuple[Tag, str], Any] = field(default_factory=dict)
+    shared_lock: Lock = field(default_factory=Lock, repr=False, compare=False)
 
     #####################
     # Tags
@@ -107,8 +120,13 @@ class Registry:
         for tag in self.tags_by_category(category):
             self.classes.pop(tag, None)
             self.configurations.pop(tag, None)
+            self.clear_caches(tag)
             del self.tags[str(tag)]
 
+    def clear_caches(self, tag: Tag) -> None:
+        self.imports.pop(tag, None)
+        self.clear_shared(tag)
+
     #####################
     # Namespaces
     #####################
@@ -145,17 +163,26 @@ class Registry:
             tag = Tag.from_string(tag)
         tag = self.register_tag(tag)
         self.classes[tag] = f"{clazz.__module__}.{clazz.__qualname__}"
+        self.imports.pop(tag, None)
         return tag
 
     def unregister_class(self, tag: str | Tag) -> None:
         if isinstance(tag, str):
             tag = Tag.from_string(tag)
         del self.classes[tag]
+        self.imports.pop(tag, None)
 
     def get_class(self, tag: str | Tag) -> type:
         if isinstance(tag, str):
             tag = Tag.from_string(tag)
-        return _import_class(self.classes[tag])
+        # Imports are remembered together with their path to notice classes that get set directly
+        path = self.classes[tag]
+        imported = self.imports.get(tag)
+        if imported is not None and imported[0] == path:
+            return imported[1]
+        clazz = _import_class(path)
+        self.imports[tag] = (path, clazz,)
+        return clazz
 
     #####################
     # Configurations
@@ -184,6 +211,50 @@ class Registry:
             config.update(overrides.to_dict(protected=True))
         return config
 
+    #####################
+    # Shared instances
+    #####################
+
+    @staticmethod
+    def _get_overrides_key(overrides: ConfigurationType | dict | None) -> str:
+        if not overrides:
+            return ""
+        if isinstance(overrides, ConfigurationType):
+            overrides = overrides.to_dict(protected=True)
+        return json.dumps(overrides, sort_keys=True, default=repr)
+
+    def _get_shared(self, tag: Tag, overrides: ConfigurationType | dict | None,
+                    factory: Callable[[Tag, ConfigurationType | dict | None], Any]) -> Any:
+        key = (tag, self._get_overrides_key(overrides),)
+        instance = self.shared.get(key)
+        if instance is not None:
+            return instance
+        with self.shared_lock:
+            if key not in self.shared:
+                self.shared[key] = factory(tag, overrides)
+            return self.shared[key]
+
+    def clear_shared(self, tag: str | Tag | None = None) -> None:
+        """
+        Forgets shared instances of a tag or all shared instances when no tag is given.
+        New instances get created the next time a shared instance is requested.
+        """
+        if isinstance(tag, str):
+            tag = Tag.from_string(tag)
+        with self.shared_lock:
+            if tag is None:
+                self.shared = {}
+                return
+            self.shared = {key: instance for key, instance in self.shared.items() if key[0] != tag}
+
+    def reset_shared(self) -> None:
+        """
+        Forgets all shared instances without waiting for other threads.
+        Used in child processes after a fork, where instances may hold connections of the parent process.
+        """
+        self.shared = {}
+        self.shared_lock = Lock()
+
     #####################
     # Processors
     #####################
@@ -199,6 +270,7 @@ class Registry:
         config = self._normalize_config(namespace, config)
         if config:
             self.configurations[tag] = config
+        self.clear_caches(tag)
         return tag
 
     def unregister_processor(self, tag: str | Tag) -> None:
@@ -208,13 +280,14 @@ class Registry:
             raise ValueError(f"Expected a tag with 'processor' category but found '{tag.category}'")
         del self.classes[tag]
         self.configurations.pop(tag, None)
+        self.clear_caches(tag)
 
     def get_processor(self, tag: str | Tag, overrides: ConfigurationType | dict | None = None) -> ProcessorProtocol:
         if isinstance(tag, str):
             tag = Tag.from_string(tag)
         if tag.category != "processor":
             raise ValueError(f"Expected a tag with 'processor' category but found '{tag.category}'")
-        processor_cls = cast(type[ProcessorProtocol], _import_class(self.classes[tag]))
+        processor_cls = cast(type[ProcessorProtocol], self.get_class(tag))
         namespace = _get_config_namespace(processor_cls.config)
         merged = self._normalize_config(namespace, overrides)
         if merged is None:
@@ -247,6 +320,7 @@ class Registry:
         config = self._normalize_config(namespace, config)
         if config:
             self.configurations[tag] = config
+        self.clear_caches(tag)
         return tag
 
     def unregister_resource(self, tag: str | Tag) -> None:
@@ -256,13 +330,14 @@ class Registry:
             raise ValueError(f"Expected a tag with 'resource' category but found '{tag.category}'")
         del self.classes[tag]
         self.configurations.pop(tag, None)
+        self.clear_caches(tag)
 
     def get_resource(self, tag: str | Tag, overrides: ConfigurationType | dict | None = None) -> ResourceProtocol:
         if isinstance(tag, str):
             tag = Tag.from_string(tag)
         if tag.category != "resource":
             raise ValueError(f"Expected a tag with 'resource' category but found '{tag.category}'")
-        resource_cls = cast(type[ResourceProtocol], _import_class(self.classes[tag]))
+        resource_cls = cast(type[ResourceProtocol], self.get_class(tag))
         namespace = self._get_resource_namespace(resource_cls)
         merged = self._normalize_config(namespace, overrides)
         if merged is None:
@@ -285,6 +360,7 @@ class Registry:
         config = self._normalize_config(namespace, config)
         if config:
             self.configurations[tag] = config
+        self.clear_caches(tag)
         return tag
 
     def unregister_storage(self, tag: str | Tag) -> None:
@@ -294,13 +370,14 @@ class Registry:
             raise ValueError(f"Expected a tag with 'storage' category but found '{tag.category}'")
         del self.classes[tag]
         self.configurations.pop(tag, None)
+        self.clear_caches(tag)
 
     def get_storage(self, tag: str | Tag, overrides: ConfigurationType | dict | None = None) -> ResourceStorageProtocol:
         if isinstance(tag, str):
             tag = Tag.from_string(tag)
         if tag.category != "storage":
             raise ValueError(f"Expected a tag with 'storage' category but found '{tag.category}'")
-        storage_cls = cast(type[ResourceStorageProtocol], _import_class(self.classes[tag]))
+        storage_cls = cast(type[ResourceStorageProtocol], self.get_class(tag))
         namespace = _get_config_namespace(storage_cls.config)
         merged = self._normalize_config(namespace, overrides)
         if merged is None:
@@ -308,6 +385,16 @@ class Registry:
         config = self.get_configuration(tag, merged)
         return storage_cls(config=config)  # type: ignore[reportCallIssue]
 
+    def get_shared_storage(self, tag: str | Tag,
+                           overrides: ConfigurationType | dict | None = None) -> ResourceStorageProtocol:
+        """
+        Returns the same storage instance for every call with the same tag and overrides.
+        Shared storages are used by Resources from different threads and shouldn't hold state per Resource.
+        """
+        if isinstance(tag, str):
+            tag = Tag.from_string(tag)
+        return cast(ResourceStorageProtocol, self._get_shared(tag, overrides, self.get_storage))
+
     #####################
     # Extractors
     #####################
@@ -323,6 +410,7 @@ class Registry:
         config = self._normalize_config(namespace, config)
         if config:
             self.configurations[tag] = config
+        self.clear_caches(tag)
         return tag
 
     def unregister_extractor(self, tag: str | Tag) -> None:
@@ -332,6 +420,7 @@ class Registry:
             raise ValueError(f"Expected a tag with 'extractor' category but found '{tag.category}'")
         del self.classes[tag]
         self.configurations.pop(tag, None)
+        self.clear_caches(tag)
 
     def get_extractor(self, tag: str | Tag,
                       overrides: ConfigurationType | dict | None = None) -> ResourceExtractorProtocol[Any]:
@@ -339,10 +428,20 @@ class Registry:
             tag = Tag.from_string(tag)
         if tag.category != "extractor":
             raise ValueError(f"Expected a tag with 'extractor' category but found '{tag.category}'")
-        extractor_cls = cast(type[ResourceExtractorProtocol[Any]], _import_class(self.classes[tag]))
+        extractor_cls = cast(type[ResourceExtractorProtocol[Any]], self.get_class(tag))
         namespace = _get_config_namespace(extractor_cls.config)
         merged = self._normalize_config(namespace, overrides)
         if merged is None:
             merged = create_config(namespace, {})
         config = self.get_configuration(tag, merged)
         return extractor_cls(config=config)  # type: ignore[reportCallIssue]
+
+    def get_shared_extractor(self, tag: str | Tag,
+                             overrides: ConfigurationType | dict | None = None) -> ResourceExtractorProtocol[Any]:
+        """
+        Returns the same extractor instance for every call with the same tag and overrides.
+        Shared extractors are used by Resources from different threads and shouldn't hold state per Resource.
+        """
+        if isinstance(tag, str):
+            tag = Tag.from_string(tag)
+        return cast(ResourceExtractorProtocol[Any], self._get_shared(tag, overrides, self.get_extractor))
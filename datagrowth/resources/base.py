@@ -1,5 +1,6 @@
 import warnings
 import logging
+from contextlib import contextmanager
 from datetime import timedelta
 
 from django.conf import settings
@@ -9,6 +10,8 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.utils.timezone import now
 
 from datagrowth import configuration
+from datagrowth.utils.data import ContentCache
+from datagrowth.resources.cache import DATAGROWTH_RESOURCE_CACHE
 
 
 log = logging.getLogger("datagrowth")
@@ -77,6 +80,44 @@ class Resource(models.Model):
         self.clean()
         self.save()
 
+    def save(self, *args, **kwargs):
+        if self._shared_insert is None or self.pk is not None:
+            super().save(*args, **kwargs)
+        else:
+            self._save_shared(self._shared_insert, *args, **kwargs)
+        DATAGROWTH_RESOURCE_CACHE.discard(self)
+
+    def _save_shared(self, shared_insert, *args, **kwargs):
+        # Copies of an unsaved resource that got shared by single flight update the row that the first copy inserted
+        with shared_insert.lock:
+            inserted = shared_insert.instance
+            if inserted is not None:
+                self.pk = inserted.pk
+                self.created_at = inserted.created_at
+                self._state.adding = False
+            super().save(*args, **kwargs)
+            if inserted is None:
+                shared_insert.instance = self
+
+    def delete(self, *args, **kwargs):
+        DATAGROWTH_RESOURCE_CACHE.discard(self)
+        return super().delete(*args, **kwargs)
+
+    @contextmanager
+    def saving(self):
+        """
+        Prepares the resource for writing it to the database, either by ``save`` or in bulk by a ``ResourceBuffer``.
+        Override this context manager to temporarily change fields only while the resource gets written.
+        """
+        yield
+
+    async def aclose(self):
+        """
+        The asyncio variant of ``close``, which saves the model with Django's async ORM.
+        """
+        self.clean()
+        await self.asave()
+
     def close_snapshot(self, storage):
         """
         This function is here to make Resource compliant with the ResourceProtocol.
@@ -93,6 +134,15 @@ class Resource(models.Model):
         """
         return cls._meta.model_name
 
+    def get_cache_key(self) -> tuple:
+        """
+        Returns the key under which the resource gets stored by the in-process resource cache.
+        Resources that get looked up by more than their uri should extend this key.
+
+        :return: (tuple) a hashable key
+        """
+        return self._meta.label, self.uri,
+
     #######################################################
     # RESOURCE ABSTRACTION
     #######################################################
@@ -127,6 +177,26 @@ class Resource(models.Model):
         """
         raise NotImplementedError(f"Missing implementation for content property on {self.__class__.__name__}")
 
+    _content_cache = None
+    _shared_insert = None
+
+    def memoize_content(self, sources, parse):
+        """
+        Returns the content that parse returns and reuses that content as long as the sources remain unchanged.
+        Memoization only happens with the ``content_cache`` configuration.
+        With the ``content_read_only`` configuration returned dicts and lists can't be changed,
+        which protects the cached content from modifications by callers. Other data, like parsed HTML, can be changed.
+
+        :param sources: (tuple) the values that the content gets parsed from
+        :param parse: (callable) returns the content_type and data
+        :return: content_type, data
+        """
+        if not self.config.content_cache:
+            return parse()
+        if self._content_cache is None:
+            self._content_cache = ContentCache()
+        return self._content_cache.get(sources, parse, read_only=self.config.content_read_only)
+
     @property
     def success(self):
         """
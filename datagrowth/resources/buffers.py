@@ -0,0 +1,119 @@
+from contextlib import ExitStack
+from threading import RLock
+from time import monotonic
+
+from django.db import connections, router, transaction
+
+from datagrowth.configuration import ConfigurationType
+from datagrowth.resources.cache import DATAGROWTH_RESOURCE_CACHE
+
+
+class ResourceBuffer:
+    """
+    Collects closed resources and writes them to the database in bulk.
+    New resources get inserted with ``bulk_create`` and stored resources get updated with ``bulk_update``.
+    The buffer gets flushed when it holds ``batch_size`` resources
+    or when a resource gets added ``interval`` seconds after the first resource got added.
+
+    Resources only get an id after the buffer flushed.
+    Buffered resources get cleaned and written within their ``saving`` context, but overrides of ``close`` or ``save``
+    don't get called and Django sends no ``pre_save`` or ``post_save`` signals for them.
+    On databases that can't return ids from bulk inserts new resources get saved one by one instead.
+    Resources can be added from multiple threads.
+    """
+
+    def __init__(self, batch_size: int = 100, interval: float | None = None) -> None:
+        assert batch_size > 0, "ResourceBuffer expects a batch_size above zero"
+        self.batch_size = batch_size
+        self.interval = interval
+        self.resources = {}
+        self.started_at: float | None = None
+        self.lock = RLock()
+
+    @classmethod
+    def from_config(cls, config: ConfigurationType) -> "ResourceBuffer | None":
+        """
+        Creates a buffer based on the ``resource_buffer_size`` and ``resource_buffer_interval`` configurations.
+        Returns None when buffering is disabled by a ``resource_buffer_size`` of zero.
+        """
+        if not config.resource_buffer_size:
+            return None
+        return cls(batch_size=config.resource_buffer_size, interval=config.resource_buffer_interval)
+
+    def add(self, resource) -> None:
+        """
+        Cleans the resource and adds it to the buffer, which is the buffered equivalent of ``Resource.close``.
+
+        :param resource: (Resource) a resource to write to the database
+        """
+        resource.clean()
+        with self.lock:
+            if not self.resources:
+                self.started_at = monotonic()
+            # The same resource may get added more than once, for instance when it's used as cache in a serie
+            self.resources[id(resource)] = resource
+            if self.is_full():
+                self.flush()
+
+    def is_full(self) -> bool:
+        if len(self.resources) >= self.batch_size:
+            return True
+        if self.interval is None or self.started_at is None:
+            return False
+        return monotonic() - self.started_at >= self.interval
+
+    def flush(self) -> None:
+        """
+        Writes all buffered resources to the database.
+        """
+        with self.lock:
+            resources = list(self.resources.values())
+            self.resources = {}
+            self.started_at = None
+            models = {}
+            for resource in resources:
+                models.setdefault(type(resource), []).append(resource)
+            for model, instances in models.items():
+                self._write(model, instances)
+
+    @staticmethod
+    def _write(model, instances) -> None:
+        database = router.db_for_write(model)
+        created = [instance for instance in instances if instance.pk is None]
+        updated = [instance for instance in instances if instance.pk is not None]
+        with transaction.atomic(using=database):
+            if created and not connections[database].features.can_return_rows_from_bulk_insert:
+                for instance in created:
+                    instance.save(using=database)
+                created = []
+            with ExitStack() as stack:
+                for instance in created + updated:
+                    stack.enter_context(instance.saving())
+                if created:
+                    model.objects.using(database).bulk_create(created)
+                if updated:
+                    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+                    for instance in updated:
+                        # Fields like modified_at get updated by save, but not by bulk_update
+                        for field in fields:
+                            if getattr(field, "auto_now", False):
+                                field.pre_save(instance, add=False)
+                    model.objects.using(database).bulk_update(updated, [field.name for field in fields])
+        for instance in instances:
+            DATAGROWTH_RESOURCE_CACHE.discard(instance)
+
+    def __enter__(self) -> "ResourceBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+
+
+def close_resource(resource, buffer: ResourceBuffer | None = None) -> None:
+    """
+    Closes a resource directly or adds it to the buffer when a buffer is given.
+    """
+    if buffer is None:
+        resource.close()
+    else:
+        buffer.add(resource)
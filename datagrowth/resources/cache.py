@@ -0,0 +1,138 @@
+import os
+from collections import OrderedDict
+from copy import copy
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable
+
+from datagrowth.configuration import ConfigurationType
+
+
+MISSING = object()
+
+
+class ResourceCache:
+    """
+    Keeps resources that were looked up in the database in memory for the lifetime of a process,
+    such that repeated lookups of the same resource don't query the database and hydrate a model again.
+
+    The cache is a LRU cache that holds at most ``resource_cache_size`` resources
+    for ``resource_cache_ttl`` seconds at a time. Lookups for resources that don't exist get cached as well
+    when ``resource_cache_negative`` is set, but only for ``cache_only`` lookups,
+    because other lookups will store the missing resource themselves.
+    Resources get removed from the cache when they get saved or deleted.
+    Changes to the database made by other processes or by queryset updates are picked up once entries expire.
+
+    Callers get a shallow copy of cached resources, which means that nested values like headers are shared.
+    The cache is thread safe and forgets all resources in child processes after a fork.
+    """
+
+    def __init__(self) -> None:
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def copy_resource(resource: Any) -> Any:
+        if resource is None:
+            return None
+        clone = copy(resource)
+        # Parsed content gets shared otherwise and may be modified by consumers of another copy
+        clone._content_cache = None
+        return clone
+
+    def get(self, key: Hashable, config: ConfigurationType) -> Any:
+        """
+        Returns a copy of the cached resource for the given key.
+        Returns None for a cached lookup of a missing resource and MISSING if the key isn't in the cache.
+
+        :param key: (Hashable) the cache key of a resource as returned by ``get_cache_key``
+        :param config: (ConfigurationType) the configuration of the resource doing the lookup
+        :return: Resource, None or MISSING
+        """
+        if not config.resource_cache_size:
+            return MISSING
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, resource = entry
+                if expires_at <= monotonic():
+                    del self.entries[key]
+                elif resource is not None or config.cache_only:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return self.copy_resource(resource)
+            self.misses += 1
+        return MISSING
+
+    def set(self, key: Hashable, resource: Any, config: ConfigurationType) -> None:
+        """
+        Stores a copy of a resource that was looked up in the database under the given key.
+        Pass None as resource to store that the resource doesn't exist.
+
+        :param key: (Hashable) the cache key of a resource as returned by ``get_cache_key``
+        :param resource: (Resource) the resource to store or None
+        :param config: (ConfigurationType) the configuration of the resource doing the lookup
+        """
+        if not config.resource_cache_size:
+            return
+        if resource is None and not (config.cache_only and config.resource_cache_negative):
+            return
+        with self.lock:
+            self.entries[key] = (monotonic() + config.resource_cache_ttl, self.copy_resource(resource),)
+            self.entries.move_to_end(key)
+            while len(self.entries) > config.resource_cache_size:
+                self.entries.popitem(last=False)
+
+    def discard(self, resource: Any) -> None:
+        """
+        Removes a resource from the cache, which is necessary when it gets saved or deleted.
+
+        :param resource: (Resource) the resource to remove
+        """
+        if not self.entries:
+            return
+        key = resource.get_cache_key()
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def info(self) -> dict[str, int]:
+        """
+        Returns the hits, misses and current size of the cache.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.entries),
+            }
+
+    def clear(self) -> None:
+        """
+        Removes all resources from the cache and resets the hit and miss counters.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def reset(self) -> None:
+        """
+        Forgets all resources. Used in child processes after a fork,
+        where the lock may have been held by a thread of the parent process.
+        """
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+DATAGROWTH_RESOURCE_CACHE = ResourceCache()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DATAGROWTH_RESOURCE_CACHE.reset)
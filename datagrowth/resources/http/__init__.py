@@ -1,4 +1,5 @@
 from datagrowth.resources.http.extractors.requests import RequestsExtractor
+from datagrowth.resources.http.extractors.httpx import HttpxExtractor
 from datagrowth.resources.storage.file_system import FileSystemStorage
 
 # Below this file implements a lazy loading pattern to prevent Django from being imported too often.
@@ -7,8 +8,10 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from datagrowth.resources.http.decorators import load_session
     from datagrowth.resources.http.files import HttpFileResource, HttpImageResource, file_resource_delete_handler
-    from datagrowth.resources.http.generic import HttpResource, MicroServiceResource, TestClientResource, URLResource
-    from datagrowth.resources.http.iterators import send_iterator, send_serie_iterator
+    from datagrowth.resources.http.generic import (BodyFileMixin, CompressedBodyMixin, HttpResource,
+                                                   MicroServiceResource, TestClientResource, URLResource)
+    from datagrowth.resources.http.iterators import (send_iterator, send_serie_iterator, asend_iterator,
+                                                     asend_serie_iterator)
 
 
 __all__ = [
@@ -16,18 +19,25 @@ __all__ = [
     "URLResource",
     "MicroServiceResource",
     "TestClientResource",
+    "CompressedBodyMixin",
+    "BodyFileMixin",
     "HttpFileResource",
     "HttpImageResource",
     "file_resource_delete_handler",
     "load_session",
     "send_iterator",
     "send_serie_iterator",
+    "asend_iterator",
+    "asend_serie_iterator",
 ]
 
 
 def __getattr__(name: str) -> Any:
-    if name in {"HttpResource", "URLResource", "MicroServiceResource", "TestClientResource"}:
+    if name in {"HttpResource", "URLResource", "MicroServiceResource", "TestClientResource", "CompressedBodyMixin",
+                "BodyFileMixin"}:
         from datagrowth.resources.http.generic import (
+            BodyFileMixin as _BodyFileMixin,
+            CompressedBodyMixin as _CompressedBodyMixin,
             HttpResource as _HttpResource,
             MicroServiceResource as _MicroServiceResource,
             TestClientResource as _TestClientResource,
@@ -38,6 +48,8 @@ def __getattr__(name: str) -> Any:
             "URLResource": _URLResource,
             "MicroServiceResource": _MicroServiceResource,
             "TestClientResource": _TestClientResource,
+            "CompressedBodyMixin": _CompressedBodyMixin,
+            "BodyFileMixin": _BodyFileMixin,
         }[name]
 
     if name in {"HttpFileResource", "HttpImageResource", "file_resource_delete_handler"}:
@@ -56,14 +68,18 @@ def __getattr__(name: str) -> Any:
         from datagrowth.resources.http.decorators import load_session as _load_session
         return _load_session
 
-    if name in {"send_iterator", "send_serie_iterator"}:
+    if name in {"send_iterator", "send_serie_iterator", "asend_iterator", "asend_serie_iterator"}:
         from datagrowth.resources.http.iterators import (
             send_iterator as _send_iterator,
             send_serie_iterator as _send_serie_iterator,
+            asend_iterator as _asend_iterator,
+            asend_serie_iterator as _asend_serie_iterator,
         )
         return {
             "send_iterator": _send_iterator,
             "send_serie_iterator": _send_serie_iterator,
+            "asend_iterator": _asend_iterator,
+            "asend_serie_iterator": _asend_serie_iterator,
         }[name]
 
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
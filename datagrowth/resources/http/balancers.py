@@ -0,0 +1,117 @@
+import os
+from threading import Lock
+from time import monotonic
+from typing import Any, Mapping
+from urllib.parse import urlsplit, urlunsplit
+
+
+# Statuses that HttpResource and the "requests" extractor give to failed connections
+CONNECTION_ERROR_STATUSES = {496, 502, 504}
+
+
+class HostBalancer:
+    """
+    Spreads requests for a micro service over multiple hosts.
+    With the "round_robin" strategy hosts take turns and with the "least_outstanding" strategy
+    the host with the least requests in flight gets selected.
+
+    Hosts whose requests fail with a connection error get ejected for ``ejection_duration`` seconds.
+    Ejected hosts don't get selected, unless all hosts are ejected, in which case all hosts are tried again.
+    """
+
+    STRATEGIES = {"round_robin", "least_outstanding"}
+
+    def __init__(self, hosts: list[str], strategy: str = "round_robin", ejection_duration: float = 30.0) -> None:
+        assert hosts, "A balancer needs at least one host"
+        assert strategy in self.STRATEGIES, f"Unknown balancing strategy: {strategy}"
+        self.hosts = list(hosts)
+        self.strategy = strategy
+        self.ejection_duration = ejection_duration
+        self.outstanding = {host: 0 for host in self.hosts}
+        self.ejections: dict[str, float] = {}
+        self.turn = 0
+        self.lock = Lock()
+
+    def get_available_hosts(self) -> list[str]:
+        current_time = monotonic()
+        hosts = [host for host in self.hosts if self.ejections.get(host, 0) <= current_time]
+        return hosts or list(self.hosts)
+
+    def acquire(self) -> str:
+        """
+        Selects a host for a request. Every acquired host should get released once the request finishes.
+
+        :return: (str) the selected host
+        """
+        with self.lock:
+            hosts = self.get_available_hosts()
+            # Taking turns also spreads requests when hosts have the same amount of outstanding requests
+            offset = self.turn % len(hosts)
+            hosts = hosts[offset:] + hosts[:offset]
+            self.turn += 1
+            if self.strategy == "least_outstanding":
+                host = min(hosts, key=lambda candidate: self.outstanding[candidate])
+            else:
+                host = hosts[0]
+            self.outstanding[host] += 1
+            return host
+
+    def release(self, host: str, failed: bool = False) -> None:
+        """
+        Marks a request to a host as finished.
+
+        :param host: (str) the host returned by ``acquire``
+        :param failed: (bool) whether the request failed with a connection error, which ejects the host
+        """
+        with self.lock:
+            self.outstanding[host] -= 1
+            if failed:
+                self.ejections[host] = monotonic() + self.ejection_duration
+            else:
+                self.ejections.pop(host, None)
+
+    @staticmethod
+    def replace_host(url: str, host: str) -> str:
+        return urlunsplit(urlsplit(url)._replace(netloc=host))
+
+
+class HostBalancerPool:
+    """
+    Keeps a balancer per micro service connection, such that all resources of a process share outstanding requests
+    and ejected hosts. Connections configure balancing with a list of ``hosts`` instead of a single ``host``,
+    a ``balancing`` strategy and an ``ejection_duration``.
+    """
+
+    def __init__(self) -> None:
+        self.balancers: dict[tuple, HostBalancer] = {}
+        self.lock = Lock()
+
+    def get_balancer(self, service: str, connection: Mapping[str, Any]) -> HostBalancer | None:
+        """
+        Returns the balancer for a micro service connection or None when the connection has no ``hosts``.
+
+        :param service: (str) name of the micro service
+        :param connection: (dict) the connection configuration of the micro service
+        :return: HostBalancer or None
+        """
+        hosts = connection.get("hosts")
+        if not hosts:
+            return None
+        strategy = connection.get("balancing") or "round_robin"
+        ejection_duration = connection.get("ejection_duration", 30)
+        key = (service, tuple(hosts), strategy, ejection_duration,)
+        with self.lock:
+            if key not in self.balancers:
+                self.balancers[key] = HostBalancer(hosts, strategy=strategy, ejection_duration=ejection_duration)
+            return self.balancers[key]
+
+    def reset(self) -> None:
+        self.balancers = {}
+        self.lock = Lock()
+
+
+DATAGROWTH_HOST_BALANCERS = HostBalancerPool()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DATAGROWTH_HOST_BALANCERS.reset)
@@ -0,0 +1,114 @@
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+from datagrowth.resources.http.balancers import CONNECTION_ERROR_STATUSES
+
+
+# Status that extractors give to requests that didn't get sent, because the circuit breaker of their host is open
+CIRCUIT_OPEN_STATUS = 602
+
+
+def is_breaker_failure(status: int | None) -> bool:
+    """
+    Indicates whether a status counts as a failure of the host: a connection error or a 5xx response.
+    Statuses of 600 and above are given by Datagrowth itself and don't count.
+    """
+    if status is None:
+        return False
+    return status in CONNECTION_ERROR_STATUSES or 500 <= status < 600
+
+
+class CircuitBreaker:
+    """
+    Stops requests to a host that keeps failing.
+
+    The breaker is "closed" and allows all requests until ``threshold`` consecutive requests failed.
+    Then the breaker is "open" for ``cooldown`` seconds and no requests are allowed.
+    After the cooldown the breaker is "half_open" and allows ``probes`` requests at the same time.
+    A successful probe closes the breaker, while a failed probe opens the breaker for another cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int, cooldown: float = 30.0, probes: int = 1) -> None:
+        assert threshold > 0, "A circuit breaker threshold should be at least one failure"
+        assert probes > 0, "A circuit breaker should allow at least one probe"
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.probes = probes
+        self.failures = 0
+        self.opened_until: float | None = None
+        self.outstanding_probes = 0
+        self.trips = 0
+        self.lock = Lock()
+
+    def _get_state(self, current_time: float) -> str:
+        if self.opened_until is None:
+            return self.CLOSED
+        return self.OPEN if current_time < self.opened_until else self.HALF_OPEN
+
+    @property
+    def state(self) -> str:
+        return self._get_state(monotonic())
+
+    def acquire(self) -> str | None:
+        """
+        Indicates whether a request may be sent. Every allowed request should get released once the request finishes.
+
+        :return: (str) the state in which the request got allowed, which should be passed to ``release``,
+            or None when the request isn't allowed
+        """
+        with self.lock:
+            state = self._get_state(monotonic())
+            if state == self.CLOSED:
+                return state
+            if state == self.OPEN or self.outstanding_probes >= self.probes:
+                return None
+            self.outstanding_probes += 1
+            return state
+
+    def release(self, acquired: str, failed: bool = False) -> None:
+        """
+        Records the outcome of a request that was allowed by ``acquire``.
+        Requests that got allowed while the breaker was half open are probes, regardless of the current state.
+
+        :param acquired: (str) the state returned by ``acquire``
+        :param failed: (bool) whether the request failed according to ``is_breaker_failure``
+        """
+        with self.lock:
+            current_time = monotonic()
+            is_probe = acquired == self.HALF_OPEN
+            if is_probe and self.outstanding_probes > 0:
+                self.outstanding_probes -= 1
+            if not failed:
+                self.failures = 0
+                if self.opened_until is not None and (is_probe or self.opened_until <= current_time):
+                    self.opened_until = None
+                    self.outstanding_probes = 0
+                return
+            self.failures += 1
+            if is_probe or (self.opened_until is None and self.failures >= self.threshold):
+                self.opened_until = current_time + self.cooldown
+                self.outstanding_probes = 0
+                self.trips += 1
+
+    def get_info(self) -> dict[str, Any]:
+        """
+        Describes the breaker for monitoring.
+
+        :return: (dict) the state, consecutive failures, seconds until half open, probes in flight and times opened
+        """
+        with self.lock:
+            current_time = monotonic()
+            state = self._get_state(current_time)
+            opened_until = self.opened_until if self.opened_until is not None else current_time
+            return {
+                "state": state,
+                "failures": self.failures,
+                "retry_in": max(opened_until - current_time, 0.0),
+                "outstanding_probes": self.outstanding_probes,
+                "trips": self.trips,
+            }
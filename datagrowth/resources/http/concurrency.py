@@ -0,0 +1,76 @@
+import os
+import asyncio
+from threading import Lock, BoundedSemaphore
+from contextlib import contextmanager, asynccontextmanager
+from typing import Iterator, AsyncIterator
+from weakref import WeakKeyDictionary
+
+from datagrowth.resources.http.sessions import HttpSessionPool
+
+
+class HostConcurrencyLimiter:
+    """
+    Limits the amount of requests that a process has in flight towards a single host.
+    The limits get set through the ``concurrency_per_host`` configuration from the ``http_resource`` namespace.
+    Threads or tasks that exceed the limit for a host will wait until another request to that host has finished.
+    Every host gets a single limit, which is the limit of the first request towards that host.
+    Requests with other limits for that host share the slots of that first limit.
+    """
+
+    def __init__(self) -> None:
+        self.semaphores: dict[str, BoundedSemaphore] = {}
+        self.async_semaphores: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]
+        self.async_semaphores = WeakKeyDictionary()
+        self.lock = Lock()
+
+    def get_semaphore(self, host: str, limit: int) -> BoundedSemaphore:
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = BoundedSemaphore(limit)
+            return self.semaphores[host]
+
+    @contextmanager
+    def limit(self, url: str | None, limit: int | None) -> Iterator[None]:
+        """
+        Context manager that holds a slot for the host of given url while the context is active.
+        A falsy limit disables the limiter.
+
+        :param url: (str) the url that gets requested
+        :param limit: (int) maximum amount of concurrent requests towards the host of the url
+        """
+        if not limit:
+            yield
+            return
+        semaphore = self.get_semaphore(HttpSessionPool.get_host(url), limit)
+        with semaphore:
+            yield
+
+    @asynccontextmanager
+    async def alimit(self, url: str | None, limit: int | None) -> AsyncIterator[None]:
+        """
+        The asyncio variant of ``limit``. Limits are kept per event loop.
+
+        :param url: (str) the url that gets requested
+        :param limit: (int) maximum amount of concurrent requests towards the host of the url
+        """
+        if not limit:
+            yield
+            return
+        semaphores = self.async_semaphores.setdefault(asyncio.get_running_loop(), {})
+        host = HttpSessionPool.get_host(url)
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(limit)
+        async with semaphores[host]:
+            yield
+
+    def reset(self) -> None:
+        self.semaphores = {}
+        self.async_semaphores = WeakKeyDictionary()
+        self.lock = Lock()
+
+
+DATAGROWTH_HOST_LIMITER = HostConcurrencyLimiter()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DATAGROWTH_HOST_LIMITER.reset)
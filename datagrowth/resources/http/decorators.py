@@ -1,5 +1,3 @@
-import requests
-
 from datagrowth.configuration import ConfigurationType
 
 
@@ -9,6 +7,7 @@ def load_session():
     If the argument is a string it is assumed to be the name of a processor that implements the get_session method.
     Whatever this method returns gets injected under the "session" keyword argument for the decorated function.
     If the argument is not a string it gets returned as being a valid session for the resource.
+    When no session is given None gets injected, which makes resources use shared sessions from the session pool.
 
     :param defaults: (mixed) Name of the session provider or the session object.
     :return:
@@ -22,8 +21,6 @@ def load_session():
             assert isinstance(config, ConfigurationType), \
                 "load_session expects a fully prepared ConfigurationType for config"
             session_injection = kwargs.pop("session", None)
-            if not session_injection:
-                session_injection = requests.Session()
             if not isinstance(session_injection, str):
                 return func(config, session=session_injection, *args, **kwargs)
             session_provider = Processor.get_processor_class(session_injection)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from datagrowth.configuration import ConfigurationProperty, ConfigurationType
+from datagrowth.resources.pydantic import Result
+from datagrowth.resources.pydantic import Resource
+from datagrowth.resources.http.signature import HttpMode, HttpSignature
+from datagrowth.resources.http.breakers import CIRCUIT_OPEN_STATUS, CircuitBreaker
+from datagrowth.resources.http.balancers import DATAGROWTH_HOST_BALANCERS, HostBalancer
+
+
+class HttpExtractor:
+    """
+    Shared functionality of extractors that make HTTP requests for a ``HttpSignature``.
+    Extractors get shared between resources and threads, so they shouldn't hold state for a single extraction.
+    """
+
+    config = ConfigurationProperty(namespace="http_resource")
+
+    def __init__(self, config: ConfigurationType) -> None:
+        self.config = config
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._breakers_lock = Lock()
+
+    def get_breaker(self, url: str) -> CircuitBreaker | None:
+        """
+        Returns the circuit breaker for the host of an URL or None when ``circuit_breaker_threshold`` isn't set.
+        Breakers get created with the configuration of the extractor at the time of the first request to a host.
+        """
+        if not self.config.circuit_breaker_threshold:
+            return None
+        host = urlsplit(url).netloc
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    self.config.circuit_breaker_threshold,
+                    cooldown=self.config.circuit_breaker_cooldown,
+                    probes=self.config.circuit_breaker_probes
+                )
+            return self._breakers[host]
+
+    def get_balancer(self, url: str) -> HostBalancer | None:
+        """
+        Returns the balancer for the micro service that an URL points to or None when the URL isn't balanced.
+        Micro services with multiple ``hosts`` in the ``connections`` configuration use their name as host in URL's.
+        """
+        service = urlsplit(url).netloc
+        connection = (self.config.get("connections", None) or {}).get(service)
+        if connection is None:
+            return None
+        return DATAGROWTH_HOST_BALANCERS.get_balancer(service, connection)
+
+    def get_breaker_info(self) -> dict[str, dict[str, Any]]:
+        """
+        Describes the circuit breakers of all hosts that the extractor made requests to, which is useful for monitoring.
+
+        :return: (dict) the ``CircuitBreaker.get_info`` output per host
+        """
+        with self._breakers_lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.get_info() for host, breaker in breakers.items()}
+
+    @staticmethod
+    def _result_from_response(response: Any, content: bytes | str | None = None) -> Result:
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        if content is None:
+            content = response.content
+        if content is None:
+            body = None
+        elif isinstance(content, str):
+            body = content
+        else:
+            body = content.decode("utf-8", "replace")
+        return Result(
+            content_type=headers.get("content-type", "unknown/unknown"),
+            head=headers,
+            body=body,
+        )
+
+    def _get_request_arguments(self, signature: HttpSignature) -> dict[str, Any]:
+        # Normalize headers
+        headers = requests.utils.default_headers()
+        headers["User-Agent"] = f"{self.config.user_agent}; {headers['User-Agent']}"
+        # Remove encoding that Python 3.14 adds to the defaults, but isn't cross-version viable
+        if "Accept-Encoding" in headers and headers["Accept-Encoding"].endswith("zstd"):
+            headers["Accept-Encoding"] = headers["Accept-Encoding"].replace(", zstd", "")
+        headers.update(signature.headers)
+        if signature.auth and signature.auth.headers:
+            headers.update(signature.auth.headers)
+        # Add authentication to parameters
+        request_url = signature.url
+        if signature.auth and signature.auth.parameters:
+            split_url = urlsplit(request_url)
+            params = dict(parse_qsl(split_url.query, keep_blank_values=True))
+            params.update(signature.auth.parameters)
+            request_url = urlunsplit((
+                split_url.scheme,
+                split_url.netloc,
+                split_url.path,
+                urlencode(params, doseq=True),
+                split_url.fragment,
+            ))
+        # Arguments that both requests and httpx understand
+        request_kwargs: dict[str, Any] = {
+            "method": signature.method,
+            "url": request_url,
+            "headers": dict(headers),
+        }
+        if signature.method.lower() != "get" and signature.mode != HttpMode.NONE:
+            if signature.mode == HttpMode.JSON:
+                request_kwargs["json"] = signature.data
+            elif signature.mode == HttpMode.DATA:
+                request_kwargs["data"] = signature.get_data()
+            elif signature.mode == HttpMode.MULTIPART:
+                multipart_body = signature.data if isinstance(signature.data, dict) else {}
+                request_kwargs["data"] = multipart_body.get("data")
+                request_kwargs["files"] = multipart_body.get("files")
+            else:
+                raise ValueError(f"Unsupported request mode: {signature.mode}")
+        return request_kwargs
+
+    @staticmethod
+    def _error_resource(signature: HttpSignature, status: int, message: str) -> Resource[HttpSignature]:
+        return Resource(
+            signature=signature,
+            status=status,
+            result=Result(
+                content_type="unknown/unknown",
+                head={},
+                body="",
+                errors=message,
+            ),
+        )
+
+    @classmethod
+    def _circuit_open_resource(cls, signature: HttpSignature, url: str) -> Resource[HttpSignature]:
+        return cls._error_resource(
+            signature, CIRCUIT_OPEN_STATUS, f"Circuit breaker is open for {urlsplit(url).netloc}"
+        )
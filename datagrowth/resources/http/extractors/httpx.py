@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import ssl
+import asyncio
+from typing import Any
+
+from datagrowth.configuration import ConfigurationType
+from datagrowth.registry import DATAGROWTH_REGISTRY, Tag
+from datagrowth.resources.protocols import ResourceProtocol
+from datagrowth.resources.pydantic import Result
+from datagrowth.resources.pydantic import Resource
+from datagrowth.resources.http.signature import HttpSignature
+from datagrowth.resources.http.retries import RetryPolicy
+from datagrowth.resources.http.extractors.base import HttpExtractor
+from datagrowth.resources.http.balancers import CONNECTION_ERROR_STATUSES, HostBalancer
+from datagrowth.resources.http.breakers import is_breaker_failure
+from datagrowth.resources.http.sessions import DATAGROWTH_ASYNC_CLIENT_POOL, httpx
+from datagrowth.resources.http.streaming import BODY_TOO_LARGE_STATUS, STREAM_CHUNK_SIZE, BodyTooLarge, aread_body
+
+
+class HttpxExtractor(HttpExtractor):
+    """
+    Extracts with httpx on an event loop through ``aextract``, which is what ``Resource.aextract`` uses.
+    Unless a client is set, requests use the ``httpx.AsyncClient`` for their host from ``DATAGROWTH_ASYNC_CLIENT_POOL``,
+    such that all extractions on an event loop share connections. The httpx package needs to be installed.
+    """
+
+    tag = Tag(category="extractor", value="async_http")
+
+    def __init__(self, config: ConfigurationType) -> None:
+        super().__init__(config)
+        self._client: Any = None
+
+    def set_client(self, client: "httpx.AsyncClient | None") -> None:
+        self._client = client
+
+    def get_client(self, url: str) -> "httpx.AsyncClient":
+        if self._client is not None:
+            return self._client
+        return DATAGROWTH_ASYNC_CLIENT_POOL.get_client(url, self.config)
+
+    async def _aresult_from_stream(self, response: "httpx.Response") -> Result:
+        # Raises BodyTooLarge before the complete body is read when it exceeds max_body_size
+        try:
+            body = await aread_body(response.aiter_bytes(STREAM_CHUNK_SIZE), response.headers,
+                                    self.config.max_body_size)
+        finally:
+            await response.aclose()
+        try:
+            return self._result_from_response(response, body.content)
+        finally:
+            body.close()
+
+    def _get_request_arguments(self, signature: HttpSignature) -> dict[str, Any]:
+        arguments = super()._get_request_arguments(signature)
+        # Unlike requests httpx expects raw payloads under a separate content argument
+        if isinstance(arguments.get("data"), (bytes, str)):
+            arguments["content"] = arguments.pop("data")
+        return arguments
+
+    def extract(self, signature: HttpSignature) -> ResourceProtocol:
+        """
+        Runs ``aextract`` on a new event loop. Prefer ``aextract`` to share connections between extractions.
+        """
+        return asyncio.run(self.aextract(signature))
+
+    async def aextract(self, signature: HttpSignature) -> ResourceProtocol:
+        arguments = self._get_request_arguments(signature)
+        retry_policy = RetryPolicy.from_config(self.config)
+        attempt = 0
+        while True:
+            balancer = self.get_balancer(arguments["url"])
+            if balancer is None:
+                resource = await self._asend_to_host(arguments, signature)
+            else:
+                host = balancer.acquire()
+                failed = True
+                try:
+                    balanced_arguments = dict(arguments, url=HostBalancer.replace_host(arguments["url"], host))
+                    resource = await self._asend_to_host(balanced_arguments, signature)
+                    failed = resource.status in CONNECTION_ERROR_STATUSES
+                finally:
+                    balancer.release(host, failed=failed)
+            if not retry_policy.should_retry(resource.status, attempt):
+                return resource
+            head = resource.result.head if resource.result is not None else None
+            await asyncio.sleep(retry_policy.get_delay(attempt, head))
+            attempt += 1
+
+    async def _asend_to_host(self, arguments: dict[str, Any], signature: HttpSignature) -> Resource[HttpSignature]:
+        # Fails fast without sending when the circuit breaker of the host is open
+        breaker = self.get_breaker(arguments["url"])
+        if breaker is None:
+            return await self._asend(arguments, signature)
+        acquired = breaker.acquire()
+        if acquired is None:
+            return self._circuit_open_resource(signature, arguments["url"])
+        failed = True
+        try:
+            resource = await self._asend(arguments, signature)
+            failed = is_breaker_failure(resource.status)
+        finally:
+            breaker.release(acquired, failed=failed)
+        return resource
+
+    async def _asend(self, arguments: dict[str, Any], signature: HttpSignature) -> Resource[HttpSignature]:
+        client = self.get_client(arguments["url"])
+        request = client.build_request(timeout=self.config.timeout, **arguments)
+        try:
+            response = await client.send(
+                request,
+                follow_redirects=self.config.allow_redirects,
+                stream=bool(self.config.stream)
+            )
+            return Resource(
+                signature=signature,
+                status=response.status_code,
+                result=await self._aresult_from_stream(response) if self.config.stream else
+                self._result_from_response(response),
+            )
+        except BodyTooLarge:
+            return self._error_resource(signature, BODY_TOO_LARGE_STATUS, "Response body exceeds max_body_size")
+        except httpx.TimeoutException:
+            return self._error_resource(signature, 504, "Request timed out")
+        except httpx.TransportError as exc:
+            if isinstance(exc.__cause__ or exc.__context__, ssl.SSLError):
+                return self._error_resource(signature, 496, "SSL handshake/validation failed")
+            return self._error_resource(signature, 502, "Connection failed")
+        except UnicodeDecodeError:
+            return self._error_resource(signature, 600, "Response decoding failed")
+
+
+DATAGROWTH_REGISTRY.register_extractor(HttpxExtractor.tag, HttpxExtractor)
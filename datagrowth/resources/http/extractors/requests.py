@@ -2,132 +2,120 @@ from __future__ import annotations
 
 from time import sleep
 from typing import Any
-from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import requests
 
-from datagrowth.configuration import ConfigurationProperty, ConfigurationType
+from datagrowth.configuration import ConfigurationType
 from datagrowth.registry import DATAGROWTH_REGISTRY, Tag
 from datagrowth.resources.protocols import ResourceProtocol
 from datagrowth.resources.pydantic import Result
 from datagrowth.resources.pydantic import Resource
-from datagrowth.resources.http.signature import HttpMode, HttpSignature
+from datagrowth.resources.http.signature import HttpSignature
+from datagrowth.resources.http.retries import RetryPolicy
+from datagrowth.resources.http.extractors.base import HttpExtractor
+from datagrowth.resources.http.balancers import CONNECTION_ERROR_STATUSES, HostBalancer
+from datagrowth.resources.http.breakers import is_breaker_failure
+from datagrowth.resources.http.streaming import BODY_TOO_LARGE_STATUS, STREAM_CHUNK_SIZE, BodyTooLarge, read_body
 
 
-class RequestsExtractor:
+class RequestsExtractor(HttpExtractor):
 
     tag = Tag(category="extractor", value="requests")
-    config = ConfigurationProperty(namespace="http_resource")
 
     def __init__(self, config: ConfigurationType) -> None:
-        self.config = config
+        super().__init__(config)
         self._session: requests.Session = requests.Session()
 
     def set_session(self, session: requests.Session) -> None:
         self._session = session
 
-    @staticmethod
-    def _result_from_response(response: requests.Response) -> Result:
-        headers = {key.lower(): value for key, value in response.headers.items()}
-        content = response.content
-        if content is None:
-            body = None
-        elif isinstance(content, str):
-            body = content
-        else:
-            body = content.decode("utf-8", "replace")
-        return Result(
-            content_type=headers.get("content-type", "unknown/unknown"),
-            head=headers,
-            body=body,
-        )
+    def _result_from_stream(self, response: requests.Response) -> Result:
+        # Raises BodyTooLarge before the complete body is read when it exceeds max_body_size
+        try:
+            body = read_body(response.iter_content(STREAM_CHUNK_SIZE), response.headers, self.config.max_body_size)
+        finally:
+            response.close()
+        try:
+            return self._result_from_response(response, body.content)
+        finally:
+            body.close()
 
     def _to_request(self, signature: HttpSignature) -> requests.Request:
-        # Normalize headers
-        headers = requests.utils.default_headers()
-        headers["User-Agent"] = f"{self.config.user_agent}; {headers['User-Agent']}"
-        # Remove encoding that Python 3.14 adds to the defaults, but isn't cross-version viable
-        if "Accept-Encoding" in headers and headers["Accept-Encoding"].endswith("zstd"):
-            headers["Accept-Encoding"] = headers["Accept-Encoding"].replace(", zstd", "")
-        headers.update(signature.headers)
-        if signature.auth and signature.auth.headers:
-            headers.update(signature.auth.headers)
-        # Add authentication to parameters
-        request_url = signature.url
-        if signature.auth and signature.auth.parameters:
-            split_url = urlsplit(request_url)
-            params = dict(parse_qsl(split_url.query, keep_blank_values=True))
-            params.update(signature.auth.parameters)
-            request_url = urlunsplit((
-                split_url.scheme,
-                split_url.netloc,
-                split_url.path,
-                urlencode(params, doseq=True),
-                split_url.fragment,
-            ))
-        # Make request based on library
-        request_kwargs: dict[str, Any] = {
-            "method": signature.method,
-            "url": request_url,
-            "headers": dict(headers),
-        }
-        if signature.method.lower() != "get" and signature.mode != HttpMode.NONE:
-            if signature.mode == HttpMode.JSON:
-                request_kwargs["json"] = signature.data
-            elif signature.mode == HttpMode.DATA:
-                request_kwargs["data"] = signature.get_data()
-            elif signature.mode == HttpMode.MULTIPART:
-                multipart_body = signature.data if isinstance(signature.data, dict) else {}
-                request_kwargs["data"] = multipart_body.get("data")
-                request_kwargs["files"] = multipart_body.get("files")
-            else:
-                raise ValueError(f"Unsupported request mode: {signature.mode}")
-        return requests.Request(**request_kwargs)
-
-    @staticmethod
-    def _error_resource(signature: HttpSignature, status: int, message: str) -> Resource[HttpSignature]:
-        return Resource(
-            signature=signature,
-            status=status,
-            result=Result(
-                content_type="unknown/unknown",
-                head={},
-                body="",
-                errors=message,
-            ),
-        )
+        return requests.Request(**self._get_request_arguments(signature))
 
     def extract(self, signature: HttpSignature) -> ResourceProtocol:
         request = self._to_request(signature)
         prepared_request = self._session.prepare_request(request)
-        resource = self._error_resource(signature, 0, "No extraction attempted")
-
-        for backoff_delay in [0] + list(self.config.backoff_delays):
-            sleep(backoff_delay)
-            try:
-                response = self._session.send(
-                    prepared_request,
-                    proxies=self.config.requests_proxies,
-                    verify=self.config.requests_verify,
-                    timeout=self.config.timeout,
-                    allow_redirects=self.config.allow_redirects,
-                )
-                resource = Resource(
-                    signature=signature,
-                    status=response.status_code,
-                    result=self._result_from_response(response),
-                )
-            except requests.exceptions.SSLError:
-                resource = self._error_resource(signature, 496, "SSL handshake/validation failed")
-            except requests.Timeout:
-                resource = self._error_resource(signature, 504, "Request timed out")
-            except (requests.ConnectionError, IOError):
-                resource = self._error_resource(signature, 502, "Connection failed")
-            except UnicodeDecodeError:
-                resource = self._error_resource(signature, 600, "Response decoding failed")
-            if resource.status not in [420, 429, 502, 503, 504]:
+
+        retry_policy = RetryPolicy.from_config(self.config)
+        attempt = 0
+        url = prepared_request.url or ""
+        while True:
+            balancer = self.get_balancer(url)
+            if balancer is None:
+                resource = self._send_to_host(prepared_request, signature)
+            else:
+                host = balancer.acquire()
+                failed = True
+                try:
+                    balanced_request = prepared_request.copy()
+                    balanced_request.url = HostBalancer.replace_host(url, host)
+                    resource = self._send_to_host(balanced_request, signature)
+                    failed = resource.status in CONNECTION_ERROR_STATUSES
+                finally:
+                    balancer.release(host, failed=failed)
+            if not retry_policy.should_retry(resource.status, attempt):
                 return resource
+            head = resource.result.head if resource.result is not None else None
+            sleep(retry_policy.get_delay(attempt, head))
+            attempt += 1
+
+    def _send_to_host(self, prepared_request: requests.PreparedRequest,
+                      signature: HttpSignature) -> Resource[HttpSignature]:
+        # Fails fast without sending when the circuit breaker of the host is open
+        url = prepared_request.url or ""
+        breaker = self.get_breaker(url)
+        if breaker is None:
+            return self._send(prepared_request, signature)
+        acquired = breaker.acquire()
+        if acquired is None:
+            return self._circuit_open_resource(signature, url)
+        failed = True
+        try:
+            resource = self._send(prepared_request, signature)
+            failed = is_breaker_failure(resource.status)
+        finally:
+            breaker.release(acquired, failed=failed)
         return resource
 
+    def _send(self, prepared_request: requests.PreparedRequest, signature: HttpSignature) -> Resource[HttpSignature]:
+        # Sessions only get a stream argument for streamed requests, which keeps other calls to send unchanged
+        stream_arguments: dict[str, Any] = {"stream": True} if self.config.stream else {}
+        try:
+            response = self._session.send(
+                prepared_request,
+                proxies=self.config.requests_proxies,
+                verify=self.config.requests_verify,
+                timeout=self.config.timeout,
+                allow_redirects=self.config.allow_redirects,
+                **stream_arguments
+            )
+            return Resource(
+                signature=signature,
+                status=response.status_code,
+                result=self._result_from_stream(response) if self.config.stream else
+                self._result_from_response(response),
+            )
+        except BodyTooLarge:
+            return self._error_resource(signature, BODY_TOO_LARGE_STATUS, "Response body exceeds max_body_size")
+        except requests.exceptions.SSLError:
+            return self._error_resource(signature, 496, "SSL handshake/validation failed")
+        except requests.Timeout:
+            return self._error_resource(signature, 504, "Request timed out")
+        except (requests.ConnectionError, IOError):
+            return self._error_resource(signature, 502, "Connection failed")
+        except UnicodeDecodeError:
+            return self._error_resource(signature, 600, "Response decoding failed")
+
 
 DATAGROWTH_REGISTRY.register_extractor(RequestsExtractor.tag, RequestsExtractor)
@@ -1,9 +1,13 @@
 import os
+import logging
+import warnings
 from io import BytesIO
 import hashlib
-from PIL import Image
-from urlobject import URLObject
+from time import monotonic
 from datetime import datetime, timezone
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+from PIL import Image
 import requests
 
 from django.core.exceptions import ValidationError
@@ -11,8 +15,44 @@ from django.core.files.storage import default_storage
 from django.core.files import File
 from django.core.files.images import ImageFile
 
-from datagrowth.configuration import DATAGROWTH_CONFIGURATION
+from datagrowth.configuration import DATAGROWTH_CONFIGURATION, ConfigurationType
+from datagrowth.resources.buffers import ResourceBuffer
 from datagrowth.resources.http.generic import URLResource
+from datagrowth.resources.http.iterators import send_serie_iterator
+from datagrowth.resources.http.streaming import STREAM_CHUNK_SIZE, BodyTooLarge, ResponseBody, read_body
+
+
+log = logging.getLogger("datagrowth")
+
+
+# Downloads larger than this amount of bytes get written to a temporary file while streaming
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass
+class DownloadReport:
+    """
+    The outcome of ``HttpFileResource.download_many``.
+    The size only counts bytes that were downloaded and not the size of files that were already stored.
+    """
+    resources: list
+    size: int
+    duration: float
+
+    @property
+    def success(self) -> list:
+        return [resource for resource in self.resources if resource.success]
+
+    @property
+    def errors(self) -> list:
+        return [resource for resource in self.resources if not resource.success]
+
+    @property
+    def throughput(self) -> float:
+        """
+        Returns the aggregate download speed in bytes per second.
+        """
+        return self.size / self.duration if self.duration else 0.0
 
 
 class HttpFileResource(URLResource):
@@ -24,11 +64,17 @@ class HttpFileResource(URLResource):
 
     The file path of the downloaded file will get stored in the ``body`` field.
     This path will be relative to the ``MEDIA_ROOT``.
-    The path will include a downloads folder and a subfolder that is the ``app_name`` of the concrete class.
+    The path will include a downloads folder, a subfolder that is the ``app_name``
+    and a subfolder that is the model name of the concrete class.
     Under that directory there are many possible subdirectories in the form of "x/yz/".
     Where x, y and z will be hexidecimal characters.
     Creating these subdirectories is necessary to prevent huge download directories, that would hamper performance.
 
+    Downloads get streamed to storage in chunks and the file name is the SHA-256 hash of the content.
+    When a file with the same content was downloaded before, the resource links to that file
+    instead of storing it again. Downloads that break off get resumed with a Range request
+    when the server accepts ranges. Use ``download_many`` to download many files concurrently.
+
     Only full URL's with protocol will get downloaded.
     Any URL's without a protocol will get stored as a failure with a 404 (Not Found) error code.
     Please note that with this class it is not possible to adjust the parameters through the ``parameters`` method,
@@ -78,26 +124,103 @@ class HttpFileResource(URLResource):
     def _get_file_class(self):
         return File
 
+    def should_stream(self):
+        return True
+
+    def _get_body_options(self):
+        return {
+            "max_size": self.config.max_body_size,
+            "spill_size": DOWNLOAD_BUFFER_SIZE,
+            "hasher": hashlib.sha256()
+        }
+
+    @classmethod
+    def download_many(cls, urls, config=None, session=None):
+        """
+        Downloads files for all given URL's with a thread pool of ``download_concurrency`` workers.
+        The ``concurrency_per_host`` configuration limits the downloads towards a single host
+        and files that were downloaded before are loaded from the database as usual.
+
+        :param urls: (list) the URL's to download
+        :param config: (dict or ConfigurationType) the configuration for the resources
+        :param session: (requests.Session) the session for all downloads or None to use the session pool
+        :return: (DownloadReport) the resources in order of the URL's together with throughput information
+        """
+        download_config = ConfigurationType(namespace="http_resource", private=["_resource", "_concurrency"])
+        if isinstance(config, ConfigurationType):
+            config = config.to_dict(protected=True)
+        download_config.update(config or {})
+        download_config.update({
+            "resource": cls._meta.label,
+            "concurrency": download_config.download_concurrency
+        })
+        start = monotonic()
+        resources = list(send_serie_iterator(
+            args_list=[[url] for url in urls], kwargs_list=[{} for _ in urls],
+            method="get", config=download_config, session=session,
+            buffer=ResourceBuffer.from_config(download_config)
+        ))
+        report = DownloadReport(
+            resources=resources,
+            size=sum(resource.download_size for resource in resources),
+            duration=monotonic() - start
+        )
+        log.info(
+            "Downloaded %s files with %s errors: %s bytes in %.2f seconds (%.0f bytes per second)",
+            len(report.resources), len(report.errors), report.size, report.duration, report.throughput
+        )
+        return report
+
+    def __init_subclass__(cls, *args, **kwargs):
+        super().__init_subclass__(*args, **kwargs)
+        if cls._has_file_name_override():
+            warnings.warn(
+                f"{cls.__name__} overrides the get_file_name method, which is deprecated in favour of get_file_path",
+                DeprecationWarning
+            )
+
+    @classmethod
+    def _has_file_name_override(cls):
+        return cls.get_file_name is not HttpFileResource.get_file_name
+
     @staticmethod
     def get_file_name(original, now):
         """
-        Override this method to change the file naming convention.
-        By default it will take the filename from the URL
-        and prefix it with a datetime string of the date and time at downloading.
+        Deprecated: override ``get_file_path`` instead.
+        Overrides of this method still determine file names, but files named this way don't get deduplicated.
 
         :param original: (str) the URL file name
         :param now: (datetime) a datetime object to use as prefix input
         :return:
         """
+        warnings.warn("get_file_name is deprecated in favour of get_file_path", DeprecationWarning, stacklevel=2)
         return "{}.{}".format(
             now.strftime(DATAGROWTH_CONFIGURATION.DATETIME_FORMAT),
             original
         )
 
+    def get_file_path(self, content_hash, extension):
+        """
+        Override this method to change where downloaded files get stored.
+        By default files are stored under a name that is the SHA-256 hash of their content.
+        Files with identical content will therefore share a path and get stored only once.
+
+        :param content_hash: (str) hexadecimal SHA-256 hash of the file content
+        :param extension: (str) the file extension including the leading dot
+        :return: (str) file path relative to the root of the default storage
+        """
+        file_name = f"{content_hash}{extension}"[:155]
+        return os.path.join(
+            self._meta.app_label,
+            "downloads",
+            self._meta.model_name,
+            content_hash[0], content_hash[1:3],  # this prevents huge (problematic) directory listings
+            file_name
+        )
+
     def _get_file_info(self, url):
-        # Getting the file name and extension from url
-        path = str(URLObject(url).path)
-        tail, head = os.path.split(path)
+        # Getting the file name and extension from url for files named by the deprecated get_file_name method
+        tail, head = os.path.split(urlsplit(url).path)
         if not head:
             head = "index.html"
         name, extension = os.path.splitext(head)
@@ -118,20 +241,123 @@ class HttpFileResource(URLResource):
         )
         return file_path, file_name, extension
 
-    def _save_file(self, url, content):
-        file_path, file_name, extension = self._get_file_info(url)
-        if len(file_name) > 150:
-            file_name = file_name[:150]
-        file_name += extension
-        if len(file_name) > 155:
-            file_name = file_name[:155]
+    @staticmethod
+    def _get_file_extension(url):
+        tail, head = os.path.split(urlsplit(url).path)
+        name, extension = os.path.splitext(head)
+        return extension or ".html"
+
+    def _save_file(self, url, body):
         FileClass = self._get_file_class()
-        file = FileClass(BytesIO(content))
-        file_name = default_storage.save(os.path.join(file_path, file_name), file)
+        if self._has_file_name_override():
+            # Files named by the deprecated get_file_name method get stored under a unique name
+            file_path, file_name, extension = self._get_file_info(url)
+            if len(file_name) > 150:
+                file_name = file_name[:150]
+            file_name += extension
+            if len(file_name) > 155:
+                file_name = file_name[:155]
+            file = FileClass(body.open() if body.is_spilled else BytesIO(body.content))
+            return default_storage.save(os.path.join(file_path, file_name), file)
+        file_path = self.get_file_path(body.hexdigest, self._get_file_extension(url))
+        # Content that was downloaded before gets linked instead of written again
+        if default_storage.exists(file_path):
+            return file_path
+        file = FileClass(body.open() if body.is_spilled else BytesIO(body.content))
+        return self._store_file(file_path, file)
+
+    @staticmethod
+    def _store_file(file_path, file):
+        file_name = default_storage.save(file_path, file)
+        if file_name != file_path:
+            # Another process stored the same content in the meantime and the storage made the name unique
+            default_storage.delete(file_name)
+            return file_path
         return file_name
 
+    def get_derived_files(self):
+        """
+        Returns the names of files in storage that are derived from the downloaded file, like thumbnails.
+        The ``file_resource_delete_handler`` deletes these files together with the downloaded file.
+
+        :return: (list) file names
+        """
+        return []
+
     def _update_from_results(self, response):
-        file_name = self._save_file(self.request["url"], response.content)
+        self._update_from_body(response, read_body([response.content], response.headers, **self._get_body_options()))
+
+    def _update_from_stream(self, response):
+        try:
+            if self.is_not_modified(response):
+                return
+            body = ResponseBody(**self._get_body_options())
+            try:
+                body.check_length(response.headers)
+                self._read_download(response, body)
+            except BodyTooLarge:
+                body.close()
+                self._set_body_too_large(response)
+                return
+            except BaseException:
+                body.close()
+                raise
+            self._update_from_body(response, body)
+        finally:
+            response.close()
+
+    def _read_download(self, response, body):
+        """
+        Writes the chunks of a download to the body.
+        When the connection breaks off the remainder gets requested with a Range header,
+        as long as the server accepts ranges and there are ``download_resume_attempts`` left.
+        """
+        resume_attempts = 0
+        part = response
+        while True:
+            try:
+                for chunk in part.iter_content(STREAM_CHUNK_SIZE):
+                    body.write(chunk)
+                return
+            except (requests.exceptions.ChunkedEncodingError, requests.ConnectionError):
+                if resume_attempts >= self.config.download_resume_attempts or not self.accepts_ranges(response):
+                    raise
+                resume_attempts += 1
+            finally:
+                if part is not response:
+                    part.close()
+            part = self._request_range(response, body.size)
+
+    @staticmethod
+    def accepts_ranges(response):
+        return response.headers.get("accept-ranges", "").lower() == "bytes"
+
+    def _request_range(self, response, start):
+        preq = response.request.copy()
+        preq.headers["Range"] = f"bytes={start}-"
+        # If-Range makes the server send the complete file instead of a range when the file changed
+        validator = response.headers.get("etag") or response.headers.get("last-modified")
+        if validator and not validator.startswith("W/"):
+            preq.headers["If-Range"] = validator
+        part = self.session.send(
+            preq,
+            proxies=DATAGROWTH_CONFIGURATION.HTTP_RESOURCE_REQUESTS_PROXIES,
+            verify=DATAGROWTH_CONFIGURATION.HTTP_RESOURCE_REQUESTS_VERIFY,
+            timeout=self.timeout,
+            allow_redirects=self.config.allow_redirects,
+            stream=True
+        )
+        if part.status_code != 206 or not part.headers.get("content-range", "").startswith(f"bytes {start}-"):
+            part.close()
+            raise requests.ConnectionError(f"Failed to resume download of {preq.url} at byte {start}")
+        return part
+
+    def _update_from_body(self, response, body):
+        try:
+            file_name = self._save_file(self.request["url"], body)
+        finally:
+            body.close()
+        self.download_size = body.size
         self.head = dict(response.headers)
         self.status = response.status_code
         self.body = file_name.replace(DATAGROWTH_CONFIGURATION.WEB_MEDIA_ROOT, "").lstrip(os.sep)
@@ -171,6 +397,8 @@ class HttpFileResource(URLResource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.timeout = kwargs.get("timeout", 4)
+        # Amount of bytes received by the last request, which excludes files loaded from the database
+        self.download_size = 0
 
     class Meta(URLResource.Meta):
         abstract = True
@@ -179,13 +407,90 @@ class HttpFileResource(URLResource):
 class HttpImageResource(HttpFileResource):
     """
     This class acts like the HttpFileResource with the only difference that it will return content as Pillow images.
+    Pillow only decodes these images once their pixels get used. When the ``image_draft_size`` configuration is set,
+    JPEG images get decoded at a reduced scale that is at least as large as the configured width and height.
+
+    Use ``get_image_info`` to read dimensions without decoding the image at all
+    and use ``get_thumbnail`` to get small previews.
+    Thumbnails get stored next to the downloaded file, such that the original only gets decoded once per size.
     """
 
     def _get_file_class(self):
         return ImageFile
 
     def transform(self, file):
-        return Image.open(file)
+        image = Image.open(file)
+        if self.config.image_draft_size:
+            image.draft(None, tuple(self.config.image_draft_size))
+        return image
+
+    def get_image_info(self):
+        """
+        Reads the format, mode and dimensions of the image from the file header without decoding the image.
+
+        :return: (dict) image information or None when there is no readable image
+        """
+        if not self.success:
+            return None
+        try:
+            with default_storage.open(self.body) as file, Image.open(file) as image:
+                return {
+                    "format": image.format,
+                    "mode": image.mode,
+                    "width": image.width,
+                    "height": image.height
+                }
+        except IOError:
+            return None
+
+    def get_thumbnail_name(self, size):
+        """
+        Override this method to change where thumbnails get stored.
+        By default thumbnails are stored next to the downloaded file with the size appended to the file name.
+
+        :param size: (tuple) maximum width and height of the thumbnail
+        :return: (str) file path relative to the root of the default storage
+        """
+        width, height = size
+        _, extension = os.path.splitext(self.body)
+        return f"{self.body}.{width}x{height}{extension}"
+
+    def get_thumbnail(self, size):
+        """
+        Returns a thumbnail that fits within the given size and keeps the aspect ratio of the image.
+        The thumbnail gets created and stored the first time it is requested and gets read from storage afterwards.
+
+        :param size: (tuple) maximum width and height of the thumbnail
+        :return: (Image) the thumbnail or None when there is no readable image
+        """
+        if not self.success:
+            return None
+        thumbnail_name = self.get_thumbnail_name(size)
+        try:
+            if default_storage.exists(thumbnail_name):
+                with default_storage.open(thumbnail_name) as file:
+                    thumbnail = Image.open(file)
+                    thumbnail.load()
+                    return thumbnail
+            with default_storage.open(self.body) as file, Image.open(file) as image:
+                image_format = image.format or "PNG"
+                # Thumbnails decode JPEG images in draft mode and reduce other images before resampling
+                image.thumbnail(size)
+                thumbnail = image.copy()
+        except IOError:
+            return None
+        output = BytesIO()
+        thumbnail.save(output, format=image_format)
+        self._store_file(thumbnail_name, File(output))
+        return thumbnail
+
+    def get_derived_files(self):
+        directory, file_name = os.path.split(self.body)
+        try:
+            directories, files = default_storage.listdir(directory)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(directory, name) for name in files if name.startswith(f"{file_name}.")]
 
     class Meta(HttpFileResource.Meta):
         abstract = True
@@ -194,11 +499,21 @@ class HttpImageResource(HttpFileResource):
 def file_resource_delete_handler(sender, instance, **kwargs):
     """
     A Django signal handler that can be bound to a ``post_delete`` signal
-    to free disk space when file resources get deleted.
+    to free disk space when file resources or resources with a streamed ``body_file`` get deleted.
+    Downloaded files that are shared with other resources of the same class are kept.
+    Files derived from downloaded files, like thumbnails, get deleted together with the downloaded file.
+    Resources without a ``get_derived_files`` method only get their own files deleted.
 
     :param sender: receives the class that is sending the signal
     :param instance: the object under deletion
     :param kwargs: ignored, for compatibility only
     """
     if instance.body and default_storage.exists(instance.body):
-        default_storage.delete(instance.body)
+        is_shared = sender.objects.filter(body=instance.body).exclude(pk=instance.pk).exists()
+        get_derived_files = getattr(instance, "get_derived_files", None)
+        if not is_shared:
+            for derived_file in get_derived_files() if get_derived_files is not None else []:
+                default_storage.delete(derived_file)
+            default_storage.delete(instance.body)
+    if instance.body_file and default_storage.exists(instance.body_file):
+        default_storage.delete(instance.body_file)
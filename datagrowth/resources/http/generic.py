@@ -1,21 +1,28 @@
-from typing import Self
+from typing import Any, Self
+import os
 import re
-import hashlib
+import ssl
+import asyncio
 import json
 from copy import copy, deepcopy
+from contextlib import contextmanager
 from urllib.parse import urlencode
 from time import sleep
+from datetime import timedelta
 from pathlib import Path
+from uuid import uuid4
 
 import requests
 import jsonschema
 from jsonschema.validators import Draft4Validator
 from jsonschema.exceptions import ValidationError as SchemaValidationError
-from urlobject import URLObject
 from bs4 import BeautifulSoup
 
+from asgiref.sync import sync_to_async
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.core.files import File
+from django.core.files.storage import default_storage
 from django.utils.timezone import now
 from django.db.models import JSONField
 from django.test import Client
@@ -23,10 +30,90 @@ from django.urls import reverse
 
 from datagrowth.configuration import DATAGROWTH_CONFIGURATION
 from datagrowth.resources.base import Resource
-from datagrowth.exceptions import DGHttpError50X, DGHttpError40X, DGResourceDoesNotExist
+from datagrowth.resources.limiters import get_rate_limiter
+from datagrowth.resources.cache import DATAGROWTH_RESOURCE_CACHE, MISSING, ResourceCache
+from datagrowth.resources.singleflight import DATAGROWTH_SINGLE_FLIGHT, SharedInsert, copy_exception
+from datagrowth.resources.http.sessions import DATAGROWTH_SESSION_POOL, DATAGROWTH_ASYNC_CLIENT_POOL, httpx
+from datagrowth.resources.http.concurrency import DATAGROWTH_HOST_LIMITER
+from datagrowth.resources.http.retries import RetryPolicy
+from datagrowth.resources.http.balancers import CONNECTION_ERROR_STATUSES, DATAGROWTH_HOST_BALANCERS, HostBalancer
+from datagrowth.resources.http.streaming import (BODY_TOO_LARGE_STATUS, STREAM_CHUNK_SIZE, BodyTooLarge, read_body,
+                                                 aread_body)
+from datagrowth.utils.compression import compress, decompress, detect_compression
+from datagrowth.utils.fingerprints import normalize_legacy_uri, hash_legacy_data
+from datagrowth.utils.urls import set_query_params, delete_query_params
+from datagrowth.exceptions import DGHttpError50X, DGHttpError40X, DGResourceDoesNotExist, DGResourceException
 from datagrowth.utils import is_json_mimetype
 
 
+class CompressedBodyMixin(models.Model):
+    """
+    Adds a ``body_compressed`` column to a ``HttpResource``, which holds the body instead of the ``body`` column
+    when the ``body_compression`` configuration is set. Compression is transparent for the ``body`` attribute.
+    Place the mixin before ``HttpResource`` in the bases of your model and create a migration for the new column.
+    """
+
+    body_compressed = models.BinaryField(default=None, null=True, blank=True)
+
+    # The algorithm that compressed the stored body, if any
+    _body_compression = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        body_compressed = instance.__dict__.get("body_compressed")
+        if body_compressed is not None:
+            body_compressed = bytes(body_compressed)
+            instance._body_compression = detect_compression(body_compressed)
+            instance.body = decompress(body_compressed).decode("utf-8")
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "body" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "body_compressed"}
+        with self.saving():
+            return super().save(*args, **kwargs)
+
+    @contextmanager
+    def saving(self):
+        # Stored compressed bodies remain compressed, unless the configuration specifies otherwise
+        compression = self.config.body_compression or self._body_compression
+        if not compression or self.body is None:
+            self.body_compressed = None
+            with super().saving():
+                yield
+            return
+        # The body gets stored in compressed form, but remains available on the instance
+        body = self.body
+        self.body_compressed = compress(body.encode("utf-8"), compression)
+        self._body_compression = compression
+        self.body = None
+        try:
+            with super().saving():
+                yield
+        finally:
+            self.body = body
+
+    # Models without their own Meta inherit the Meta of the first base, which shouldn't drop the Resource options
+    class Meta(Resource.Meta):
+        abstract = True
+
+
+class BodyFileMixin(models.Model):
+    """
+    Adds a ``body_file`` column to a ``HttpResource``, which holds the storage name of streamed bodies
+    that exceed the ``body_spill_size`` configuration. Without this mixin such bodies get stored in the ``body`` column.
+    Place the mixin before ``HttpResource`` in the bases of your model and create a migration for the new column.
+    """
+
+    body_file = models.CharField(max_length=255, default=None, null=True, blank=True)
+
+    # Models without their own Meta inherit the Meta of the first base, which shouldn't drop the Resource options
+    class Meta(Resource.Meta):
+        abstract = True
+
+
 class HttpResource(Resource):
     """
     You can extend from this base class to declare a ``Resource`` that gathers data from a HTTP(S) source.
@@ -53,6 +140,8 @@ class HttpResource(Resource):
     # Storing data
     head = JSONField(default=dict)
     body = models.TextField(default=None, null=True, blank=True)
+    # Resources with the BodyFileMixin store the name of bodies that exceeded the body_spill_size configuration
+    body_file = None
 
     # Class constants that determine behavior
     CONFIG_NAMESPACE = "http_resource"
@@ -88,6 +177,10 @@ class HttpResource(Resource):
         If the data has been retrieved before it will load the data from cache instead.
         Specify ``cache_only`` in your config if you want to prevent any HTTP requests.
         The data might be missing in that case.
+        Concurrent calls for the same uri and data_hash within a process make a single request,
+        unless ``single_flight`` is disabled or ``defer_retries`` is set.
+        The other calls receive a copy of the resulting resource or exception.
+        Copies of a new resource insert a single row when they get saved.
 
         You must specify the method that the resource will be using to get the data.
         Currently this can be the "get" and "post" HTTP verbs.
@@ -107,14 +200,65 @@ class HttpResource(Resource):
             self.request = self._create_request(method, *args, **kwargs)
             self.uri = self.uri_from_url(self.request.get("url"))
             self.data_hash = self.hash_from_data(
-                self.request.get(HttpResource._get_data_key(self.request))
+                self.request.get(HttpResource._get_data_key(self.request)),
+                self.config.fingerprint_algorithm
             )
         else:
             self.validate_request(self.request)
 
         self.clean()  # sets self.uri and self.data_hash based on request
+        if self._prepare_only:
+            return self
+        # Callers that defer retries continue sending themselves, which waiting callers wouldn't do
+        if self.config.cache_only or not self.config.single_flight or self.defer_retries:
+            return self._load_or_send()
+        resource, _ = DATAGROWTH_SINGLE_FLIGHT.do(
+            self.get_cache_key(),
+            self._load_or_send_shared,
+            share=self._copy_shared
+        )
+        return resource
 
-        resource = self.__class__.objects.filter(uri=self.uri, data_hash=self.data_hash).last()
+    def _load_or_send_shared(self):
+        try:
+            resource = self._load_or_send()
+        except DGResourceException as exc:
+            self._set_shared_insert(exc.resource)
+            raise
+        self._set_shared_insert(resource)
+        return resource
+
+    @staticmethod
+    def _set_shared_insert(resource):
+        # New resources get saved by every caller that shares them, but these saves should insert only one row
+        if resource is not None and resource.pk is None:
+            resource._shared_insert = SharedInsert()
+
+    @classmethod
+    def _copy_shared(cls, outcome):
+        # Every caller that waited for a request gets its own resource, also when the request raised an error
+        if not isinstance(outcome, BaseException):
+            return cls._copy_shared_resource(outcome)
+        shared = copy_exception(outcome)
+        if isinstance(shared, DGResourceException):
+            shared.resource = cls._copy_shared_resource(shared.resource)
+        return shared
+
+    @staticmethod
+    def _copy_shared_resource(resource):
+        shared = ResourceCache.copy_resource(resource)
+        if not isinstance(shared, HttpResource):
+            return shared
+        # Sending writes into the request, so every copy gets its own request and retry state
+        shared.request = deepcopy(resource.request)
+        shared.head = deepcopy(resource.head)
+        shared.defer_retries = False
+        shared.retry_delay = None
+        shared.retry_attempt = 0
+        return shared
+
+    def _load_or_send(self):
+        resource = self.get_cached_resource()
         if resource is None:
             if self.config.cache_only:
                 raise DGResourceDoesNotExist("Could not retrieve resource from cache", resource=self)
@@ -124,22 +268,174 @@ class HttpResource(Resource):
             return resource
 
         try:
-            self.validate_request(resource.request)
+            resource.validate_request(resource.request)
         except ValidationError:
-            if resource.id:
-                resource.delete()
-            resource = self
+            if self.config.revalidate and resource.should_revalidate():
+                resource.start_revalidation(self.config)
+            else:
+                if resource.id:
+                    resource.delete()
+                resource = self
 
-        if resource.success:
+        if resource.success and not resource.is_revalidating:
             return resource
 
         resource.request = resource.request_with_auth()
+        resource.defer_retries = self.defer_retries
         resource._send()
-        resource.handle_errors()
-        if resource.config.interval_duration:
-            sleep(resource.config.interval_duration / 1000)
+        return resource._complete_send()
+
+    def retry(self):
+        """
+        Continues sending a resource whose retry got deferred because ``defer_retries`` was set.
+        The caller is responsible for waiting ``retry_delay`` seconds before calling this method.
+
+        :return: HttpResource
+        """
+        assert self.retry_delay is not None, "Can't retry a resource without a deferred retry."
+        self._send()
+        return self._complete_send()
+
+    def _complete_send(self):
+        if self.retry_delay is not None:
+            return self
+        self.is_revalidating = False
+        self.handle_errors()
+        if self.config.interval_duration:
+            sleep(self.config.interval_duration / 1000)
+        return self
+
+    def get_cached_resource(self):
+        """
+        Returns the last stored resource with the same uri and data_hash as this resource or None if there is none.
+        When ``prefetched_resources`` is set the resource gets looked up in there instead of the database.
+        Otherwise the in-process resource cache gets consulted first when ``resource_cache_size`` is configured.
+
+        :return: HttpResource or None
+        """
+        if self.prefetched_resources is not None:
+            return self.prefetched_resources.get((self.uri, self.data_hash,))
+        key = self.get_cache_key()
+        resource = DATAGROWTH_RESOURCE_CACHE.get(key, self.config)
+        if resource is MISSING:
+            resource = self.__class__.objects.filter(uri=self.uri, data_hash=self.data_hash).last()
+            DATAGROWTH_RESOURCE_CACHE.set(key, resource, self.config)
         return resource
 
+    def get_cache_key(self):
+        return self._meta.label, self.uri, self.data_hash,
+
+    async def aget_cached_resource(self):
+        """
+        The asyncio variant of ``get_cached_resource``.
+
+        :return: HttpResource or None
+        """
+        if self.prefetched_resources is not None:
+            return self.prefetched_resources.get((self.uri, self.data_hash,))
+        key = self.get_cache_key()
+        resource = DATAGROWTH_RESOURCE_CACHE.get(key, self.config)
+        if resource is MISSING:
+            resource = await self.__class__.objects.filter(uri=self.uri, data_hash=self.data_hash).alast()
+            DATAGROWTH_RESOURCE_CACHE.set(key, resource, self.config)
+        return resource
+
+    def prepare(self, method, *args, **kwargs):
+        """
+        Sets the request, uri and data_hash that ``send`` would set for the given input,
+        without looking up the cache or making any requests.
+        Any changes that classes make to the input in their own ``send`` method are taken into account.
+
+        :param method: "get" or "post" depending on which request you want your resource to execute
+        :param args: arguments that will get merged into the ``URI_TEMPLATE``
+        :param kwargs: keywords arguments that will get send as data
+        :return: HttpResource
+        """
+        self._prepare_only = True
+        try:
+            return self.send(method, *args, **kwargs)
+        finally:
+            self._prepare_only = False
+
+    async def asend(self, method, *args, **kwargs):
+        """
+        The asyncio variant of ``send``. Cache lookups use Django's async ORM and requests are made with httpx.
+        Requests get prepared by calling ``send`` through ``prepare``,
+        which means that classes only need to override ``send`` to alter the input.
+        See the ``send`` method for more information.
+
+        :param method: "get" or "post" depending on which request you want your resource to execute
+        :param args: arguments that will get merged into the ``URI_TEMPLATE``
+        :param kwargs: keywords arguments that will get send as data
+        :return: HttpResource
+        """
+        self.prepare(method, *args, **kwargs)
+        if self.config.cache_only or not self.config.single_flight or self.defer_retries:
+            return await self._aload_or_send()
+        resource, _ = await DATAGROWTH_SINGLE_FLIGHT.ado(
+            self.get_cache_key(),
+            self._aload_or_send_shared,
+            share=self._copy_shared
+        )
+        return resource
+
+    async def _aload_or_send_shared(self):
+        try:
+            resource = await self._aload_or_send()
+        except DGResourceException as exc:
+            self._set_shared_insert(exc.resource)
+            raise
+        self._set_shared_insert(resource)
+        return resource
+
+    async def _aload_or_send(self):
+        resource = await self.aget_cached_resource()
+        if resource is None:
+            if self.config.cache_only:
+                raise DGResourceDoesNotExist("Could not retrieve resource from cache", resource=self)
+            resource = self
+
+        if self.config.cache_only:
+            return resource
+
+        try:
+            resource.validate_request(resource.request)
+        except ValidationError:
+            if self.config.revalidate and resource.should_revalidate():
+                resource.start_revalidation(self.config)
+            else:
+                if resource.id:
+                    await resource.adelete()
+                resource = self
+
+        if resource.success and not resource.is_revalidating:
+            return resource
+
+        resource.async_client = self._async_client
+        resource.request = resource.request_with_auth()
+        resource.defer_retries = self.defer_retries
+        await resource._asend()
+        return await resource._acomplete_send()
+
+    async def aretry(self):
+        """
+        The asyncio variant of ``retry``.
+
+        :return: HttpResource
+        """
+        assert self.retry_delay is not None, "Can't retry a resource without a deferred retry."
+        await self._asend()
+        return await self._acomplete_send()
+
+    async def _acomplete_send(self):
+        if self.retry_delay is not None:
+            return self
+        self.is_revalidating = False
+        self.handle_errors()
+        if self.config.interval_duration:
+            await asyncio.sleep(self.config.interval_duration / 1000)
+        return self
+
     def get(self, *args, **kwargs):
         """
         This method calls ``send`` with "get" as a method. See the ``send`` method for more information.
@@ -199,18 +495,33 @@ class HttpResource(Resource):
         * For a ContentType of text/html or text/xml data will be a BeautifulSoup instance
 
         Any other ContentType will result in None.
-        You are encouraged to overextend ``HttpResource`` to handle your own data types.
+        You are encouraged to override ``parse_content`` to handle your own data types.
+        Parsed content gets reused until the status, content type or body changes.
+
+        :return: content_type, data
+        """
+        return self.memoize_content(
+            (self.status, self.head.get("content-type"), self.body, self.body_file,),
+            self.parse_content
+        )
+
+    def parse_content(self):
+        """
+        Parses the body into the data that the ``content`` property returns.
 
         :return: content_type, data
         """
         if self.success:
             content_type = self.head.get("content-type", "unknown/unknown").split(';')[0]
-            if is_json_mimetype(content_type):
-                return content_type, json.loads(self.body)
+            body = self.get_body()
+            if body is None:
+                return content_type, None
+            elif is_json_mimetype(content_type):
+                return content_type, json.loads(body)
             elif content_type == "text/html":
-                return content_type, BeautifulSoup(self.body, "html.parser")
+                return content_type, BeautifulSoup(body, "html.parser")
             elif content_type == "text/xml" or content_type == "application/xml":
-                return content_type, BeautifulSoup(self.body, "xml")
+                return content_type, BeautifulSoup(body, "xml")
             else:
                 return content_type, None
         return None, None
@@ -245,13 +556,8 @@ class HttpResource(Resource):
     def _create_url(self, *args):
         url_template = copy(self.URI_TEMPLATE)
         variables = self.variables(*args)
-        url = URLObject(url_template.format(*variables["url"]))
-        params = url.query.dict
-        extra_params = self.parameters(**variables)
-        if extra_params:
-            params.update(extra_params)
-        url = url.set_query_params(params)
-        return str(url)
+        url = url_template.format(*variables["url"])
+        return set_query_params(url, self.parameters(**variables) or {})
 
     def headers(self, *args, **kwargs):
         """
@@ -434,32 +740,37 @@ class HttpResource(Resource):
         """
         Get the ``request`` that this resource will make with authentication headers and parameters added.
         Override ``auth_headers`` and/or ``auth_parameters`` to provide the headers and/or parameters.
+        Values like headers and data are copied, but values nested deeper inside them are shared with ``request``.
 
         :return: (dict) a copy of the ``request`` dictionary with authentication added
         """
-        url = URLObject(self.request.get("url"))
-        params = url.query.dict
-        params.update(self.auth_parameters())
-        url = url.set_query_params(params)
-        request = deepcopy(self.request)
-        request["url"] = str(url)
-        request["headers"].update(self.auth_headers())
+        request = self._copy_request()
+        auth_parameters = self.auth_parameters()
+        if auth_parameters:
+            request["url"] = set_query_params(request["url"], auth_parameters)
+        auth_headers = self.auth_headers()
+        if auth_headers:
+            request["headers"] = {**request["headers"], **auth_headers}
         return request
 
     def request_without_auth(self):
         """
         Get the ``request`` that this resource will make with authentication headers and parameters from
         ``auth_headers`` and ``auth_parameters`` removed.
+        Values like headers and data are copied, but values nested deeper inside them are shared with ``request``.
 
         :return: (dict) a copy of the ``request`` dictionary with authentication removed
         """
-        url = URLObject(self.request.get("url"))
-        url = url.del_query_params(self.auth_parameters())
-        request = deepcopy(self.request)
-        request["url"] = str(url)
-        for key in self.auth_headers().keys():
-            if key in request["headers"]:
-                del request["headers"][key]
+        request = self._copy_request()
+        auth_parameters = self.auth_parameters()
+        if auth_parameters:
+            request["url"] = delete_query_params(request["url"], auth_parameters)
+        auth_headers = self.auth_headers()
+        if any(key in request["headers"] for key in auth_headers):
+            request["headers"] = {
+                key: value for key, value in request["headers"].items()
+                if key not in auth_headers
+            }
         return request
 
     #######################################################
@@ -485,24 +796,28 @@ class HttpResource(Resource):
         Often a source will indicate how to continue gather more data.
         By overriding the ``next_parameters`` developers can indicate how continuation requests can be made.
         Calling this method will build a new request using these parameters.
+        Values like headers and data are copied, but values nested deeper inside them are shared with ``request``.
 
         :return: (dict) a dictionary representing a continuation request to be made
         """
-        if not self.success or not self.next_parameters():
+        if not self.success:
             return None
-        url = URLObject(self.request.get("url"))
-        params = url.query.dict
-        params.update(self.next_parameters())
-        url = url.set_query_params(params)
-        request = deepcopy(self.request)
-        request["url"] = str(url)
+        next_parameters = self.next_parameters()
+        if not next_parameters:
+            return None
+        request = self._copy_request()
+        request["url"] = set_query_params(request["url"], next_parameters)
         return request
 
+    def _copy_request(self):
+        # Copying one level down is enough to change headers or data of the copy, without copying large bodies
+        return {key: copy(value) for key, value in self.request.items()}
+
     def next(self) -> Self | None:
         request = self.create_next_request()
         if not request:
             return None
-        next_instance = self.__class__(request=request)
+        next_instance = self.__class__(request=request, session=self._session, async_client=self._async_client)
         return next_instance
 
     #######################################################
@@ -523,32 +838,37 @@ class HttpResource(Resource):
             self.set_error(error_code, connection_error=True)
             return
 
-        method = self.request.get("method")
-        form_data = self.request.get("data") if not method == "get" else None
-        form_data, files = self._format_data(form_data)
-        json_data = self.request.get("json") if not method == "get" else None
-
-        request = requests.Request(
-            method=method,
-            url=self.request.get("url"),
-            headers=self.request.get("headers"),
-            data=form_data,
-            json=json_data,
-            files=files
-        )
+        request = requests.Request(**self._get_request_arguments())
         preq = self.session.prepare_request(request)
-
-        for backoff_delay in [0] + self.config.backoff_delays:
-            sleep(backoff_delay)
-            try:
-                response = self.session.send(
-                    preq,
-                    proxies=DATAGROWTH_CONFIGURATION.HTTP_RESOURCE_REQUESTS_PROXIES,
-                    verify=DATAGROWTH_CONFIGURATION.HTTP_RESOURCE_REQUESTS_VERIFY,
-                    timeout=self.timeout,
-                    allow_redirects=self.config.allow_redirects
+        retry_policy = self.get_retry_policy()
+        # Deferred retries have waited for their delay before calling this method again
+        backoff_delay, has_waited = self._start_attempts()
+        stream = self.should_stream()
+        # Sessions only get a stream argument for streamed requests, which keeps other calls to send unchanged
+        stream_arguments: dict[str, Any] = {"stream": True} if stream else {}
+
+        while True:
+            sleep(0 if has_waited else backoff_delay)
+            has_waited = False
+            if self.config.rate_limit:
+                get_rate_limiter(self.config).acquire(
+                    self.get_rate_limit_key(), self.config.rate_limit, self.config.rate_limit_burst
                 )
-                self._update_from_results(response)
+            try:
+                with DATAGROWTH_HOST_LIMITER.limit(preq.url, self.config.concurrency_per_host):
+                    response = self.session.send(
+                        preq,
+                        proxies=DATAGROWTH_CONFIGURATION.HTTP_RESOURCE_REQUESTS_PROXIES,
+                        verify=DATAGROWTH_CONFIGURATION.HTTP_RESOURCE_REQUESTS_VERIFY,
+                        timeout=self.timeout,
+                        allow_redirects=self.config.allow_redirects,
+                        **stream_arguments
+                    )
+                    # Streamed bodies get read while the request still counts towards the host concurrency
+                    if stream:
+                        self._update_from_stream(response)
+                if not stream and not self.is_not_modified(response):
+                    self._update_from_results(response)
             except requests.exceptions.SSLError:
                 self.set_error(496, connection_error=True)
             except requests.Timeout:
@@ -559,14 +879,268 @@ class HttpResource(Resource):
                 self.set_error(600, connection_error=True)
             # Checks the status to see if we need to backoff from the server/connection or not
             self.request["backoff_delay"] = backoff_delay if backoff_delay else False
-            if self.status not in [420, 429, 502, 503, 504]:
+            if not retry_policy.should_retry(self.status, self.retry_attempt):
+                break
+            backoff_delay = retry_policy.get_delay(self.retry_attempt, self.head)
+            self.retry_attempt += 1
+            if self.defer_retries:
+                self.retry_delay = backoff_delay
+                return
+
+    async def _asend(self):
+        """
+        The asyncio variant of ``_send`` that uses httpx to make the request.
+        """
+        assert self.request and isinstance(self.request, dict), \
+            "Trying to make request before having a valid request dictionary."
+
+        if self.request.get("cancel", False):
+            error_code = self.status or 113
+            self.set_error(error_code, connection_error=True)
+            return
+
+        arguments = self._get_request_arguments()
+        # Unlike requests httpx expects raw payloads under a separate content argument
+        if isinstance(arguments["data"], (bytes, str)):
+            arguments["content"] = arguments.pop("data")
+        request = self.async_client.build_request(timeout=self.timeout, **arguments)
+        retry_policy = self.get_retry_policy()
+        # Deferred retries have waited for their delay before calling this method again
+        backoff_delay, has_waited = self._start_attempts()
+        stream = self.should_stream()
+
+        while True:
+            # Waiting for a retry allows the event loop to continue with other requests in the meantime
+            await asyncio.sleep(0 if has_waited else backoff_delay)
+            has_waited = False
+            if self.config.rate_limit:
+                await get_rate_limiter(self.config).aacquire(
+                    self.get_rate_limit_key(), self.config.rate_limit, self.config.rate_limit_burst
+                )
+            try:
+                async with DATAGROWTH_HOST_LIMITER.alimit(str(request.url), self.config.concurrency_per_host):
+                    response = await self.async_client.send(
+                        request,
+                        follow_redirects=self.config.allow_redirects,
+                        stream=stream
+                    )
+                    if stream:
+                        await self._aupdate_from_stream(response)
+                if not stream and not self.is_not_modified(response):
+                    self._update_from_results(response)
+            except httpx.TimeoutException:
+                self.set_error(504, connection_error=True)
+            except httpx.TransportError as exc:
+                is_ssl_error = isinstance(exc.__cause__ or exc.__context__, ssl.SSLError)
+                self.set_error(496 if is_ssl_error else 502, connection_error=True)
+            except UnicodeDecodeError:
+                self.set_error(600, connection_error=True)
+            # Checks the status to see if we need to backoff from the server/connection or not
+            self.request["backoff_delay"] = backoff_delay if backoff_delay else False
+            if not retry_policy.should_retry(self.status, self.retry_attempt):
                 break
+            backoff_delay = retry_policy.get_delay(self.retry_attempt, self.head)
+            self.retry_attempt += 1
+            if self.defer_retries:
+                self.retry_delay = backoff_delay
+                return
+
+    def get_retry_policy(self):
+        """
+        Returns the policy that decides when and after how long failed requests get retried.
+        By default the policy gets created from the backoff configurations.
+
+        :return: RetryPolicy
+        """
+        return RetryPolicy.from_config(self.config)
+
+    def _start_attempts(self):
+        if self.retry_delay is None:
+            self.retry_attempt = 0
+            return 0, False
+        backoff_delay = self.retry_delay
+        self.retry_delay = None
+        return backoff_delay, True
+
+    def get_conditional_headers(self):
+        """
+        Returns the headers that make a request conditional on whether the stored response has changed.
+        These headers are based on the ETag and Last-Modified headers of the stored response.
+
+        :return: (dict) the If-None-Match and/or If-Modified-Since headers
+        """
+        if not self.success or not self.head:
+            return {}
+        headers = {}
+        if self.head.get("etag"):
+            headers["If-None-Match"] = self.head["etag"]
+        if self.head.get("last-modified"):
+            headers["If-Modified-Since"] = self.head["last-modified"]
+        return headers
+
+    def should_revalidate(self):
+        """
+        Indicates whether an expired stored resource can get revalidated with a conditional request,
+        instead of getting deleted and requested again.
+
+        :return: (bool) whether to revalidate
+        """
+        if not self.id or self.purge_at is None or self.purge_at > now():
+            return False
+        return bool(self.get_conditional_headers())
+
+    def start_revalidation(self, config):
+        """
+        Prepares an expired resource to make a conditional request.
+        When the response indicates that nothing changed, the stored head and body are kept.
+        Either way the resource gets a new purge_at based on the given configuration.
+
+        :param config: (ConfigurationType) the configuration of the resource that requested the revalidation
+        """
+        self.is_revalidating = True
+        if config.purge_immediately:
+            self.purge_at = now()
+        elif config.purge_after:
+            self.purge_at = now() + timedelta(**config.purge_after)
+        else:
+            self.purge_at = None
+
+    def is_not_modified(self, response):
+        return self.is_revalidating and response.status_code == 304
+
+    def get_rate_limit_key(self):
+        """
+        Returns the key of the token bucket that limits the rate of requests when the ``rate_limit`` is set.
+        By default this is the host of the request, but with a ``rate_limit_scope`` of "class"
+        all requests made by the resource class share a bucket. Override this method to group requests differently.
+
+        :return: (str) the rate limit key
+        """
+        if self.config.rate_limit_scope == "class":
+            return self._meta.label
+        return DATAGROWTH_SESSION_POOL.get_host(self.request.get("url"))
+
+    def _get_request_arguments(self):
+        method = self.request.get("method")
+        form_data = self.request.get("data") if not method == "get" else None
+        form_data, files = self._format_data(form_data)
+        json_data = self.request.get("json") if not method == "get" else None
+        headers = self.request.get("headers")
+        if self.is_revalidating:
+            headers = {**(headers or {}), **self.get_conditional_headers()}
+        return {
+            "method": method,
+            "url": self.request.get("url"),
+            "headers": headers,
+            "data": form_data,
+            "json": json_data,
+            "files": files
+        }
 
     def _update_from_results(self, response):
-        self.head = dict(response.headers.lower_items())
+        # Works for responses from both requests and httpx
+        self.head = {key.lower(): value for key, value in response.headers.items()}
         self.status = response.status_code
         self.body = response.content if isinstance(response.content, str) else \
             response.content.decode("utf-8", "replace")
+        self.body_file = None
+
+    def should_stream(self):
+        """
+        Indicates whether response bodies get read in chunks instead of all at once.
+        By default this depends on the ``stream`` configuration.
+
+        :return: (bool) whether to stream the response body
+        """
+        return bool(self.config.stream)
+
+    def _get_body_options(self):
+        return {
+            "max_size": self.config.max_body_size,
+            # Only resources with a body_file column can store bodies outside of the database
+            "spill_size": self.config.body_spill_size if isinstance(self, BodyFileMixin) else None
+        }
+
+    def _update_from_stream(self, response):
+        """
+        Reads the body of a response that got requested with the ``stream`` configuration in chunks.
+        Bodies larger than ``body_spill_size`` get written to a file in storage
+        and bodies larger than ``max_body_size`` get the ``BODY_TOO_LARGE_STATUS`` without being read completely.
+
+        :param response: a requests response that streams its body
+        """
+        try:
+            if self.is_not_modified(response):
+                return
+            try:
+                body = read_body(response.iter_content(STREAM_CHUNK_SIZE), response.headers, **self._get_body_options())
+            except BodyTooLarge:
+                self._set_body_too_large(response)
+                return
+            self._update_from_body(response, body)
+        finally:
+            response.close()
+
+    async def _aupdate_from_stream(self, response):
+        """
+        The asyncio variant of ``_update_from_stream`` for httpx responses.
+
+        :param response: a httpx response that streams its body
+        """
+        try:
+            if self.is_not_modified(response):
+                return
+            try:
+                body = await aread_body(response.aiter_bytes(STREAM_CHUNK_SIZE), response.headers,
+                                        **self._get_body_options())
+            except BodyTooLarge:
+                self._set_body_too_large(response)
+                return
+            self._update_from_body(response, body)
+        finally:
+            await response.aclose()
+
+    def _update_from_body(self, response, body):
+        try:
+            self.head = {key.lower(): value for key, value in response.headers.items()}
+            self.status = response.status_code
+            if body.is_spilled:
+                self.body = None
+                self.body_file = self._save_body_file(body.open())
+            else:
+                self.body = body.content.decode("utf-8", "replace")
+                self.body_file = None
+        finally:
+            body.close()
+
+    def _set_body_too_large(self, response):
+        self.head = {key.lower(): value for key, value in response.headers.items()}
+        self.body = ""
+        self.body_file = None
+        self.set_error(BODY_TOO_LARGE_STATUS)
+
+    def _save_body_file(self, file):
+        """
+        Saves a body that is too large to store in the database to the default storage.
+        Override this method to change where bodies get stored.
+
+        :param file: (file) a binary file that holds the body
+        :return: (str) the name of the file in storage
+        """
+        name = uuid4().hex
+        path = os.path.join(self._meta.app_label, "bodies", name[0], name[1:3], f"{name}.txt")
+        return default_storage.save(path, File(file))
+
+    def get_body(self):
+        """
+        Returns the body of the resource, which gets read from storage when the body is stored in ``body_file``.
+
+        :return: (str) the body or None
+        """
+        if self.body_file is None:
+            return self.body
+        with default_storage.open(self.body_file, "rb") as file:
+            return file.read().decode("utf-8", "replace")
 
     def handle_errors(self):
         """
@@ -607,19 +1181,61 @@ class HttpResource(Resource):
     #######################################################
     # Methods and properties to tweak Django
 
+    _prepare_only = False
+    # When set failed requests don't wait for a retry, but set retry_delay and return the resource instead
+    defer_retries = False
+    retry_delay = None
+    retry_attempt = 0
+    # A dictionary with stored resources by uri and data_hash that replaces database lookups in send when set
+    prefetched_resources = None
+    # Set when an expired resource makes a conditional request to find out if its stored response is still valid
+    is_revalidating = False
+
     def __init__(self, *args, **kwargs):
-        self.session = kwargs.pop("session", requests.Session())
+        self._session = kwargs.pop("session", None)
+        self._async_client = kwargs.pop("async_client", None)
         self.timeout = kwargs.pop("timeout", 30)
         super(HttpResource, self).__init__(*args, **kwargs)
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        Returns the session that was given to the resource upon initialization.
+        Without such a session a shared session from ``DATAGROWTH_SESSION_POOL`` for the host of the request
+        is returned, which keeps connections alive across resources.
+        """
+        if self._session is not None:
+            return self._session
+        url = self.request.get("url") if isinstance(self.request, dict) else None
+        return DATAGROWTH_SESSION_POOL.get_session(url, self.config)
+
+    @session.setter
+    def session(self, session: requests.Session | None) -> None:
+        self._session = session
+
+    @property
+    def async_client(self):
+        """
+        Returns the ``httpx.AsyncClient`` that was given to the resource upon initialization.
+        Without such a client a shared client from ``DATAGROWTH_ASYNC_CLIENT_POOL`` for the host of the request
+        is returned, which keeps connections alive across resources within the running event loop.
+        """
+        if self._async_client is not None:
+            return self._async_client
+        url = self.request.get("url") if isinstance(self.request, dict) else None
+        return DATAGROWTH_ASYNC_CLIENT_POOL.get_client(url, self.config)
+
+    @async_client.setter
+    def async_client(self, client) -> None:
+        self._async_client = client
+
     def clean(self):
-        if self.request and not self.uri:
-            uri_request = self.request_without_auth()
+        uri_request = self.request_without_auth() if self.request and (not self.uri or not self.data_hash) else None
+        if uri_request and not self.uri:
             self.uri = self.uri_from_url(uri_request.get("url"))
-        if self.request and not self.data_hash:
-            uri_request = self.request_without_auth()
+        if uri_request and not self.data_hash:
             data_key = HttpResource._get_data_key(uri_request)
-            self.data_hash = self.hash_from_data(uri_request.get(data_key))
+            self.data_hash = self.hash_from_data(uri_request.get(data_key), self.config.fingerprint_algorithm)
         super().clean()
 
     #######################################################
@@ -636,37 +1252,21 @@ class HttpResource(Resource):
         :param url: the URL to normalize to URI
         :return: a normalized URI suitable for lookups
         """
-        url = URLObject(url)
-        params = sorted(url.query.dict.items(), key=lambda item: item[0])
-        url = url.with_query(urlencode(params))
-        return str(url).replace(url.scheme + "://", "")
+        return normalize_legacy_uri(url)
 
     @staticmethod
-    def hash_from_data(data):
+    def hash_from_data(data, algorithm=None):
         """
         Given a dictionary will recursively sort and JSON dump the keys and values of that dictionary.
         The end result is given to SHA-1 to create a hash, that is unique for that data.
         This hash can be used for a database lookup to find earlier requests that send the same data.
+        When another fingerprint algorithm is given the hash gets prefixed with the name of that algorithm.
 
         :param data: (dict) a dictionary of the data to be hashed
+        :param algorithm: (str) the fingerprint algorithm or None to use SHA-1
         :return: the hash of the data
         """
-        if not data:
-            return ""
-
-        payload = []
-        for key, value in data.items():
-            if not isinstance(value, dict):
-                payload.append((key, value))
-            else:
-                payload.append((key, HttpResource.hash_from_data(value)))
-
-        payload.sort(key=lambda item: item[0])
-        hash_payload = json.dumps(payload).encode("utf-8")
-
-        hsh = hashlib.sha1()
-        hsh.update(hash_payload)
-        return hsh.hexdigest()
+        return hash_legacy_data(data, algorithm)
 
     @staticmethod
     def parse_content_type(content_type, default_encoding="utf-8"):
@@ -756,6 +1356,16 @@ class URLResource(HttpResource):
 
 
 class MicroServiceResource(HttpResource):
+    """
+    Connects to a micro service that is configured under the ``MICRO_SERVICE`` name in the ``connections``
+    configuration. A connection specifies a ``protocol``, ``host`` and ``path``.
+
+    Instead of a single ``host`` a connection may specify a list of ``hosts`` to spread requests over.
+    The ``balancing`` of a connection is either "round_robin" or "least_outstanding"
+    and hosts with connection errors are not used for ``ejection_duration`` seconds.
+    Resources of such connections use the micro service name as host in their URI,
+    which makes stored resources independent of the host that handled the request.
+    """
 
     CONFIG_NAMESPACE = "micro_service"
 
@@ -771,10 +1381,12 @@ class MicroServiceResource(HttpResource):
         assert self.connection is not None, \
             '"{}" is an unknown micro service in the "connections" configuration. ' \
             'Is it added through register_defaults?'.format(self.MICRO_SERVICE)
+        self.balancer = DATAGROWTH_HOST_BALANCERS.get_balancer(self.MICRO_SERVICE, self.connection)
+        self.balanced_host = None
 
     def send(self, method, *args, **kwargs):
         protocol = self.connection.get("protocol", None)
-        host = self.connection.get("host", None)
+        host = self.MICRO_SERVICE if self.balancer else self.connection.get("host", None)
         path = self.connection.get("path", None)
         assert protocol, "A protocol should be specified in the micro service configuration."
         assert host, "A host should be specified in the micro service configuration"
@@ -782,6 +1394,32 @@ class MicroServiceResource(HttpResource):
         args = (protocol, host, path) + args
         return super().send(method, *args, **kwargs)
 
+    def _send(self):
+        if self.balancer is None or not self.request or self.request.get("cancel", False):
+            return super()._send()
+        self.balanced_host = self.balancer.acquire()
+        try:
+            super()._send()
+        finally:
+            self.balancer.release(self.balanced_host, failed=self.status in CONNECTION_ERROR_STATUSES)
+            self.balanced_host = None
+
+    async def _asend(self):
+        if self.balancer is None or not self.request or self.request.get("cancel", False):
+            return await super()._asend()
+        self.balanced_host = self.balancer.acquire()
+        try:
+            await super()._asend()
+        finally:
+            self.balancer.release(self.balanced_host, failed=self.status in CONNECTION_ERROR_STATUSES)
+            self.balanced_host = None
+
+    def _get_request_arguments(self):
+        arguments = super()._get_request_arguments()
+        if self.balanced_host is not None:
+            arguments["url"] = HostBalancer.replace_host(arguments["url"], self.balanced_host)
+        return arguments
+
     class Meta(HttpResource.Meta):
         abstract = True
 
@@ -824,6 +1462,9 @@ class TestClientResource(HttpResource):
             response = client_method(path, follow=True)
         self._update_from_results(response)
 
+    async def _asend(self):
+        await sync_to_async(self._send)()
+
     def _update_from_results(self, response):
         self.head = {
             key: value[1]  # extracts the lower case headers
@@ -1,10 +1,20 @@
 import logging
+import asyncio
+from time import monotonic, sleep
+from queue import Queue
+from threading import Thread, Semaphore, Event
+from heapq import heappush, heappop
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
+from asgiref.sync import sync_to_async
 from django.apps import apps
+from django.db import close_old_connections
 
 from datagrowth.configuration import ConfigurationType, load_config
 from datagrowth.exceptions import DGResourceException
+from datagrowth.resources.buffers import close_resource
 from datagrowth.resources.http.decorators import load_session
+from datagrowth.utils import ibatch
 
 
 log = logging.getLogger("datagrowth")
@@ -16,16 +26,134 @@ def get_resource_link(config, session=None):
     Resource = apps.get_model(config.resource)
     link = Resource(config=config.to_dict(protected=True))
 
+    # Without a session the resource uses a shared session from the session pool
     if session is not None:
         link.session = session
-    assert link.session, "Http resources require a session object to get a link object."
-    token = getattr(link.session, "token", None)
-    if token:
-        link.token = token
-    # FEATURE: update session to use proxy when configured
+        token = getattr(session, "token", None)
+        if token:
+            link.token = token
     return link
 
 
+def get_prepared_resource_links(config, args_list, kwargs_list, method=None, session=None):
+    """
+    Creates a resource link for every args and kwargs pair and prepares the requests of these links.
+    Stored resources for all links get fetched with one query per ``batch_size`` links.
+    These resources are given to the links as ``prefetched_resources``,
+    such that sending links doesn't require a cache lookup per link.
+
+    :param config: (ConfigurationType) the configuration of the resources
+    :param args_list: (list) lists of arguments for every link
+    :param kwargs_list: (list) dictionaries of keyword arguments for every link
+    :param method: (str) the HTTP method for all links
+    :param session: (requests.Session) the session for all links or None to use the session pool
+    :return: (list) prepared links in order of the input
+    """
+    links = []
+    for args, kwargs in zip(args_list, kwargs_list):
+        link = get_resource_link(config, session)
+        try:
+            link.prepare(method, *args, **kwargs)
+        except Exception:
+            # Sending an unprepared link will raise the same error again, but in the order of the input
+            link = get_resource_link(config, session)
+        links.append(link)
+
+    Resource = apps.get_model(config.resource)
+    prefetched_resources = {}
+    for batch in ibatch([link for link in links if link.request], batch_size=config.batch_size):
+        queryset = Resource.objects.filter(
+            uri__in={link.uri for link in batch},
+            data_hash__in={link.data_hash for link in batch}
+        )
+        if not queryset.ordered:
+            queryset = queryset.order_by("pk")
+        # Later resources overwrite earlier resources, which mimics the behaviour of QuerySet.last
+        for resource in queryset:
+            prefetched_resources[(resource.uri, resource.data_hash,)] = resource
+        for link in batch:
+            link.prefetched_resources = prefetched_resources
+    return links
+
+
+def _send_links(config, link, method, args, kwargs, defer_retries=False, buffer=None):
+    """
+    Sends a link and its continuation links, while yielding the resources in order.
+    When defer_retries is True links that need a retry get yielded before they are closed with a retry_delay set.
+    The caller should wait for the retry_delay before continuing this generator, which will retry the link.
+    When a buffer is given links get added to the buffer instead of getting saved directly.
+    """
+    count = 0
+    limit = config.continuation_limit or 1
+    # Continue as long as there are subsequent requests
+    while link and count < limit:
+        prefetched_resources = link.prefetched_resources
+        link.defer_retries = defer_retries
+        # Get payload
+        try:
+            link = link.send(method, *args, **kwargs)
+            while defer_retries and link.retry_delay is not None:
+                yield link
+                link = link.retry()
+            close_resource(link, buffer)
+        except DGResourceException as exc:
+            log.log(config.resource_exception_log_level, exc)
+            link = exc.resource
+            close_resource(link, buffer)
+            if config.resource_exception_reraise:
+                raise
+        # Makes stored links available to any later links with the same input
+        if prefetched_resources is not None:
+            prefetched_resources[(link.uri, link.data_hash,)] = link
+        yield link
+        link = link.next()
+        count += 1
+
+
+def _prefetch_links(links, lookahead):
+    """
+    Runs a generator from ``_send_links`` on a background thread,
+    such that up to ``lookahead`` continuation requests are made while the consumer processes earlier resources.
+    """
+    results = Queue()
+    # A slot gets taken for every resource that is in flight, queued or being processed by the consumer
+    slots = Semaphore(lookahead + 1)
+    stopped = Event()
+
+    def produce():
+        try:
+            while True:
+                slots.acquire()
+                if stopped.is_set():
+                    return
+                try:
+                    resource = next(links)
+                except StopIteration:
+                    results.put((None, None,))
+                    return
+                results.put((resource, None,))
+        except Exception as exc:
+            results.put((None, exc,))
+        finally:
+            links.close()
+            close_old_connections()
+
+    producer = Thread(target=produce, name="datagrowth-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            resource, exception = results.get()
+            if exception is not None:
+                raise exception
+            if resource is None:
+                return
+            yield resource
+            slots.release()
+    finally:
+        stopped.set()
+        slots.release()  # wakes up the producer when it waits for a slot
+
+
 @load_config()
 @load_session()
 def send_iterator(config, *args, **kwargs):
@@ -33,28 +161,188 @@ def send_iterator(config, *args, **kwargs):
     session = kwargs.pop("session", None)
     method = kwargs.pop("method", None)
     link = get_resource_link(config, session)
+    links = _send_links(config, link, method, args, kwargs)
+    if config.continuation_prefetch and (config.continuation_limit or 1) > 1:
+        yield from _prefetch_links(links, config.continuation_prefetch)
+        return
+    yield from links
+
+
+@load_config()
+@load_session()
+def send_serie_iterator(config, args_list, kwargs_list, method=None, session=None, buffer=None):
+    """
+    Sends a request for every args and kwargs pair and yields the resources in order of the input.
+    When a ``ResourceBuffer`` is given as buffer resources get written to the database in bulk.
+    Such resources may not have an id until the buffer gets flushed,
+    which happens at the latest when the iterator is exhausted.
+    """
+    links = get_prepared_resource_links(config, args_list, kwargs_list, method=method, session=session)
+    try:
+        if config.concurrency and config.concurrency > 1:
+            yield from _send_serie_concurrently(config, links, args_list, kwargs_list, method=method, buffer=buffer)
+            return
+        for link, args, kwargs in zip(links, args_list, kwargs_list):
+            yield from _send_links(config, link, method, args, kwargs, buffer=buffer)
+    finally:
+        if buffer is not None:
+            buffer.flush()
+
+
+def _send_serie_concurrently(config, links, args_list, kwargs_list, method=None, buffer=None):
+    """
+    Sends every link from a thread pool with ``concurrency`` workers.
+    Continuation requests of a link are send in order.
+    Instead of waiting for a retry inside a worker, links that need a retry get rescheduled,
+    such that workers continue with other links in the meantime.
+    Resources are yielded in the order of the input lists, regardless of which worker finishes first.
+    """
+    def advance(chain, resources):
+        # Runs a chain until it finishes or needs a retry, in which case the retry delay is returned
+        try:
+            for resource in chain:
+                if resource.retry_delay is not None:
+                    return resource.retry_delay
+                resources.append(resource)
+            return None
+        finally:
+            close_old_connections()
+
+    chains = (
+        (index, _send_links(config, link, method, args, kwargs, defer_retries=True, buffer=buffer), [],)
+        for index, (link, args, kwargs) in enumerate(zip(links, args_list, kwargs_list))
+    )
+    retries = []  # a heap of chains by the time they should get retried
+    running = {}
+    finished = {}
+    next_index = 0
+    executor = ThreadPoolExecutor(max_workers=config.concurrency, thread_name_prefix="datagrowth")
+    try:
+        while True:
+            # Start chains that are due for a retry first and start new chains second
+            while len(running) < config.concurrency:
+                if retries and retries[0][0] <= monotonic():
+                    _, index, chain, resources = heappop(retries)
+                else:
+                    job = next(chains, None)
+                    if job is None:
+                        break
+                    index, chain, resources = job
+                running[executor.submit(advance, chain, resources)] = (index, chain, resources,)
+            if not running and not retries:
+                break
+            timeout = max(retries[0][0] - monotonic(), 0) if retries else None
+            if not running:
+                sleep(timeout)
+                continue
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, chain, resources = running.pop(future)
+                retry_delay = future.result()
+                if retry_delay is not None:
+                    heappush(retries, (monotonic() + retry_delay, index, chain, resources,))
+                else:
+                    finished[index] = resources
+            # Output resources in order of input
+            while next_index in finished:
+                yield from finished.pop(next_index)
+                next_index += 1
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def _asend_links(config, link, method, args, kwargs, defer_retries=False):
+    """
+    The asyncio variant of ``_send_links``.
+    """
     count = 0
     limit = config.continuation_limit or 1
     # Continue as long as there are subsequent requests
     while link and count < limit:
+        prefetched_resources = link.prefetched_resources
+        link.defer_retries = defer_retries
         # Get payload
         try:
-            link = link.send(method, *args, **kwargs)
-            link.close()
+            link = await link.asend(method, *args, **kwargs)
+            while defer_retries and link.retry_delay is not None:
+                yield link
+                link = await link.aretry()
+            await link.aclose()
         except DGResourceException as exc:
             log.log(config.resource_exception_log_level, exc)
             link = exc.resource
-            link.close()
+            await link.aclose()
             if config.resource_exception_reraise:
                 raise
+        # Makes stored links available to any later links with the same input
+        if prefetched_resources is not None:
+            prefetched_resources[(link.uri, link.data_hash,)] = link
         yield link
         link = link.next()
         count += 1
 
 
 @load_config()
-@load_session()
-def send_serie_iterator(config, args_list, kwargs_list, method=None, session=None):
-    for args, kwargs in zip(args_list, kwargs_list):
-        for resource in send_iterator(method=method, config=config, session=session, *args, **kwargs):
-            yield resource
+async def asend_iterator(config, *args, **kwargs):
+    """
+    The asyncio variant of ``send_iterator``. Instead of a session it accepts a ``httpx.AsyncClient`` as client.
+    Without a client resources will use a shared client from the async client pool.
+    """
+    # Set vars
+    client = kwargs.pop("client", None)
+    method = kwargs.pop("method", None)
+    link = get_resource_link(config)
+    if client is not None:
+        link.async_client = client
+    async for resource in _asend_links(config, link, method, args, kwargs):
+        yield resource
+
+
+@load_config()
+async def asend_serie_iterator(config, args_list, kwargs_list, method=None, client=None):
+    """
+    The asyncio variant of ``send_serie_iterator``.
+    When the ``concurrency`` configuration is above 1 that many args and kwargs pairs are send at the same time.
+    Links that wait for a retry don't count towards the concurrency.
+    Resources are always yielded in the order of the input lists.
+    """
+    links = await sync_to_async(get_prepared_resource_links)(config, args_list, kwargs_list, method=method)
+    if client is not None:
+        for link in links:
+            link.async_client = client
+
+    if not config.concurrency or config.concurrency <= 1:
+        for link, args, kwargs in zip(links, args_list, kwargs_list):
+            async for resource in _asend_links(config, link, method, args, kwargs):
+                yield resource
+        return
+
+    semaphore = asyncio.Semaphore(config.concurrency)
+
+    async def send_chain(link, args, kwargs):
+        chain = _asend_links(config, link, method, args, kwargs, defer_retries=True)
+        resources = []
+        while True:
+            retry_delay = None
+            async with semaphore:
+                async for resource in chain:
+                    if resource.retry_delay is not None:
+                        retry_delay = resource.retry_delay
+                        break
+                    resources.append(resource)
+            if retry_delay is None:
+                return resources
+            # Other links may use the slot of this link while it waits for its retry
+            await asyncio.sleep(retry_delay)
+
+    tasks = [
+        asyncio.create_task(send_chain(link, args, kwargs))
+        for link, args, kwargs in zip(links, args_list, kwargs_list)
+    ]
+    try:
+        for task in tasks:
+            for resource in await task:
+                yield resource
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -7,9 +7,11 @@ from bs4 import BeautifulSoup
 from pydantic import Field, field_validator, HttpUrl
 
 from datagrowth.exceptions import DGHttpError50X, DGHttpError40X
-from datagrowth.registry import Tag
+from datagrowth.registry import DATAGROWTH_REGISTRY, Tag
 from datagrowth.signatures import InputsValidator
+from datagrowth.utils.fingerprints import SIGNATURE_HASH_ALGORITHM, normalize_uri
 from datagrowth.resources.http.signature import HttpAuth, HttpSignature, HttpMode, HttpMethod
+from datagrowth.resources.http.balancers import DATAGROWTH_HOST_BALANCERS
 from datagrowth.resources.pydantic import Resource
 from datagrowth.utils import is_json_mimetype
 
@@ -158,18 +160,7 @@ class HttpResource(Resource[HttpSignature]):
         Given a URL this method will strip the protocol and sort the parameters.
         That way a database lookup for a URL will always return URL's that logically match that URL.
         """
-        split_url = urlsplit(url)
-        params = sorted(parse_qsl(split_url.query, keep_blank_values=True), key=lambda item: item[0])
-        normalized_url = urlunsplit((
-            split_url.scheme,
-            split_url.netloc,
-            split_url.path,
-            urlencode(params, doseq=True),
-            split_url.fragment,
-        ))
-        if split_url.scheme:
-            return normalized_url.replace(f"{split_url.scheme}://", "", 1)
-        return normalized_url
+        return normalize_uri(url)
 
     #####################
     # Auth
@@ -207,6 +198,7 @@ class HttpResource(Resource[HttpSignature]):
         auth = HttpAuth(headers=self.auth_headers(), parameters=self.auth_parameters())
         return HttpSignature(
             uri=self.uri_from_url(url),
+            hash_algorithm=self.config.fingerprint_algorithm or SIGNATURE_HASH_ALGORITHM,
             args=args,
             kwargs=kwargs,
             data=self.data(**data_arguments) if method != HttpMethod.GET or self.config.allow_get_body else None,
@@ -225,8 +217,7 @@ class HttpResource(Resource[HttpSignature]):
         """
         return self.status is not None and 200 <= self.status < 209
 
-    @property
-    def content(self) -> tuple[str | None, Any]:
+    def parse_content(self) -> tuple[str | None, Any]:
         if self.result is None:
             return None, None
         content_type = (self.result.content_type or "unknown/unknown").split(";", 1)[0].strip().lower()
@@ -276,6 +267,7 @@ class URLResource(HttpResource):
         auth = HttpAuth(headers=self.auth_headers(), parameters={})
         return HttpSignature(
             uri=self.uri_from_url(url),
+            hash_algorithm=self.config.fingerprint_algorithm or SIGNATURE_HASH_ALGORITHM,
             args=args,
             kwargs=kwargs,
             data=None,
@@ -294,6 +286,13 @@ class MicroServiceResource(HttpResource):
     MICRO_SERVICE: ClassVar[str | None] = None
     URI_TEMPLATE: ClassVar[str] = "{protocol}://{host}{path}"
 
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        # Extractors look up the balancer of the micro service in their own connections configuration
+        connections = self.config.get("connections", None)
+        if self.EXTRACTOR and connections:
+            self._extractor = DATAGROWTH_REGISTRY.get_shared_extractor(self.EXTRACTOR, {"connections": connections})
+
     def prepare_inputs(self, *args: Any, **kwargs: Any) -> HttpSignature:
         # Try to load micro service configuration and assert correctness
         assert self.MICRO_SERVICE is not None, \
@@ -303,7 +302,9 @@ class MicroServiceResource(HttpResource):
             '"{}" is an unknown micro service in the "connections" configuration. ' \
             'Is it added through register_defaults?'.format(self.MICRO_SERVICE)
         protocol = connection.get("protocol", None)
-        host = connection.get("host", None)
+        # Connections with multiple hosts use the service name as host to keep signatures independent of hosts
+        balancer = DATAGROWTH_HOST_BALANCERS.get_balancer(self.MICRO_SERVICE, connection)
+        host = self.MICRO_SERVICE if balancer is not None else connection.get("host", None)
         path = connection.get("path", None)
         assert protocol, "A protocol should be specified in the micro service configuration."
         assert host, "A host should be specified in the micro service configuration"
@@ -0,0 +1,85 @@
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Sequence
+
+from datagrowth.configuration import ConfigurationType
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request should be retried and how long to wait before doing so.
+
+    Delays follow the ``backoff_delays`` configuration, unless the server indicates a delay with a
+    ``Retry-After`` header and ``backoff_retry_after`` is enabled.
+    A random amount of up to ``backoff_jitter`` times the delay gets added to prevent many clients
+    from retrying at the exact same moment. Delays never exceed ``backoff_max_delay`` seconds.
+    """
+
+    RETRY_STATUSES = frozenset([420, 429, 502, 503, 504])
+
+    def __init__(self, delays: Sequence[float], jitter: float = 0.0, max_delay: float | None = None,
+                 retry_after: bool = True) -> None:
+        self.delays = list(delays)
+        self.jitter = jitter
+        self.max_delay = max_delay
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_config(cls, config: ConfigurationType) -> "RetryPolicy":
+        return cls(
+            config.backoff_delays,
+            jitter=config.backoff_jitter,
+            max_delay=config.backoff_max_delay,
+            retry_after=config.backoff_retry_after
+        )
+
+    def should_retry(self, status: int | None, attempt: int) -> bool:
+        """
+        Indicates whether a request with the given status should be retried.
+
+        :param status: (int) the status of the last attempt
+        :param attempt: (int) the amount of retries that were made before the last attempt
+        :return: (bool) whether to retry
+        """
+        return status in self.RETRY_STATUSES and attempt < len(self.delays)
+
+    @staticmethod
+    def parse_retry_after(headers: Mapping[str, Any] | None) -> float | None:
+        """
+        Reads the ``Retry-After`` header as either an amount of seconds or as a HTTP date.
+
+        :param headers: (dict) the response headers with lower case keys
+        :return: (float) seconds to wait or None if the header is missing or invalid
+        """
+        value = (headers or {}).get("retry-after")
+        if value is None:
+            return None
+        value = str(value).strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(tz=timezone.utc)).total_seconds(), 0.0)
+
+    def get_delay(self, attempt: int, headers: Mapping[str, Any] | None = None) -> float:
+        """
+        Returns the seconds to wait before making the next attempt.
+
+        :param attempt: (int) the amount of retries that were made before the last attempt
+        :param headers: (dict) the response headers of the last attempt with lower case keys
+        :return: (float) seconds to wait
+        """
+        delay = self.delays[attempt]
+        retry_after = self.parse_retry_after(headers) if self.retry_after else None
+        if retry_after is not None:
+            delay = retry_after
+        if self.jitter and delay:
+            delay += random.uniform(0, delay * self.jitter)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return delay
@@ -0,0 +1,180 @@
+import os
+import asyncio
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from threading import Lock
+from typing import Any, Hashable
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary
+
+import requests
+from requests.adapters import HTTPAdapter
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from datagrowth.configuration import ConfigurationType, create_config
+
+
+# Pooled sessions are shared by all resources that request the same host, so they shouldn't remember any cookies.
+# Cookies that get set during redirects are still used for the remainder of those redirects.
+NO_COOKIES_POLICY = DefaultCookiePolicy(allowed_domains=[])
+
+
+class HttpSessionPool:
+    """
+    Keeps ``requests.Session`` objects alive for the lifetime of a process,
+    such that consecutive requests to the same host reuse TCP connections and TLS handshakes.
+
+    Sessions are keyed by host together with the proxies and verify settings that apply to that host.
+    Each session mounts an ``HTTPAdapter`` that gets sized through the ``session_pool_connections``
+    and ``session_pool_maxsize`` configurations from the ``http_resource`` namespace.
+    The pool is thread safe and forgets all sessions in child processes after a fork,
+    because sockets should never be shared between processes.
+    Pooled sessions don't store cookies from responses, because these would leak between unrelated resources.
+    """
+
+    def __init__(self) -> None:
+        self.sessions: dict[Hashable, requests.Session] = {}
+        self.lock = Lock()
+
+    @staticmethod
+    def get_host(url: str | None) -> str:
+        if not url:
+            return ""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}" if parts.netloc else ""
+
+    @staticmethod
+    def get_key(host: str, config: ConfigurationType) -> Hashable:
+        proxies = config.requests_proxies
+        if isinstance(proxies, dict):
+            proxies = tuple(sorted(proxies.items()))
+        return host, proxies, config.requests_verify, config.session_pool_connections, config.session_pool_maxsize
+
+    @staticmethod
+    def create_session(config: ConfigurationType) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.session_pool_connections,
+            pool_maxsize=config.session_pool_maxsize
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if config.requests_proxies:
+            session.proxies.update(config.requests_proxies)
+        session.verify = config.requests_verify
+        session.cookies.set_policy(NO_COOKIES_POLICY)
+        return session
+
+    def get_session(self, url: str | None = None, config: ConfigurationType | dict[str, Any] | None = None) \
+            -> requests.Session:
+        """
+        Returns the session that should be used for the host of given url.
+        When no session exists yet for the host a session gets created and stored for future use.
+
+        :param url: (str) the url that will be requested or None to get a session that is not bound to a host
+        :param config: (ConfigurationType or dict) the configuration that holds the http_resource settings
+        :return: (requests.Session) a session shared with all other requests to the same host
+        """
+        if not isinstance(config, ConfigurationType):
+            config = create_config("http_resource", config or {})
+        key = self.get_key(self.get_host(url), config)
+        session = self.sessions.get(key)
+        if session is not None:
+            return session
+        with self.lock:
+            if key not in self.sessions:
+                self.sessions[key] = self.create_session(config)
+            return self.sessions[key]
+
+    def clear(self) -> None:
+        """
+        Closes all sessions and their connections.
+        """
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions = {}
+        for session in sessions:
+            session.close()
+
+    def reset(self) -> None:
+        """
+        Forgets all sessions without closing them. Used in child processes after a fork,
+        where closing would interfere with connections that still belong to the parent.
+        """
+        self.sessions = {}
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+
+class AsyncHttpClientPool:
+    """
+    The asyncio counterpart of ``HttpSessionPool``, which keeps ``httpx.AsyncClient`` objects alive
+    per event loop and per host together with the proxies and verify settings that apply to that host.
+    Clients are bound to the event loop that created them and get forgotten once that loop is garbage collected.
+    Like pooled sessions these clients don't store cookies from responses.
+    The httpx package needs to be installed to make use of this pool.
+    """
+
+    def __init__(self) -> None:
+        self.clients: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, Any]] = WeakKeyDictionary()
+
+    @staticmethod
+    def create_client(config: ConfigurationType) -> Any:
+        if httpx is None:
+            raise ImportError("The httpx package is required to send requests with asyncio")
+        limits = httpx.Limits(
+            max_connections=config.session_pool_maxsize,
+            max_keepalive_connections=config.session_pool_connections
+        )
+        mounts = {
+            f"{scheme}://": httpx.AsyncHTTPTransport(proxy=proxy, verify=config.requests_verify, limits=limits)
+            for scheme, proxy in (config.requests_proxies or {}).items()
+        }
+        return httpx.AsyncClient(
+            verify=config.requests_verify,
+            limits=limits,
+            mounts=mounts or None,
+            cookies=CookieJar(policy=NO_COOKIES_POLICY)
+        )
+
+    def get_client(self, url: str | None = None, config: ConfigurationType | dict[str, Any] | None = None) -> Any:
+        """
+        Returns the client that should be used for the host of given url within the running event loop.
+        When no client exists yet for the host a client gets created and stored for future use.
+
+        :param url: (str) the url that will be requested or None to get a client that is not bound to a host
+        :param config: (ConfigurationType or dict) the configuration that holds the http_resource settings
+        :return: (httpx.AsyncClient) a client shared with all other requests to the same host within the loop
+        """
+        if not isinstance(config, ConfigurationType):
+            config = create_config("http_resource", config or {})
+        loop = asyncio.get_running_loop()
+        clients = self.clients.setdefault(loop, {})
+        key = HttpSessionPool.get_key(HttpSessionPool.get_host(url), config)
+        if key not in clients:
+            clients[key] = self.create_client(config)
+        return clients[key]
+
+    async def aclose(self) -> None:
+        """
+        Closes all clients that belong to the running event loop.
+        """
+        clients = self.clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.aclose()
+
+    def reset(self) -> None:
+        self.clients = WeakKeyDictionary()
+
+
+DATAGROWTH_SESSION_POOL = HttpSessionPool()
+DATAGROWTH_ASYNC_CLIENT_POOL = AsyncHttpClientPool()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DATAGROWTH_SESSION_POOL.reset)
+    os.register_at_fork(after_in_child=DATAGROWTH_ASYNC_CLIENT_POOL.reset)
@@ -0,0 +1,131 @@
+from tempfile import TemporaryFile
+from typing import Any, AsyncIterable, BinaryIO, Iterable, Mapping
+
+
+BODY_TOO_LARGE_STATUS = 601
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class ResponseBody:
+    """
+    Collects the chunks of a streamed response body.
+    Bodies stay in memory until they grow beyond ``spill_size`` bytes,
+    after which all chunks get written to a temporary file instead.
+    Writing more than ``max_size`` bytes raises ``BodyTooLarge``.
+    When a hasher like ``hashlib.sha256()`` is given it gets updated with every chunk that gets written.
+    """
+
+    def __init__(self, max_size: int | None = None, spill_size: int | None = None, hasher: Any = None) -> None:
+        self.max_size = max_size
+        self.spill_size = spill_size
+        self.hasher = hasher
+        self.size = 0
+        self.buffer = bytearray()
+        self.file: BinaryIO | None = None
+
+    def check_length(self, headers: Mapping[str, Any]) -> None:
+        """
+        Raises ``BodyTooLarge`` before reading any chunk when the Content-Length header exceeds ``max_size``.
+        """
+        content_length = headers.get("content-length")
+        if self.max_size is None or content_length is None:
+            return
+        try:
+            content_length = int(content_length)
+        except ValueError:
+            return
+        if content_length > self.max_size:
+            raise BodyTooLarge(f"Content-Length of {content_length} exceeds the maximum of {self.max_size}")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.max_size is not None and self.size > self.max_size:
+            raise BodyTooLarge(f"Body exceeds the maximum of {self.max_size}")
+        if self.hasher is not None:
+            self.hasher.update(chunk)
+        if self.file is not None:
+            self.file.write(chunk)
+            return
+        self.buffer += chunk
+        if self.spill_size is not None and len(self.buffer) > self.spill_size:
+            self.file = TemporaryFile()
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+
+    @property
+    def is_spilled(self) -> bool:
+        return self.file is not None
+
+    @property
+    def hexdigest(self) -> str:
+        assert self.hasher is not None, "Can't get the digest of a body that is read without a hasher"
+        return self.hasher.hexdigest()
+
+    @property
+    def content(self) -> bytes:
+        assert not self.is_spilled, "Can't get the content of a body that spilled to a file"
+        return bytes(self.buffer)
+
+    def open(self) -> BinaryIO:
+        """
+        Returns the temporary file of a spilled body, positioned at the start of the body.
+        """
+        assert self.file is not None, "Can't open a body that didn't spill to a file"
+        self.file.seek(0)
+        return self.file
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.buffer = bytearray()
+
+
+def read_body(chunks: Iterable[bytes], headers: Mapping[str, Any], max_size: int | None = None,
+              spill_size: int | None = None, hasher: Any = None) -> ResponseBody:
+    """
+    Reads a streamed response body chunk by chunk.
+
+    :param chunks: (iterable) the chunks of the body
+    :param headers: (mapping) the response headers with lower case keys
+    :param max_size: (int) maximum amount of bytes to read or None to read any body
+    :param spill_size: (int) amount of bytes to keep in memory before writing to a temporary file or None
+    :param hasher: (hashlib hash) a hash object to update with the body or None
+    :return: ResponseBody
+    """
+    body = ResponseBody(max_size=max_size, spill_size=spill_size, hasher=hasher)
+    try:
+        body.check_length(headers)
+        for chunk in chunks:
+            body.write(chunk)
+    except BaseException:
+        body.close()
+        raise
+    return body
+
+
+async def aread_body(chunks: AsyncIterable[bytes], headers: Mapping[str, Any], max_size: int | None = None,
+                     spill_size: int | None = None, hasher: Any = None) -> ResponseBody:
+    """
+    The asyncio variant of ``read_body``.
+
+    :param chunks: (async iterable) the chunks of the body
+    :param headers: (mapping) the response headers with lower case keys
+    :param max_size: (int) maximum amount of bytes to read or None to read any body
+    :param spill_size: (int) amount of bytes to keep in memory before writing to a temporary file or None
+    :param hasher: (hashlib hash) a hash object to update with the body or None
+    :return: ResponseBody
+    """
+    body = ResponseBody(max_size=max_size, spill_size=spill_size, hasher=hasher)
+    try:
+        body.check_length(headers)
+        async for chunk in chunks:
+            body.write(chunk)
+    except BaseException:
+        body.close()
+        raise
+    return body
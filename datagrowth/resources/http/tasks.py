@@ -4,7 +4,8 @@ from django.apps import apps
 from celery import current_app as app
 
 from datagrowth.configuration import ConfigurationType, load_config
-from datagrowth.resources.http import load_session, send_iterator
+from datagrowth.resources.buffers import ResourceBuffer
+from datagrowth.resources.http import load_session, send_iterator, send_serie_iterator
 
 
 log = logging.getLogger("datagrowth")
@@ -16,13 +17,12 @@ def get_resource_link(config, session=None):
     Resource = apps.get_model(config.resource)
     link = Resource(config=config.to_dict(protected=True))
 
+    # Without a session the resource uses a shared session from the session pool
     if session is not None:
         link.session = session
-    assert link.session, "Http resources require a session object to get a link object."
-    token = getattr(link.session, "token", None)
-    if token:
-        link.token = token
-    # FEATURE: update session to use proxy when configured
+        token = getattr(session, "token", None)
+        if token:
+            link.token = token
     return link
 
 
@@ -51,11 +51,16 @@ def send(config, *args, **kwargs):
 def send_serie(config, args_list, kwargs_list, session=None, method=None):
     success = []
     errors = []
-    for args, kwargs in zip(args_list, kwargs_list):
-        # Get the results
-        scc, err = send(method=method, config=config, session=session, *args, **kwargs)
-        success += scc
-        errors += err
+    # The iterator sends concurrently when configured and always returns resources in order of the input lists.
+    # Resources get written in bulk through the buffer and only have ids after the iterator is exhausted.
+    buffer = ResourceBuffer.from_config(config)
+    links = list(send_serie_iterator(args_list=args_list, kwargs_list=kwargs_list, method=method, config=config,
+                                     session=session, buffer=buffer))
+    for link in links:
+        if link.success:
+            success.append(link.id)
+        else:
+            errors.append(link.id)
     return [success, errors]
 
 
@@ -95,3 +100,16 @@ def send_mass(config, args_list, kwargs_list, session=None, method=None):
         method=method,
         session=session
     )
+
+
+@app.task(name="http_resource.download_many")
+@load_config()
+@load_session()
+def download_many(config, urls, session=None):
+    # The resource configuration should point to a HttpFileResource
+    Resource = apps.get_model(config.resource)
+    report = Resource.download_many(urls, config=config, session=session)
+    return [
+        [resource.id for resource in report.success],
+        [resource.id for resource in report.errors]
+    ]
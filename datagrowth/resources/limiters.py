@@ -0,0 +1,149 @@
+import os
+import json
+import asyncio
+import hashlib
+import tempfile
+from threading import Lock
+from time import sleep, time
+from pathlib import Path
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from datagrowth.configuration import ConfigurationType
+
+
+class TokenBucketLimiter:
+    """
+    Limits the rate at which resources make requests or run commands with a token bucket per key.
+    A bucket holds up to ``burst`` tokens and gets refilled with ``rate`` tokens per second.
+    Every request takes a token from the bucket and only waits when the bucket is empty.
+
+    Instead of polling for tokens a request reserves a token from the future when the bucket is empty.
+    This makes waiting requests get served in order of arrival without any busy waiting.
+    Buckets of this class are shared between threads within a process.
+    """
+
+    def __init__(self) -> None:
+        self.buckets: dict[str, tuple[float, float]] = {}
+        self.lock = Lock()
+
+    @staticmethod
+    def take_token(bucket: tuple[float, float] | None, now: float, rate: float, burst: int) \
+            -> tuple[tuple[float, float], float]:
+        """
+        Takes a token from a bucket and returns the updated bucket together with the seconds to wait for the token.
+
+        :param bucket: (tuple) the amount of tokens and the time they were counted or None for a full bucket
+        :param now: (float) the current time in seconds
+        :param rate: (float) the amount of tokens that get added to the bucket every second
+        :param burst: (int) the maximum amount of tokens in the bucket
+        :return: the updated bucket and the seconds to wait
+        """
+        tokens, updated_at = bucket if bucket is not None else (float(burst), now,)
+        tokens = min(float(burst), tokens + max(now - updated_at, 0.0) * rate)
+        tokens -= 1
+        wait = -tokens / rate if tokens < 0 else 0.0
+        return (tokens, now,), wait
+
+    def reserve(self, key: str, rate: float, burst: int = 1) -> float:
+        """
+        Reserves a token from the bucket for the given key without waiting for it.
+
+        :param key: (str) identifies the bucket, for instance a host name
+        :param rate: (float) the amount of requests allowed per second
+        :param burst: (int) the amount of requests allowed at once
+        :return: (float) seconds to wait before the reserved token may be used
+        """
+        with self.lock:
+            self.buckets[key], wait = self.take_token(self.buckets.get(key), time(), rate, burst)
+        return wait
+
+    def acquire(self, key: str, rate: float, burst: int = 1) -> float:
+        """
+        Takes a token from the bucket for the given key and waits when no tokens are available.
+
+        :param key: (str) identifies the bucket, for instance a host name
+        :param rate: (float) the amount of requests allowed per second
+        :param burst: (int) the amount of requests allowed at once
+        :return: (float) seconds that were waited
+        """
+        wait = self.reserve(key, rate, burst)
+        if wait:
+            sleep(wait)
+        return wait
+
+    async def aacquire(self, key: str, rate: float, burst: int = 1) -> float:
+        """
+        The asyncio variant of ``acquire``, which waits without blocking the event loop.
+        """
+        wait = self.reserve(key, rate, burst)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def reset(self) -> None:
+        self.buckets = {}
+        self.lock = Lock()
+
+
+class FileTokenBucketLimiter(TokenBucketLimiter):
+    """
+    A ``TokenBucketLimiter`` that stores buckets in files inside a directory.
+    Buckets get updated while holding a file lock, which shares buckets across all processes on a machine
+    that use the same directory.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        super().__init__()
+        if fcntl is None:
+            raise RuntimeError("The file rate limit backend requires a platform that supports fcntl")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get_bucket_path(self, key: str) -> Path:
+        file_name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{file_name}.bucket"
+
+    def reserve(self, key: str, rate: float, burst: int = 1) -> float:
+        assert fcntl is not None, "The file rate limit backend requires a platform that supports fcntl"
+        file_descriptor = os.open(self.get_bucket_path(key), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX)
+            stored = os.read(file_descriptor, 1024)
+            bucket = tuple(json.loads(stored)) if stored else None
+            bucket, wait = self.take_token(bucket, time(), rate, burst)
+            os.lseek(file_descriptor, 0, os.SEEK_SET)
+            os.truncate(file_descriptor, 0)
+            os.write(file_descriptor, json.dumps(bucket).encode("utf-8"))
+        finally:
+            os.close(file_descriptor)  # releases the lock as well
+        return wait
+
+
+DATAGROWTH_RATE_LIMITER = TokenBucketLimiter()
+_file_rate_limiters: dict[str, FileTokenBucketLimiter] = {}
+
+
+def get_rate_limiter(config: ConfigurationType) -> TokenBucketLimiter:
+    """
+    Returns the rate limiter that the ``rate_limit_backend`` configuration indicates.
+    The "memory" backend shares buckets across threads and the "file" backend shares buckets across processes,
+    by storing buckets in the ``rate_limit_directory``.
+
+    :param config: (ConfigurationType) the configuration of a resource
+    :return: TokenBucketLimiter
+    """
+    if config.rate_limit_backend == "memory":
+        return DATAGROWTH_RATE_LIMITER
+    elif config.rate_limit_backend == "file":
+        directory = config.rate_limit_directory or os.path.join(tempfile.gettempdir(), "datagrowth-rate-limits")
+        if directory not in _file_rate_limiters:
+            _file_rate_limiters[directory] = FileTokenBucketLimiter(directory)
+        return _file_rate_limiters[directory]
+    raise ValueError(f"Unknown rate_limit_backend: {config.rate_limit_backend}")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DATAGROWTH_RATE_LIMITER.reset)
@@ -1,4 +1,4 @@
-from typing import Protocol, Any, Self, TypeVar
+from typing import Protocol, Any, Self, Sequence, TypeVar, runtime_checkable
 from pathlib import Path
 
 from datagrowth.signatures import Signature, InputsValidator
@@ -120,9 +120,39 @@ class ResourceStorageProtocol(Protocol):
         ...
 
 
+@runtime_checkable
+class BulkResourceStorageProtocol(Protocol):
+    """
+    Storages that implement this protocol save and load batches of resources when ``Resource.extract_many`` gets used.
+    """
+
+    config: ConfigurationProperty | ConfigurationType
+
+    def save_many(self, resources: Sequence[ResourceProtocol]) -> list[Signature]:
+        ...
+
+    def load_many(self, signatures: Sequence[Signature]) -> list[ResourceProtocol | None]:
+        ...
+
+
 class ResourceExtractorProtocol(Protocol[ExtractorSignatureType]):
 
     config: ConfigurationProperty | ConfigurationType
 
     def extract(self, signature: ExtractorSignatureType) -> ResourceProtocol:
         ...
+
+
+@runtime_checkable
+class AsyncResourceExtractorProtocol(Protocol[ExtractorSignatureType]):
+    """
+    Extractors that implement this protocol extract on the event loop when ``Resource.aextract`` gets used.
+    """
+
+    config: ConfigurationProperty | ConfigurationType
+
+    def extract(self, signature: ExtractorSignatureType) -> ResourceProtocol:
+        ...
+
+    async def aextract(self, signature: ExtractorSignatureType) -> ResourceProtocol:
+        ...
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, ClassVar, Self, Generic, cast
+import asyncio
+from copy import deepcopy
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, ClassVar, Iterable, Self, Sequence, Generic, cast
 from uuid import uuid4
 from datetime import datetime, timedelta, timezone
 import base64
@@ -10,7 +13,12 @@ from pydantic import BaseModel, Field, PrivateAttr, UUID4, field_serializer, fie
 from datagrowth.configuration import ConfigurationType
 from datagrowth.registry import DATAGROWTH_REGISTRY, Tag
 from datagrowth.signatures import Signature, InputsValidator
-from datagrowth.resources.protocols import ResourceExtractorProtocol, ResourceSignatureType, ResourceStorageProtocol
+from datagrowth.utils.data import ContentCache
+from datagrowth.exceptions import DGResourceException
+from datagrowth.resources.singleflight import DATAGROWTH_SINGLE_FLIGHT, copy_exception
+from datagrowth.resources.protocols import (AsyncResourceExtractorProtocol, BulkResourceStorageProtocol,
+                                            ResourceExtractorProtocol, ResourceSignatureType,
+                                            ResourceStorageProtocol)
 
 
 class Result(BaseModel):
@@ -56,6 +64,18 @@ class Resource(BaseModel, Generic[ResourceSignatureType]):
     def extractor(self) -> ResourceExtractorProtocol[ResourceSignatureType] | None:
         return self._extractor
 
+    def set_storage(self, storage: ResourceStorageProtocol | None) -> None:
+        """
+        Replaces the storage that is shared with other Resources by a storage for this Resource only.
+        """
+        self._storage = storage
+
+    def set_extractor(self, extractor: ResourceExtractorProtocol[ResourceSignatureType] | None) -> None:
+        """
+        Replaces the extractor that is shared with other Resources by an extractor for this Resource only.
+        """
+        self._extractor = extractor
+
     #####################
     # Publib interface
     #####################
@@ -69,25 +89,188 @@ class Resource(BaseModel, Generic[ResourceSignatureType]):
         inputs = self.validate_inputs(*args, **kwargs)
         signature = self.prepare_inputs(*inputs.args, **inputs.kwargs)
 
-        # Try to look up the Signature in storage
-        if self.storage is not None:
-            # Downgrade Signature to basic format and check against storage if extraction has taken place already
-            if self.storage.config.allow_load:
-                storage_signature = Signature(**signature.model_dump(mode="json"))
-                loaded_resource = self.storage.load(storage_signature)
-                if loaded_resource is not None:
-                    return cast(Self, loaded_resource)
+        # Concurrent extractions of the same Signature within a process share the outcome of the first extraction
+        if not signature.hash or not self.config.single_flight:
+            return self._load_or_extract(signature)
+        resource, _ = DATAGROWTH_SINGLE_FLIGHT.do(
+            (self.__class__, signature.hash,),
+            lambda: self._load_or_extract(signature),
+            share=self._copy_shared
+        )
+        return resource
+
+    async def aextract(self, *args: Any, **kwargs: Any) -> Self:
+        """
+        The asyncio variant of ``extract``. Storage lookups run in a thread.
+        Extractors that implement ``aextract`` extract on the running event loop
+        and other extractors extract in a thread.
+        """
+        inputs = self.validate_inputs(*args, **kwargs)
+        signature = self.prepare_inputs(*inputs.args, **inputs.kwargs)
+
+        # Concurrent extractions of the same Signature on an event loop share the outcome of the first extraction
+        if not signature.hash or not self.config.single_flight:
+            return await self._aload_or_extract(signature)
+        resource, _ = await DATAGROWTH_SINGLE_FLIGHT.ado(
+            (self.__class__, signature.hash,),
+            lambda: self._aload_or_extract(signature),
+            share=self._copy_shared
+        )
+        return resource
+
+    def extract_many(self, inputs: Iterable[InputsValidator | tuple[Sequence[Any], dict[str, Any]]],
+                     concurrency: int | None = None) -> list[Self | Exception]:
+        """
+        Extracts a batch of inputs, which are ``InputsValidator`` instances or tuples of args and kwargs.
+        All inputs get validated before any extraction and storage gets checked for all signatures at once.
+        Signatures that aren't stored get extracted by ``concurrency`` threads,
+        which defaults to the "concurrency" configuration. Identical signatures get extracted once.
+        Extracted resources get closed with a single save to storage.
+
+        :param inputs: (iterable) the inputs to extract resources for
+        :param concurrency: (int) the maximum amount of extractions at the same time
+        :return: (list) a resource or the exception that was raised for every input, in the order of the inputs
+        """
+        outcomes: list[Any] = []
+        pending: dict[int, tuple[Self, ResourceSignatureType]] = {}
+        for ix, item in enumerate(inputs):
+            args, kwargs = (item.args, item.kwargs,) if isinstance(item, InputsValidator) else item
+            resource = self._get_batch_resource()
+            try:
+                validated = resource.validate_inputs(*args, **kwargs)
+                signature = resource.prepare_inputs(*validated.args, **validated.kwargs)
+            except Exception as exc:
+                outcomes.append(exc)
+                continue
+            outcomes.append(None)
+            pending[ix] = (resource, signature,)
+
+        # Look up all signatures in storage and group the signatures that need extraction
+        loaded_resources = self._load_many([signature for _, signature in pending.values()])
+        misses: dict[Any, list[tuple[int, Self, ResourceSignatureType]]] = {}
+        for (ix, (resource, signature)), loaded_resource in zip(pending.items(), loaded_resources):
+            if loaded_resource is not None:
+                outcomes[ix] = loaded_resource
+                continue
+            key = signature.hash or ("input", ix,)
+            misses.setdefault(key, []).append((ix, resource, signature,))
+
+        # Extract the misses and share outcomes between identical signatures
+        futures: dict[Any, Future] = {}
+        if misses:
+            concurrency = int(concurrency or self.config.get("concurrency", 1) or 1)
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(misses))) as executor:
+                futures = {
+                    key: executor.submit(group[0][1]._extract, group[0][2])
+                    for key, group in misses.items()
+                }
+        extracted = []
+        for key, group in misses.items():
+            try:
+                extracted_resource = futures[key].result()
+            except Exception as exc:
+                for position, (ix, _, _) in enumerate(group):
+                    outcomes[ix] = self._copy_shared(exc) if position else exc
+                continue
+            extracted.append(extracted_resource)
+            for position, (ix, _, _) in enumerate(group):
+                outcomes[ix] = extracted_resource._copy_shared_resource() if position else extracted_resource
+        self._close_many(extracted)
+        return outcomes
+
+    @classmethod
+    def _copy_shared(cls, outcome: Any) -> Any:
+        # Every caller that waited for an extraction gets its own resource, also when the extraction raised an error
+        if not isinstance(outcome, BaseException):
+            return cast(Resource, outcome)._copy_shared_resource()
+        shared = copy_exception(outcome)
+        if isinstance(shared, DGResourceException) and isinstance(shared.resource, Resource):
+            shared.resource = shared.resource._copy_shared_resource()
+        return shared
+
+    def _copy_shared_resource(self) -> Self:
+        # Copies keep the id, such that closing any of the copies saves the same resource
+        shared = self.model_copy(update={
+            "signature": self.signature.model_copy() if self.signature is not None else None,
+            "result": self.result.model_copy(deep=True) if self.result is not None else None,
+            "metadata": deepcopy(self.metadata),
+        })
+        shared._content_cache = None
+        return shared
+
+    def _get_batch_resource(self) -> Self:
+        resource = self.__class__(config=self.config)
+        resource._storage = self._storage
+        resource._extractor = self._extractor
+        return resource
+
+    def _load_many(self, signatures: list[ResourceSignatureType]) -> list[Self | None]:
+        if self.storage is None or not self.storage.config.allow_load or not signatures:
+            return [None for _ in signatures]
+        storage_signatures = [Signature(**signature.model_dump(mode="json")) for signature in signatures]
+        if isinstance(self.storage, BulkResourceStorageProtocol):
+            return cast("list[Self | None]", self.storage.load_many(storage_signatures))
+        return [cast("Self | None", self.storage.load(signature)) for signature in storage_signatures]
+
+    def _close_many(self, resources: list[Self]) -> None:
+        if self.storage is not None and self.storage.config.allow_save and resources:
+            if isinstance(self.storage, BulkResourceStorageProtocol):
+                self.storage.save_many(list(resources))
+            else:
+                for resource in resources:
+                    self.storage.save(resource)
+            if self.storage.config.snapshots:
+                for resource in resources:
+                    resource.close_snapshot(self.storage)
+        for resource in resources:
+            if resource.signature is not None:
+                resource.signature.close()
+
+    def _load(self, signature: ResourceSignatureType) -> Self | None:
+        # Downgrade Signature to basic format and check against storage if extraction has taken place already
+        if self.storage is None or not self.storage.config.allow_load:
+            return None
+        storage_signature = Signature(**signature.model_dump(mode="json"))
+        return cast("Self | None", self.storage.load(storage_signature))
 
+    def _get_extractor(self) -> ResourceExtractorProtocol[ResourceSignatureType]:
         # Validate that extraction is actually allowed/possible
         if self.extractor is None:
             raise NotImplementedError(
                 f"{self.__class__.__name__} does not specify an extractor or implement the extract method."
             )
+        return self.extractor
+
+    def _load_or_extract(self, signature: ResourceSignatureType) -> Self:
+        # Try to look up the Signature in storage
+        loaded_resource = self._load(signature)
+        if loaded_resource is not None:
+            return loaded_resource
 
         # Attempt extracting data from the remote as prescribed by prepare_signature method
+        return self._extract(signature)
+
+    def _extract(self, signature: ResourceSignatureType) -> Self:
+        extractor = self._get_extractor()
         self.signature = signature
         self.open_signature(signature)
-        raw_extracted = self.extractor.extract(signature)
+        return self._update_from_extracted(extractor.extract(signature))
+
+    async def _aload_or_extract(self, signature: ResourceSignatureType) -> Self:
+        loaded_resource = await asyncio.to_thread(self._load, signature)
+        if loaded_resource is not None:
+            return loaded_resource
+
+        extractor = self._get_extractor()
+        self.signature = signature
+        await asyncio.to_thread(self.open_signature, signature)
+        if isinstance(extractor, AsyncResourceExtractorProtocol):
+            raw_extracted = await extractor.aextract(signature)
+        else:
+            raw_extracted = await asyncio.to_thread(extractor.extract, signature)
+        return self._update_from_extracted(raw_extracted)
+
+    def _update_from_extracted(self, raw_extracted: Any) -> Self:
         extracted = cast("Resource[ResourceSignatureType]", raw_extracted)
         if isinstance(extracted, self.__class__):
             extracted.handle_errors()
@@ -108,6 +291,12 @@ class Resource(BaseModel, Generic[ResourceSignatureType]):
             self.signature.close()
         return self
 
+    async def aclose(self) -> Self:
+        """
+        The asyncio variant of ``close``, which saves to storage in a thread.
+        """
+        return await asyncio.to_thread(self.close)
+
     def open_signature(self, signature: ResourceSignatureType) -> None:
         if not isinstance(signature.data, str) or not signature.data.startswith("bin://"):
             return
@@ -130,6 +319,21 @@ class Resource(BaseModel, Generic[ResourceSignatureType]):
 
     @property
     def content(self) -> tuple[str | None, Any]:
+        """
+        Returns the content type and data of the result.
+        With the ``content_cache`` configuration parsed content gets reused until the status or result changes.
+        Override ``parse_content`` to change how data gets parsed.
+        """
+        if not self.config.content_cache:
+            return self.parse_content()
+        if self._content_cache is None:
+            self._content_cache = ContentCache()
+        return self._content_cache.get(
+            (self.status, self.result,), self.parse_content,
+            read_only=self.config.content_read_only
+        )
+
+    def parse_content(self) -> tuple[str | None, Any]:
         if self.result is None:
             return None, None
         data = self.result.body if self.success else self.result.errors
@@ -157,11 +361,13 @@ class Resource(BaseModel, Generic[ResourceSignatureType]):
 
     _storage: ResourceStorageProtocol | None = PrivateAttr(default=None)
     _extractor: ResourceExtractorProtocol[ResourceSignatureType] | None = PrivateAttr(default=None)
+    _content_cache: ContentCache | None = PrivateAttr(default=None)
 
     def model_post_init(self, __context: Any) -> None:
         cls = self.__class__
-        self._storage = DATAGROWTH_REGISTRY.get_storage(cls.STORAGE) if cls.STORAGE else None
-        self._extractor = DATAGROWTH_REGISTRY.get_extractor(cls.EXTRACTOR) if cls.EXTRACTOR else None
+        # Storages and extractors are shared between Resources to prevent setting them up for every Resource
+        self._storage = DATAGROWTH_REGISTRY.get_shared_storage(cls.STORAGE) if cls.STORAGE else None
+        self._extractor = DATAGROWTH_REGISTRY.get_shared_extractor(cls.EXTRACTOR) if cls.EXTRACTOR else None
 
     @classmethod
     def _get_config_namespaces(cls) -> list[str]:
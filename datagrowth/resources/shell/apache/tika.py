@@ -45,9 +45,8 @@ class TikaResource(ShellResource):
     CONTENT_TYPE = "application/json"
     DIRECTORY_SETTING = "shell_resource_bin_dir"
 
-    @property
-    def content(self) -> tuple[str | None, Any]:
-        content_type, raw = super().content
+    def parse_content(self) -> tuple[str | None, Any]:
+        content_type, raw = super().parse_content()
         if not raw:
             return content_type, raw
         data = json.loads(raw)[0]  # TODO: allow multiple document input
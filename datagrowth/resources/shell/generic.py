@@ -1,4 +1,5 @@
 import subprocess
+import hashlib
 import string
 import json
 import jsonschema
@@ -15,6 +16,8 @@ from django.db.models import JSONField
 
 from datagrowth.configuration import DATAGROWTH_CONFIGURATION
 from datagrowth.resources.base import Resource
+from datagrowth.resources.limiters import get_rate_limiter
+from datagrowth.resources.cache import DATAGROWTH_RESOURCE_CACHE, MISSING
 from datagrowth.exceptions import DGShellError, DGResourceDoesNotExist
 
 
@@ -90,7 +93,7 @@ class ShellResource(Resource):
 
         self.clean()  # sets self.uri
 
-        resource = self.__class__.objects.filter(uri=self.uri, stdin=self.stdin).last()
+        resource = self.get_cached_resource()
         if resource is None:
             if self.config.cache_only:
                 raise DGResourceDoesNotExist("Could not retrieve resource from cache", resource=self)
@@ -109,12 +112,34 @@ class ShellResource(Resource):
         if resource.success:
             return resource
 
+        if resource.config.rate_limit:
+            get_rate_limiter(resource.config).acquire(
+                resource._meta.label, resource.config.rate_limit, resource.config.rate_limit_burst
+            )
         resource._run()
         resource.handle_errors()
         if resource.config.interval_duration:
             sleep(resource.config.interval_duration / 1000)
         return resource
 
+    def get_cached_resource(self):
+        """
+        Returns the last stored resource with the same uri and stdin as this resource or None if there is none.
+        The in-process resource cache gets consulted first when ``resource_cache_size`` is configured.
+
+        :return: ShellResource or None
+        """
+        key = self.get_cache_key()
+        resource = DATAGROWTH_RESOURCE_CACHE.get(key, self.config)
+        if resource is MISSING:
+            resource = self.__class__.objects.filter(uri=self.uri, stdin=self.stdin).last()
+            DATAGROWTH_RESOURCE_CACHE.set(key, resource, self.config)
+        return resource
+
+    def get_cache_key(self):
+        stdin_hash = hashlib.sha1(self.stdin.encode("utf-8")).hexdigest() if self.stdin else ""
+        return self._meta.label, self.uri, stdin_hash,
+
     @property
     def success(self):
         """
@@ -127,7 +152,17 @@ class ShellResource(Resource):
         """
         After a successful ``run`` call this method passes stdout from the command through the ``transform`` method.
         It then returns the value of the ``CONTENT_TYPE`` attribute as content type
-        and whatever transform returns as data
+        and whatever transform returns as data.
+        Parsed content gets reused until the status, command, stdout or transform changes.
+
+        :return: content_type, data
+        """
+        sources = (self.status, self.command, self.stdout, self.CONTENT_TYPE, self.transform,)
+        return self.memoize_content(sources, self.parse_content)
+
+    def parse_content(self) -> tuple[str | None, Any]:
+        """
+        Parses stdout into the data that the ``content`` property returns.
 
         :return: content_type, data
         """
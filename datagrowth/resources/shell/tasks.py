@@ -1,10 +1,12 @@
 import logging
+from contextlib import nullcontext
 
 from django.apps import apps
 from celery import current_app as app
 
 from datagrowth.configuration import load_config
 from datagrowth.exceptions import DGResourceException
+from datagrowth.resources.buffers import ResourceBuffer, close_resource
 
 
 log = logging.getLogger("datagrowth")
@@ -13,33 +15,37 @@ log = logging.getLogger("datagrowth")
 @app.task(name="shell_resource.run")
 @load_config()
 def run(config, *args, **kwargs):
-    # Set vars
+    success, errors = _run(config, None, *args, **kwargs)
+    # Output results in simple type for json serialization
+    return [[cmd.id for cmd in success], [cmd.id for cmd in errors]]
+
+
+@app.task(name="shell_resource.run_serie")
+@load_config()
+def run_serie(config, args_list, kwargs_list):
+    success = []
+    errors = []
+    # Resources get written in bulk through the buffer and only have ids after the buffer flushed
+    with ResourceBuffer.from_config(config) or nullcontext() as buffer:
+        for args, kwargs in zip(args_list, kwargs_list):
+            scc, err = _run(config, buffer, *args, **kwargs)
+            success += scc
+            errors += err
+    return [[cmd.id for cmd in success], [cmd.id for cmd in errors]]
+
+
+def _run(config, buffer, /, *args, **kwargs):
     success = []
     errors = []
     Resource = apps.get_model(config.resource)
     cmd = Resource(config=config.to_dict(protected=True))
-    # Run the command
     try:
         cmd = cmd.run(*args, **kwargs)
-        cmd.close()
-        success.append(cmd.id)
+        close_resource(cmd, buffer)
+        success.append(cmd)
     except DGResourceException as exc:
         log.log(config.resource_exception_log_level, exc)
         cmd = exc.resource
-        cmd.close()
-        errors.append(cmd.id)
-
-    # Output results in simple type for json serialization
-    return [success, errors]
-
-
-@app.task(name="shell_resource.run_serie")
-@load_config()
-def run_serie(config, args_list, kwargs_list):
-    success = []
-    errors = []
-    for args, kwargs in zip(args_list, kwargs_list):
-        scc, err = run(config=config, *args, **kwargs)
-        success += scc
-        errors += err
-    return [success, errors]
+        close_resource(cmd, buffer)
+        errors.append(cmd)
+    return success, errors
@@ -0,0 +1,155 @@
+import os
+import asyncio
+from copy import copy
+from threading import Lock, Event, get_ident
+from typing import Any, Awaitable, Callable, Hashable
+from weakref import WeakKeyDictionary
+
+
+class SharedInsert:
+    """
+    Makes copies of an unsaved model instance, that got shared by a flight, insert a single row.
+    The copy that gets saved first inserts the row and other copies update that row.
+    """
+
+    def __init__(self) -> None:
+        self.instance: Any = None
+        self.lock = Lock()
+
+
+def copy_exception(exception: BaseException) -> BaseException:
+    """
+    Copies an exception together with its traceback, such that callers in different threads don't raise the same object.
+    Exceptions that can't be copied get returned as is.
+    """
+    try:
+        shared = copy(exception)
+    except Exception:
+        return exception
+    return shared.with_traceback(exception.__traceback__)
+
+
+class Flight:
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: Any = None
+        self.exception: BaseException | None = None
+        self.thread = get_ident()
+
+
+class SingleFlight:
+    """
+    Coalesces identical work that is in flight at the same moment.
+    The first caller for a key does the work and concurrent callers with the same key wait for it to finish,
+    after which they get the same result or exception, unless a ``share`` function makes a copy for every follower.
+    Work for a key that finished isn't remembered.
+
+    Threads coalesce with other threads through ``do`` and tasks coalesce with tasks on the same event loop
+    through ``ado``. The flights get forgotten in child processes after a fork.
+    A call for a key from within the work for that same key would wait for itself,
+    so such a re-entrant call does the work again without coalescing.
+    """
+
+    def __init__(self) -> None:
+        self.flights: dict[Hashable, Flight] = {}
+        self.async_flights: WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            dict[Hashable, tuple[asyncio.Future, asyncio.Task | None]]
+        ]
+        self.async_flights = WeakKeyDictionary()
+        self.lock = Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any],
+           share: Callable[[Any], Any] | None = None) -> tuple[Any, bool]:
+        """
+        Calls the function, unless a call for the same key is in flight, in which case that call's outcome is reused.
+
+        :param key: (Hashable) identifies the work that the function does
+        :param function: (callable) a function without arguments that does the work
+        :param share: (callable) optionally returns the copy of a result or exception that a follower receives
+        :return: (tuple) the result and whether the result is shared with another caller
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self.flights[key] = Flight()
+        if not is_leader and flight.thread == get_ident():
+            return function(), False
+        if not is_leader:
+            flight.done.wait()
+            if flight.exception is not None:
+                raise flight.exception if share is None else share(flight.exception)
+            return flight.result if share is None else share(flight.result), True
+        try:
+            flight.result = function()
+        except BaseException as exc:
+            flight.exception = exc
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    async def ado(self, key: Hashable, function: Callable[[], Awaitable[Any]],
+                  share: Callable[[Any], Any] | None = None) -> tuple[Any, bool]:
+        """
+        The asyncio variant of ``do``. Flights are kept per event loop.
+
+        :param key: (Hashable) identifies the work that the function does
+        :param function: (callable) a coroutine function without arguments that does the work
+        :param share: (callable) optionally returns the copy of a result or exception that a follower receives
+        :return: (tuple) the result and whether the result is shared with another caller
+        """
+        loop = asyncio.get_running_loop()
+        flights = self.async_flights.setdefault(loop, {})
+        task = asyncio.current_task()
+        flight = flights.get(key)
+        if flight is not None and flight[1] is task:
+            return await function(), False
+        if flight is not None:
+            # Shielding prevents a cancelled follower from cancelling the work of the first caller
+            try:
+                result = await asyncio.shield(flight[0])
+            except asyncio.CancelledError:
+                raise
+            except BaseException as exc:
+                if share is None:
+                    raise
+                raise share(exc) from None
+            return result if share is None else share(result), True
+        future = loop.create_future()
+        flights[key] = (future, task,)
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Retrieving the exception prevents warnings about it when there are no followers
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del flights[key]
+        return result, False
+
+    def reset(self) -> None:
+        """
+        Forgets all flights. Used in child processes after a fork,
+        where flights of other threads of the parent process will never finish.
+        """
+        self.flights = {}
+        self.async_flights = WeakKeyDictionary()
+        self.lock = Lock()
+
+
+DATAGROWTH_SINGLE_FLIGHT = SingleFlight()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DATAGROWTH_SINGLE_FLIGHT.reset)
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Sequence
 
 from pydantic import BaseModel
 
@@ -49,17 +50,22 @@ class FileSystemStorage:
 
         return directory if directory.is_absolute() else (Path.cwd() / directory)
 
-    def _get_storage_directory(self, signature: Signature, is_tmp: bool = False) -> Path:
+    def _get_base_directory(self, is_tmp: bool = False) -> Path:
         if is_tmp:
-            base_dir = self._resolve_directory("tmp")
+            return self._resolve_directory("tmp")
         elif self.config.snapshots:
-            base_dir = self._resolve_directory("snapshots")
-        else:
-            base_dir = self._resolve_directory("data")
+            return self._resolve_directory("snapshots")
+        return self._resolve_directory("data")
+
+    @staticmethod
+    def _get_signature_directory(base_dir: Path, signature: Signature) -> Path:
         if signature.type:
             base_dir = base_dir / signature.type
         return base_dir / str(signature.hash)
 
+    def _get_storage_directory(self, signature: Signature, is_tmp: bool = False) -> Path:
+        return self._get_signature_directory(self._get_base_directory(is_tmp), signature)
+
     def save(self, resource: ResourceProtocol) -> Signature:
         if not self.config.allow_save:
             raise PermissionError("Saving resources is disabled by storage config (allow_save=false).")
@@ -73,6 +79,24 @@ class FileSystemStorage:
         path.write_text(resource.model_dump_json(indent=4), encoding="utf-8")
         return resource.signature
 
+    def save_many(self, resources: Sequence[ResourceProtocol]) -> list[Signature]:
+        """
+        Saves multiple resources while resolving the storage directory only once.
+        """
+        if not self.config.allow_save:
+            raise PermissionError("Saving resources is disabled by storage config (allow_save=false).")
+        base_dir = self._get_base_directory()
+        signatures = []
+        for resource in resources:
+            if resource.signature is None:
+                raise ValueError("Can't save resource without a signature.")
+            assert isinstance(resource, BaseModel), "FileSystemStorage only supports Pydantic-based resources."
+            directory = self._get_signature_directory(base_dir, resource.signature)
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / "data.json").write_text(resource.model_dump_json(indent=4), encoding="utf-8")
+            signatures.append(resource.signature)
+        return signatures
+
     def load(self, signature: Signature) -> ResourceProtocol | None:
         if not self.config.allow_load:
             raise PermissionError("Loading resources is disabled by storage config (allow_load=false).")
@@ -82,6 +106,23 @@ class FileSystemStorage:
             return None
         return Resource[Signature].model_validate_json(path.read_text(encoding="utf-8"))
 
+    def load_many(self, signatures: Sequence[Signature]) -> list[ResourceProtocol | None]:
+        """
+        Loads multiple resources while resolving the storage directory only once.
+        Signatures that aren't stored get None in the returned list.
+        """
+        if not self.config.allow_load:
+            raise PermissionError("Loading resources is disabled by storage config (allow_load=false).")
+        base_dir = self._get_base_directory()
+        resources: list[ResourceProtocol | None] = []
+        for signature in signatures:
+            path = self._get_signature_directory(base_dir, signature) / "data.json"
+            if not path.exists():
+                resources.append(None)
+                continue
+            resources.append(Resource[Signature].model_validate_json(path.read_text(encoding="utf-8")))
+        return resources
+
     def read(self, signature: Signature, filename: str) -> bytes | str:
         if not self.config.allow_read:
             raise PermissionError("Reading files is disabled by storage config (allow_read=false).")
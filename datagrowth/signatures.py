@@ -1,9 +1,9 @@
 from typing import Any
-import hashlib
-import json
 import re
 from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 
+from datagrowth.utils.fingerprints import FINGERPRINT_ALGORITHMS, SIGNATURE_HASH_ALGORITHM, hash_signature
+
 
 SAFE_SIGNATURE_TYPE_PATTERN = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9._-]*$")
 
@@ -17,6 +17,7 @@ class Signature(BaseModel):
     uri: str
     data: dict[str, Any] | str | None = Field(default=None)
     hash: int = Field(default=0)
+    hash_algorithm: str = Field(default=SIGNATURE_HASH_ALGORITHM)
     type: str | None = Field(default=None)
     args: tuple[Any, ...] = Field(default_factory=tuple)
     kwargs: dict[str, Any] = Field(default_factory=dict)
@@ -65,28 +66,16 @@ class Signature(BaseModel):
             )
         return signature_type
 
-    @staticmethod
-    def _canonicalize_data(data: Any) -> Any:
-        if isinstance(data, bytes):
-            return {
-                "__type__": "bytes",
-                "sha256": hashlib.sha256(data).hexdigest(),
-                "length": len(data),
-            }
-        if isinstance(data, dict):
-            return {key: Signature._canonicalize_data(value) for key, value in data.items()}
-        if isinstance(data, list):
-            return [Signature._canonicalize_data(value) for value in data]
-        if isinstance(data, tuple):
-            return [Signature._canonicalize_data(value) for value in data]
-        return data
+    @field_validator("hash_algorithm")
+    @classmethod
+    def validate_hash_algorithm(cls, hash_algorithm: str) -> str:
+        if hash_algorithm not in FINGERPRINT_ALGORITHMS:
+            raise ValueError(f"Signature hash algorithm must be one of: {', '.join(FINGERPRINT_ALGORITHMS)}.")
+        return hash_algorithm
 
     @staticmethod
-    def _compute_hash(uri: str, data: Any) -> int:
-        canonical_data = Signature._canonicalize_data(data)
-        canonical = json.dumps({"uri": uri, "data": canonical_data}, sort_keys=True, separators=(",", ":"),
-                               ensure_ascii=False)
-        return int(hashlib.sha256(canonical.encode("utf-8")).hexdigest(), 16)
+    def _compute_hash(uri: str, data: Any, algorithm: str = SIGNATURE_HASH_ALGORITHM) -> int:
+        return hash_signature(uri, data, algorithm)
 
     @model_validator(mode="before")
     @classmethod
@@ -97,7 +86,8 @@ class Signature(BaseModel):
             data = values.get("data") or {}
             if uri is None or hash_ is not None:
                 return values
+            algorithm = values.get("hash_algorithm") or SIGNATURE_HASH_ALGORITHM
             # copy to avoid mutating caller's dict
             values = dict(values)
-            values["hash"] = cls._compute_hash(uri, data) or hash_
+            values["hash"] = cls._compute_hash(uri, data, algorithm) or hash_
         return values
@@ -0,0 +1,66 @@
+import zlib
+import lzma
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+
+def compress(data: bytes, algorithm: str) -> bytes:
+    """
+    Compresses data with the given algorithm.
+    The "zstd" algorithm requires the zstandard package to be installed.
+
+    :param data: (bytes) the data to compress
+    :param algorithm: (str) either "zlib", "lzma" or "zstd"
+    :return: (bytes) the compressed data
+    """
+    if algorithm == "zlib":
+        return zlib.compress(data)
+    elif algorithm == "lzma":
+        return lzma.compress(data)
+    elif algorithm == "zstd":
+        if zstandard is None:
+            raise RuntimeError("The zstd compression algorithm requires the zstandard package")
+        return zstandard.ZstdCompressor().compress(data)
+    raise ValueError(f"Unknown compression algorithm: {algorithm}")
+
+
+def detect_compression(data: bytes) -> str | None:
+    """
+    Detects which algorithm compressed the data by looking at the first bytes of the data.
+
+    :param data: (bytes) compressed data
+    :return: (str) "zlib", "lzma" or "zstd" or None if the algorithm is unknown
+    """
+    if data.startswith(ZSTD_MAGIC):
+        return "zstd"
+    elif data.startswith(XZ_MAGIC):
+        return "lzma"
+    elif len(data) >= 2 and data[0] & 0x0F == 8 and (data[0] << 8 | data[1]) % 31 == 0:
+        return "zlib"
+    return None
+
+
+def decompress(data: bytes) -> bytes:
+    """
+    Decompresses data that was compressed with ``compress``.
+    The algorithm gets detected from the data itself.
+
+    :param data: (bytes) the compressed data
+    :return: (bytes) the decompressed data
+    """
+    algorithm = detect_compression(data)
+    if algorithm == "zlib":
+        return zlib.decompress(data)
+    elif algorithm == "lzma":
+        return lzma.decompress(data)
+    elif algorithm == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Decompressing zstd data requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError("Could not detect the compression algorithm of data")
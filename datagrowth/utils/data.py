@@ -91,3 +91,103 @@ def override_dict(parent, child):
 
 def is_json_mimetype(mimetype):
     return JSON_MIMETYPE_PATTERN.match(mimetype)
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{self.__class__.__name__} is read-only, use copy.deepcopy to get a mutable copy")
+
+
+class ReadOnlyDict(dict):
+    """
+    A dict that raises a TypeError upon changes. Deep copies return a regular dict.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return ReadOnlyDict, (dict(self),)
+
+
+class ReadOnlyList(list):
+    """
+    A list that raises a TypeError upon changes. Deep copies return a regular list.
+    """
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return ReadOnlyList, (list(self),)
+
+
+def read_only_view(data: Any) -> Any:
+    """
+    Recursively converts dicts and lists into their read-only variants.
+    Other values are returned as-is.
+
+    :param data: (any) the data to convert
+    :return: the read-only data
+    """
+    if isinstance(data, dict):
+        return ReadOnlyDict({key: read_only_view(value) for key, value in data.items()})
+    elif isinstance(data, list):
+        return ReadOnlyList([read_only_view(value) for value in data])
+    return data
+
+
+class ContentCache:
+    """
+    Holds parsed content of a resource together with the values that the content was parsed from.
+    As long as these source values don't change the parsed content gets reused.
+    Dicts and lists get copied as source, such that changes inside them invalidate the content as well.
+    """
+
+    def __init__(self) -> None:
+        self.sources: tuple[Any, ...] | None = None
+        self.content: tuple[str | None, Any] = (None, None,)
+
+    @staticmethod
+    def copy_source(source: Any) -> Any:
+        # Deep copies reuse strings, so large bodies inside containers still get compared by identity first
+        if isinstance(source, (dict, list)):
+            return copy.deepcopy(source)
+        return source
+
+    def is_valid(self, sources: tuple[Any, ...]) -> bool:
+        if self.sources is None or len(self.sources) != len(sources):
+            return False
+        # Comparing identity first prevents costly comparisons of large bodies
+        return all(cached is source or cached == source for cached, source in zip(self.sources, sources))
+
+    def get(self, sources: tuple[Any, ...], parse: Callable[[], tuple[str | None, Any]],
+            read_only: bool = False) -> tuple[str | None, Any]:
+        """
+        Returns cached content when the sources are unchanged or parses and caches content otherwise.
+
+        :param sources: (tuple) the values that the content gets parsed from
+        :param parse: (callable) parses content from the sources and returns a content type and data tuple
+        :param read_only: (bool) whether to cache read-only views of the data
+        :return: content_type, data
+        """
+        sources = sources + (read_only,)
+        if self.is_valid(sources):
+            return self.content
+        content_type, data = parse()
+        if read_only:
+            data = read_only_view(data)
+        self.sources = tuple(self.copy_source(source) for source in sources)
+        self.content = (content_type, data,)
+        return self.content
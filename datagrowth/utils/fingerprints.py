@@ -0,0 +1,131 @@
+import json
+import hashlib
+from operator import itemgetter
+from typing import Any, Callable
+from urllib.parse import urlsplit, urlunsplit, parse_qsl
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from datagrowth.utils.urls import parse_query, encode_query_value
+
+
+DATA_HASH_ALGORITHM = "sha1"
+SIGNATURE_HASH_ALGORITHM = "sha256"
+FINGERPRINT_ALGORITHMS = ("sha1", "sha256", "blake2b", "xxh3_128",)
+
+
+def _blake2b(payload: bytes) -> Any:
+    return hashlib.blake2b(payload, digest_size=32)
+
+
+def get_hasher(algorithm: str) -> Callable[[bytes], Any]:
+    """
+    Returns a constructor for a hashlib compatible object that hashes with the given algorithm.
+    The "xxh3_128" algorithm requires the xxhash package to be installed.
+
+    :param algorithm: (str) either "sha1", "sha256", "blake2b" or "xxh3_128"
+    :return: (callable) a function that accepts bytes and returns an object with a hexdigest method
+    """
+    if algorithm == "sha1":
+        return hashlib.sha1
+    elif algorithm == "sha256":
+        return hashlib.sha256
+    elif algorithm == "blake2b":
+        return _blake2b
+    elif algorithm == "xxh3_128":
+        if xxhash is None:
+            raise RuntimeError("The xxh3_128 fingerprint algorithm requires the xxhash package")
+        return xxhash.xxh3_128
+    raise ValueError(f"Unknown fingerprint algorithm: {algorithm}")
+
+
+def _encode_query(params: list[tuple[str, Any]]) -> str:
+    # Gives the same output as urlencode, but skips quoting for values that don't need it
+    return "&".join(f"{encode_query_value(name)}={encode_query_value(value)}" for name, value in params)
+
+
+def normalize_uri(url: str) -> str:
+    """
+    Strips the protocol from a URL and sorts its query parameters by name.
+    Repeated and blank parameters are kept, such that URLs that logically match will have the same normalized URI.
+
+    :param url: (str) the URL to normalize
+    :return: (str) a normalized URI suitable for lookups
+    """
+    split = urlsplit(url)
+    if split.query:
+        params = sorted(parse_qsl(split.query, keep_blank_values=True), key=itemgetter(0))
+        split = split._replace(query=_encode_query(params))
+    normalized_url = urlunsplit(split)
+    if split.scheme:
+        return normalized_url.replace(f"{split.scheme}://", "", 1)
+    return normalized_url
+
+
+def normalize_legacy_uri(url: str) -> str:
+    """
+    Normalizes a URL for the legacy Django ``HttpResource`` in a way that is compatible with earlier URLObject parsing.
+    The query gets split on ampersands and semicolons and when a parameter occurs more than once the last value is used.
+    Parameters without a value get the value "None".
+
+    :param url: (str) the URL to normalize
+    :return: (str) a normalized URI suitable for lookups
+    """
+    split = urlsplit(url)
+    if split.query:
+        params = dict(parse_query(split.query))
+        split = split._replace(query=_encode_query(sorted(params.items(), key=itemgetter(0))))
+    return urlunsplit(split).replace(split.scheme + "://", "")
+
+
+def hash_legacy_data(data: dict | None, algorithm: str | None = None) -> str:
+    """
+    Creates a hash of the data of a legacy Django ``HttpResource`` that doesn't depend on the order of its keys.
+    Nested dictionaries are hashed first and their hash is used as value.
+    Hashes made with the default "sha1" algorithm are plain hex digests,
+    while hashes of other algorithms are prefixed with the algorithm name like: "blake2b:<hexdigest>".
+
+    :param data: (dict) the data to hash
+    :param algorithm: (str) the fingerprint algorithm to use or None for "sha1"
+    :return: (str) the hash of the data or an empty string if there is no data
+    """
+    if not data:
+        return ""
+    algorithm = algorithm or DATA_HASH_ALGORITHM
+    payload = sorted(
+        (
+            (key, hash_legacy_data(value, algorithm) if isinstance(value, dict) else value)
+            for key, value in data.items()
+        ),
+        key=itemgetter(0)
+    )
+    digest = get_hasher(algorithm)(json.dumps(payload).encode("utf-8")).hexdigest()
+    return digest if algorithm == DATA_HASH_ALGORITHM else f"{algorithm}:{digest}"
+
+
+def _encode_signature_value(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return {
+            "__type__": "bytes",
+            "sha256": hashlib.sha256(value).hexdigest(),
+            "length": len(value),
+        }
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def hash_signature(uri: str, data: Any, algorithm: str | None = None) -> int:
+    """
+    Creates an integer hash of a URI and data, where data may contain nested dictionaries, lists, tuples and bytes.
+    Bytes are represented by their SHA-256 and length, such that large binary payloads are never serialized.
+
+    :param uri: (str) the URI to hash
+    :param data: (any) the data to hash
+    :param algorithm: (str) the fingerprint algorithm to use or None for "sha256"
+    :return: (int) the hash as integer
+    """
+    canonical = json.dumps({"uri": uri, "data": data}, sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+                           default=_encode_signature_value)
+    digest = get_hasher(algorithm or SIGNATURE_HASH_ALGORITHM)(canonical.encode("utf-8")).hexdigest()
+    return int(digest, 16)
@@ -0,0 +1,85 @@
+import re
+from typing import Any, Iterable
+from urllib.parse import urlsplit, urlunsplit, quote_plus, unquote_plus
+
+
+QUERY_SEPARATORS = re.compile(r"[&;]")
+UNRESERVED_CHARACTERS = re.compile(r"[A-Za-z0-9_.~-]*")
+
+
+def decode_query_value(value: str) -> str:
+    # Decoding is relatively slow and most parameters don't contain encoded characters
+    return unquote_plus(value) if "%" in value or "+" in value else value
+
+
+def encode_query_value(value: Any) -> str:
+    value = str(value)
+    return value if UNRESERVED_CHARACTERS.fullmatch(value) else quote_plus(value)
+
+
+def parse_query(query: str) -> list[tuple[str, str | None]]:
+    """
+    Parses a query string into a list of name and value pairs.
+    Pairs are separated by ampersands or semicolons and names without a value get None as value.
+    This is the same parsing that URLObject uses.
+
+    :param query: (str) the query string of a URL
+    :return: (list) name and value pairs in order of the query
+    """
+    if not query:
+        return []
+    params = []
+    for pair in QUERY_SEPARATORS.split(query):
+        name, separator, value = pair.partition("=")
+        params.append((decode_query_value(name), decode_query_value(value) if separator else None,))
+    return params
+
+
+def build_query(params: Iterable[tuple[str, Any]]) -> str:
+    """
+    Builds a query string from name and value pairs in the same way as URLObject.
+    Names with None as value are added without a value and iterable values add a parameter for every value.
+
+    :param params: (iterable) name and value pairs
+    :return: (str) the query string
+    """
+    query = ""
+    for name, value in params:
+        if value is None:
+            parameter = encode_query_value(name)
+        elif not isinstance(value, str) and hasattr(value, "__iter__"):
+            parameter = "&".join(f"{encode_query_value(name)}={encode_query_value(val)}" for val in value)
+        else:
+            parameter = f"{encode_query_value(name)}={encode_query_value(value)}"
+        query = f"{query}&{parameter}" if query else parameter
+    return query
+
+
+def set_query_params(url: str, params: dict[str, Any]) -> str:
+    """
+    Sets query parameters on a URL, overriding existing parameters with the same name.
+    Like with URLObject the existing parameters get encoded again.
+
+    :param url: (str) the URL to set parameters for
+    :param params: (dict) the parameters to set
+    :return: (str) the URL with the parameters set
+    """
+    split = urlsplit(url)
+    query_params = dict(parse_query(split.query))
+    query_params.update(params)
+    return urlunsplit(split._replace(query=build_query(query_params.items())))
+
+
+def delete_query_params(url: str, names: Iterable[str]) -> str:
+    """
+    Removes all query parameters with the given names from a URL.
+    Like with URLObject the remaining parameters get encoded again.
+
+    :param url: (str) the URL to remove parameters from
+    :param names: (iterable) the names of parameters to remove
+    :return: (str) the URL without the parameters
+    """
+    split = urlsplit(url)
+    deleted = set(names)
+    query_params = [(name, value) for name, value in parse_query(split.query) if name not in deleted]
+    return urlunsplit(split._replace(query=build_query(query_params)))
@@ -122,7 +122,9 @@ class HttpTikaResource(MicroServiceResource):
             return
 
         for ix, headers in enumerate(data):
-            content = headers.pop("X-TIKA:content", None)
+            # Copies headers without content, because data is shared with the content property
+            content = headers.get("X-TIKA:content", None)
+            headers = {key: value for key, value in headers.items() if key != "X-TIKA:content"}
             if content is not None:
                 content_filename = f"x-tika-content-{ix}.html"
                 storage.write(self.signature, content_filename, content)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.13 on 2026-10-17 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0004_resource_status_filter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='httpresourcemock',
+            name='body_compressed',
+            field=models.BinaryField(blank=True, default=None, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.13 on 2026-10-17 01:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0005_body_compressed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='httpresourcemock',
+            name='body_file',
+            field=models.CharField(blank=True, default=None, max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.13 on 2026-10-17 01:19
+
+import datagrowth.configuration.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('resources', '0006_body_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HttpDownloadResource',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uri', models.CharField(db_index=True, default=None, max_length=255)),
+                ('status', models.PositiveIntegerField(db_index=True, default=0)),
+                ('config', datagrowth.configuration.fields.ConfigurationField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('purge_at', models.DateTimeField(blank=True, null=True)),
+                ('retainer_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('data_hash', models.CharField(blank=True, db_index=True, default='', max_length=255)),
+                ('request', models.JSONField(blank=True, default=None, null=True)),
+                ('head', models.JSONField(default=dict)),
+                ('body', models.TextField(blank=True, default=None, null=True)),
+                ('retainer_type', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ('id',),
+                'get_latest_by': 'id',
+                'abstract': False,
+            },
+        ),
+    ]
@@ -44,6 +44,7 @@ ok_file_response = NonCallableMock(spec=Response)
 ok_file_response.headers = CaseInsensitiveDict(data={"content-type": "image/png"})
 ok_file_response.content = MOCK_FILE_DATA
 ok_file_response.status_code = 200
+ok_file_response.iter_content = Mock(side_effect=lambda chunk_size=1, decode_unicode=False: iter([MOCK_FILE_DATA]))
 
 
 def prepare_request(request):
@@ -0,0 +1,75 @@
+from time import sleep
+from threading import Thread, Lock
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class FileRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        range_header = self.headers.get("Range")
+        with server.lock:
+            server.requests.append((self.path, range_header,))
+            server.in_flight += 1
+            server.max_in_flight = max(server.in_flight, server.max_in_flight)
+        try:
+            self.send_file(server, range_header)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def send_file(self, server, range_header):
+        sleep(server.delay)
+        content = server.files.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+        start = int(range_header.replace("bytes=", "").rstrip("-")) if range_header else 0
+        self.send_response(206 if range_header else 200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(content) - start))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", '"{}"'.format(len(content)))
+        if range_header:
+            self.send_header("Content-Range", "bytes {}-{}/{}".format(start, len(content) - 1, len(content)))
+        self.end_headers()
+        if self.path in server.interrupted and not range_header:
+            # Breaks off the connection halfway the first time the file gets downloaded
+            server.interrupted.discard(self.path)
+            self.wfile.write(content[:len(content) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(content[start:])
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockFileServer(ThreadingHTTPServer):
+    """
+    A local HTTP server that serves the given files by path and supports Range requests.
+    Paths in interrupted will break off halfway the first download.
+    """
+
+    def __init__(self, files, interrupted=None, delay=0.0):
+        super().__init__(("127.0.0.1", 0), FileRequestHandler)
+        self.files = files
+        self.interrupted = set(interrupted or [])
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = Lock()
+        self.thread = Thread(target=self.serve_forever, daemon=True)
+
+    def url(self, path):
+        return "http://{}:{}{}".format(*self.server_address, path)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+        self.server_close()
+        self.thread.join()
@@ -1,6 +1,6 @@
 from .http import HttpResourceMock, MockErrorQuerySet
 from .url import URLResourceMock
-from .files import HttpImageResourceMock
+from .files import HttpImageResourceMock, HttpImageDownloadResourceMock, HttpDownloadResource
 from .micro import MicroServiceResourceMock
 from .shell import ShellResourceMock
 from .entities import EntityListResource, EntityIdListResource, EntityDetailResource
@@ -1,6 +1,6 @@
 from unittest.mock import Mock, NonCallableMock
 
-from datagrowth.resources import HttpImageResource
+from datagrowth.resources import HttpFileResource, HttpImageResource
 
 from resources.mocks.requests import MockFileRequests
 
@@ -16,3 +16,19 @@ class HttpImageResourceMock(HttpImageResource):
 
     def get_file_name(self, original, now):
         return original
+
+
+class HttpImageDownloadResourceMock(HttpImageResource):
+    # Stores downloads under the hash of their content, unlike HttpImageResourceMock
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not isinstance(self.session, NonCallableMock):
+            self.session = MockFileRequests
+        if isinstance(self.session.send, Mock):
+            self.session.send.reset_mock()
+
+
+class HttpDownloadResource(HttpFileResource):
+    # Downloads over real connections, which allows testing against a local server
+    pass
@@ -2,7 +2,7 @@ from unittest.mock import Mock, NonCallableMock
 
 from django.db.models import QuerySet
 
-from datagrowth.resources.http import HttpResource
+from datagrowth.resources.http import BodyFileMixin, CompressedBodyMixin, HttpResource
 
 from resources.mocks.requests import MockRequests
 
@@ -11,7 +11,7 @@ MockErrorQuerySet = Mock(QuerySet)
 MockErrorQuerySet.count = Mock(return_value=0)
 
 
-class HttpResourceMock(HttpResource):
+class HttpResourceMock(BodyFileMixin, CompressedBodyMixin, HttpResource):
 
     URI_TEMPLATE = "http://localhost:8000/{}/?q={}"
     PARAMETERS = {
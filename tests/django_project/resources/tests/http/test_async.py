@@ -0,0 +1,201 @@
+import json
+import asyncio
+from unittest import skipIf
+from unittest.mock import patch
+from urllib.parse import urlsplit, parse_qs
+
+from django.test import TestCase
+
+from datagrowth.configuration import ConfigurationType
+from datagrowth.exceptions import DGHttpError50X
+from datagrowth.resources.http import asend_iterator, asend_serie_iterator
+from datagrowth.resources.http.sessions import DATAGROWTH_ASYNC_CLIENT_POOL, httpx
+from datagrowth.resources.http.streaming import BODY_TOO_LARGE_STATUS
+
+from resources.models import HttpResourceMock
+
+
+class StandInServer:
+    """
+    A minimal HTTP/1.1 server with keep-alive support that stands in for a remote API.
+    Paths containing 500 return errors, queries containing "next" return a continuation,
+    queries containing "busy" return a 503 error the first time and all other requests echo the query as JSON.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.targets = []
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(" ", 2)
+                content_length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b""):
+                        break
+                    name, value = header.decode().split(":", 1)
+                    if name.lower() == "content-length":
+                        content_length = int(value)
+                if content_length:
+                    await reader.readexactly(content_length)
+                self.requests += 1
+                self.in_flight += 1
+                self.max_in_flight = max(self.in_flight, self.max_in_flight)
+                await asyncio.sleep(self.delay)
+                self.in_flight -= 1
+                status, body = self.respond(method, target)
+                payload = json.dumps(body).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def respond(self, method, target):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        is_retry = target in self.targets
+        self.targets.append(target)
+        if "500" in url.path or "500" in query.get("q", []):
+            return "500 Internal Server Error", {"error": "internal error"}
+        if "busy" in query.get("q", []) and not is_retry:
+            return "503 Service Unavailable", {"error": "busy"}
+        body = {"method": method, "query": query["q"][0]}
+        if "next" in query["q"] and "next" not in query:
+            body["next"] = 1
+        return "200 OK", body
+
+
+@skipIf(httpx is None, "The httpx package is required for asyncio support")
+class TestAsyncHttpResource(TestCase):
+
+    async def start_server(self):
+        self.server = StandInServer()
+        port = await self.server.start()
+        uri_template = f"http://127.0.0.1:{port}/{{}}/?q={{}}"
+        self.uri_template_patch = patch.object(HttpResourceMock, "URI_TEMPLATE", uri_template)
+        self.uri_template_patch.start()
+        self.config = ConfigurationType(
+            namespace="http_resource",
+            private=["_resource", "_continuation_limit"],
+        )
+        self.config.update({
+            "resource": "resources.HttpResourceMock",
+            "continuation_limit": 10
+        })
+
+    async def stop_server(self):
+        self.uri_template_patch.stop()
+        await DATAGROWTH_ASYNC_CLIENT_POOL.aclose()
+        await self.server.stop()
+
+    async def test_asend(self):
+        await self.start_server()
+        try:
+            instance = await HttpResourceMock().asend("get", "test")
+            self.assertTrue(instance.success)
+            self.assertEqual(instance.status, 200)
+            self.assertEqual(instance.head["content-type"], "application/json")
+            content_type, data = instance.content
+            self.assertEqual(data, {"method": "GET", "query": "test"})
+            await instance.aclose()
+            # Cached resources are returned without making requests
+            cached = await HttpResourceMock().asend("get", "test")
+            self.assertEqual(cached.id, instance.id)
+            self.assertEqual(self.server.requests, 1)
+            # Errors are raised like with the blocking send
+            with self.assertRaises(DGHttpError50X):
+                await HttpResourceMock().asend("get", "500")
+        finally:
+            await self.stop_server()
+
+    async def test_asend_stream(self):
+        await self.start_server()
+        try:
+            instance = await HttpResourceMock(config={"stream": True}).asend("get", "test")
+            self.assertEqual(instance.status, 200)
+            self.assertEqual(instance.content[1], {"method": "GET", "query": "test"})
+            # Bodies above max_body_size don't get read
+            with self.assertRaises(DGHttpError50X) as context:
+                await HttpResourceMock(config={"stream": True, "max_body_size": 10}).asend("get", "test2")
+            self.assertEqual(context.exception.resource.status, BODY_TOO_LARGE_STATUS)
+            self.assertEqual(context.exception.resource.body, "")
+        finally:
+            await self.stop_server()
+
+    async def test_asend_iterator(self):
+        await self.start_server()
+        try:
+            resources = [resource async for resource in asend_iterator("next", method="get", config=self.config)]
+            self.assertEqual(len(resources), 2)
+            for resource in resources:
+                self.assertIsNotNone(resource.id)
+                self.assertEqual(resource.status, 200)
+            self.assertIn("next=1", resources[1].request["url"])
+            self.assertEqual(self.server.connections, 1, "Expected the pooled client to reuse its connection")
+        finally:
+            await self.stop_server()
+
+    async def test_asend_serie_iterator(self):
+        await self.start_server()
+        self.server.delay = 0.05
+        self.config.concurrency = 4
+        try:
+            queries = [f"test{ix}" for ix in range(8)] + ["next", "500"]
+            args_list = [(query,) for query in queries]
+            kwargs_list = [{} for _ in queries]
+            resources = [
+                resource
+                async for resource in asend_serie_iterator(args_list, kwargs_list, method="get", config=self.config)
+            ]
+            self.assertEqual(len(resources), 11)
+            self.assertEqual(self.server.max_in_flight, 4)
+            self.assertEqual([resource.request["args"][1] for resource in resources[:9]], queries[:9])
+            self.assertIn("next=1", resources[9].request["url"])
+            self.assertEqual(resources[10].status, 500)
+            for resource in resources:
+                self.assertIsNotNone(resource.id)
+        finally:
+            await self.stop_server()
+
+    async def test_asend_serie_iterator_deferred_retries(self):
+        await self.start_server()
+        self.config.concurrency = 2
+        self.config.backoff_delays = [0.2]
+        try:
+            queries = ["busy", "test0", "test1", "test2"]
+            args_list = [(query,) for query in queries]
+            kwargs_list = [{} for _ in queries]
+            resources = [
+                resource
+                async for resource in asend_serie_iterator(args_list, kwargs_list, method="get", config=self.config)
+            ]
+            # The busy link shouldn't occupy a slot while it waits for its retry
+            self.assertEqual(len(self.server.targets), 5)
+            self.assertIn("busy", self.server.targets[-1])
+            self.assertEqual([resource.request["args"][1] for resource in resources], queries)
+            self.assertEqual(resources[0].status, 200)
+            self.assertEqual(resources[0].request["backoff_delay"], 0.2)
+        finally:
+            await self.stop_server()
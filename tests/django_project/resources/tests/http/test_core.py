@@ -7,20 +7,27 @@ The tests of the actual interface to HttpResource and how a HttpResource should
 is present in the generic.py test module.
 """
 
-from unittest.mock import patch, call
+from unittest.mock import patch, call, Mock
 from urllib.parse import urlencode
+from io import BytesIO
 import json
 from copy import deepcopy
+import requests
 from requests.exceptions import SSLError, ConnectionError, Timeout
+from requests.structures import CaseInsensitiveDict
 
 from django.core.exceptions import ValidationError
+from django.core.management import call_command, CommandError
+from django.core.files.storage import InMemoryStorage
 
 from datagrowth.exceptions import DGHttpError50X, DGHttpError40X
 from datagrowth.resources import HttpResource
+from datagrowth.resources.http.sessions import DATAGROWTH_SESSION_POOL
+from datagrowth.resources.http.streaming import BODY_TOO_LARGE_STATUS
 from datagrowth.configuration.types import ConfigurationType
 
 from project.mocks.data import MOCK_DATA
-from resources.models import HttpResourceMock
+from resources.models import HttpResourceMock, URLResourceMock
 from resources.tests import base as resources_test_base
 from resources.mocks.requests import get_erroneous_requests_mock, MockRequests
 
@@ -90,8 +97,45 @@ class TestHttpResource(resources_test_base.ResourceTestMixin):
         self.assertEqual(content_type, "application/json")
         self.assertEqual(data, self.test_data)
 
+    def test_content_cache(self):
+        self.instance.config.content_cache = True
+        self.instance.head = {"content-type": "application/json; charset=utf-8"}
+        self.instance.body = json.dumps(self.test_data)
+        self.instance.status = 200
+        with patch("datagrowth.resources.http.generic.json.loads", wraps=json.loads) as loads_mock:
+            content_type, data = self.instance.content
+            self.assertIs(self.instance.content[1], data)
+            self.assertEqual(loads_mock.call_count, 1)
+            # Changing the body invalidates the cache
+            self.instance.body = json.dumps({"data": "changed"})
+            content_type, data = self.instance.content
+            self.assertEqual(data, {"data": "changed"})
+            self.assertEqual(loads_mock.call_count, 2)
+            # Content is not cached when configured
+            self.instance.config.content_cache = False
+            self.assertIsNot(self.instance.content[1], self.instance.content[1])
+        # Read-only content protects the cache against modifications
+        self.instance.config.update({"content_cache": True, "content_read_only": True})
+        content_type, data = self.instance.content
+        with self.assertRaises(TypeError):
+            data["data"] = "modified"
+        self.assertEqual(self.instance.content[1], {"data": "changed"})
+
+    def test_content_mutations(self):
+        self.instance.head = {"content-type": "application/json; charset=utf-8"}
+        self.instance.body = json.dumps(self.test_data)
+        self.instance.status = 200
+        # Without content caching every read parses a new copy of the content
+        content_type, data = self.instance.content
+        data.pop("data")
+        data["atad"]["test"] = "modified"
+        self.assertEqual(self.instance.content[1], self.test_data)
+
     def test_parameters(self):
         self.assertIsInstance(self.instance.parameters(), dict)
+        # Resources may disallow parameters
+        with patch.object(self.instance, "parameters", return_value=None):
+            self.assertEqual(self.instance._create_url("en", "test"), "http://localhost:8000/en/?q=test")
 
     def test_variables(self):
         # Variables with explicit input
@@ -436,6 +480,20 @@ class TestHttpResource(resources_test_base.ResourceTestMixin):
         self.test_data["data"] = "tezt"
         data_hash2 = HttpResource.hash_from_data(self.test_data)
         self.assertNotEqual(data_hash, data_hash2)
+        # Other algorithms get recorded with the hash
+        data_hash3 = HttpResource.hash_from_data(self.test_data, "blake2b")
+        self.assertTrue(data_hash3.startswith("blake2b:"))
+
+    def test_fingerprint_algorithm(self):
+        instance = HttpResourceMock(config={"fingerprint_algorithm": "blake2b"})
+        instance.post(query="success")
+        instance.close()
+        self.assertTrue(instance.data_hash.startswith("blake2b:"))
+        self.assertEqual(
+            HttpResourceMock(config={"fingerprint_algorithm": "blake2b"}).post(query="success").id,
+            instance.id,
+            "Expected the stored resource to get found using the configured fingerprint algorithm"
+        )
 
     def test_set_error(self):
         self.instance.set_error(404)
@@ -459,6 +517,120 @@ class TestHttpResource(resources_test_base.ResourceTestMixin):
         mock = HttpResourceMock(timeout=20)
         self.assertEqual(mock.timeout, 20)
 
+    def test_prepare(self):
+        instance = HttpResourceMock().prepare("get", "success")
+        self.assertEqual(instance.request["args"], ("en", "success",))
+        self.assertEqual(instance.uri, "localhost:8000/en/?meta=success&param=1&q=success")
+        self.assertIsNotNone(instance.data_hash)
+        self.assertIsNone(instance.id)
+        self.assertFalse(instance.success)
+        self.assertFalse(instance.session.send.called)
+        self.assertFalse(instance._prepare_only)
+
+    def test_session(self):
+        # Resources without a session share sessions per host from the session pool
+        first = HttpResourceMock(request=self.test_get_request)
+        second = HttpResourceMock(request=self.test_post_request)
+        first.session = None
+        second.session = None
+        self.assertIs(first.session, second.session)
+        self.assertIs(first.session, DATAGROWTH_SESSION_POOL.get_session("http://localhost:8000/", first.config))
+        other_host_request = deepcopy(self.test_get_request)
+        other_host_request["url"] = "https://example.com/en/?q=test"
+        third = HttpResourceMock(request=other_host_request)
+        third.session = None
+        self.assertIsNot(first.session, third.session)
+        # Given sessions take precedence and get passed on to the next resource
+        instance = HttpResourceMock(session=MockRequests).get("next")
+        self.assertIs(instance.session, MockRequests)
+        self.assertIs(instance.next().session, MockRequests)
+
+    def test_body_compression(self):
+        instance = HttpResourceMock(config={"body_compression": "zlib"}).get("new")
+        instance.save()
+        self.assertJSONEqual(instance.body, json.dumps(MOCK_DATA), "Expected the body to remain available after save")
+        self.assertIsNotNone(instance.body_compressed)
+        stored = HttpResourceMock.objects.values("body", "body_compressed").get(id=instance.id)
+        self.assertIsNone(stored["body"])
+        self.assertLess(len(stored["body_compressed"]), len(json.dumps(MOCK_DATA)))
+        # Decompression happens transparently when loading resources
+        instance = HttpResourceMock.objects.get(id=instance.id)
+        self.assertJSONEqual(instance.body, json.dumps(MOCK_DATA))
+        content_type, data = instance.content
+        self.assertEqual(data, MOCK_DATA)
+        # Compressed bodies stay compressed when saving without a body_compression configuration
+        instance.body = json.dumps({"updated": True})
+        instance.save()
+        instance = HttpResourceMock.objects.get(id=instance.id)
+        self.assertEqual(instance.content[1], {"updated": True})
+        self.assertIsNone(HttpResourceMock.objects.values_list("body", flat=True).get(id=instance.id))
+
+    def test_compress_resource_command(self):
+        count = HttpResourceMock.objects.count()
+        bodies = dict(HttpResourceMock.objects.values_list("id", "body"))
+        call_command("compress_resource", "resources.HttpResourceMock", "--batch-size=2", "--algorithm=lzma")
+        self.assertEqual(HttpResourceMock.objects.filter(body__isnull=True).count(), count)
+        for resource in HttpResourceMock.objects.all():
+            self.assertEqual(resource.body, bodies[resource.id])
+            self.assertEqual(resource._body_compression, "lzma")
+        # Resources without the CompressedBodyMixin don't have a column for compressed bodies
+        with self.assertRaises(CommandError):
+            call_command("compress_resource", "resources.URLResourceMock")
+
+    @staticmethod
+    def get_streaming_session(payload, headers=None):
+        def send(prepared_request, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.headers = CaseInsensitiveDict(headers or {"content-type": "application/json"})
+            response.raw = BytesIO(payload)
+            return response
+        session = Mock(spec=requests.Session)
+        session.prepare_request.side_effect = requests.Session().prepare_request
+        session.send.side_effect = send
+        return session
+
+    def test_stream(self):
+        payload = json.dumps(MOCK_DATA).encode("utf-8")
+        session = self.get_streaming_session(payload)
+        instance = HttpResourceMock(session=session, config={"stream": True}).get("new")
+        self.assertTrue(session.send.call_args.kwargs["stream"])
+        self.assertEqual(instance.status, 200)
+        self.assertJSONEqual(instance.body, json.dumps(MOCK_DATA))
+        self.assertIsNone(instance.body_file)
+        self.assertEqual(instance.content[1], MOCK_DATA)
+        # Streamed bodies above max_body_size get a status that indicates the body is too large
+        config = {"stream": True, "max_body_size": len(payload) - 1}
+        with self.assertRaises(DGHttpError50X) as context:
+            HttpResourceMock(session=session, config=config).get("new")
+        instance = context.exception.resource
+        self.assertEqual(instance.status, BODY_TOO_LARGE_STATUS)
+        self.assertEqual(instance.body, "")
+        self.assertEqual(instance.head, {"content-type": "application/json"})
+        # Content-Length headers prevent reading bodies that are too large
+        session = self.get_streaming_session(payload, {"content-length": str(len(payload))})
+        with self.assertRaises(DGHttpError50X):
+            HttpResourceMock(session=session, config=config).get("new")
+
+    def test_stream_body_spill(self):
+        payload = json.dumps(MOCK_DATA).encode("utf-8")
+        session = self.get_streaming_session(payload)
+        storage = InMemoryStorage()
+        with patch("datagrowth.resources.http.generic.default_storage", storage):
+            instance = HttpResourceMock(session=session, config={"stream": True, "body_spill_size": 10}).get("new")
+            instance.close()
+            self.assertIsNone(instance.body)
+            self.assertTrue(instance.body_file.startswith("resources/bodies/"))
+            self.assertEqual(storage.open(instance.body_file).read(), payload)
+            instance = HttpResourceMock.objects.get(id=instance.id)
+            self.assertEqual(instance.content[1], MOCK_DATA)
+            # Resources without the BodyFileMixin store large bodies in the database
+            config = {"stream": True, "body_spill_size": 10}
+            instance = URLResourceMock(session=session, config=config).get("http://localhost:8000/")
+            instance.close()
+            self.assertIsNone(instance.body_file)
+            self.assertJSONEqual(URLResourceMock.objects.get(id=instance.id).body, payload.decode("utf-8"))
+
     def test_request_with_auth(self):
         self.instance.request = self.test_post_request
         request = self.instance.request_with_auth()
@@ -507,6 +679,10 @@ class TestHttpResource(resources_test_base.ResourceTestMixin):
         self.assertIsNotNone(request)
         self.assertIn("next=1", request["url"])
         self.assertNotIn("auth=1", instance.request["url"], "create_next_request should not alter existing request")
+        original_request = deepcopy(instance.request)
+        request["data"]["test"] = "changed"
+        request["headers"]["Accept"] = "text/html"
+        self.assertEqual(instance.request, original_request, "Changing the next request changed the request")
         instance = HttpResourceMock().post(query="next", file="text-file.txt")
         request = instance.create_next_request()
         self.assertIsNotNone(request)
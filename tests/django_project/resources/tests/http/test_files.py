@@ -3,21 +3,33 @@ This file tests the public interface to HttpResource and how a HttpResource shou
 Some core functionality shared by all derived classes of HttpResource gets tested in the core.py test module.
 """
 import os
+import hashlib
+from tempfile import TemporaryDirectory
 from unittest.mock import patch
+from io import BytesIO
+from PIL import Image as PillowImage
 from PIL.Image import Image
 from datetime import datetime
 
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from django.core.files import File
 from django.core.files.images import ImageFile
-from django.core.files.storage import default_storage
+from django.core.files.storage import default_storage, FileSystemStorage
 from django.core.exceptions import ValidationError
 
-from datagrowth.configuration import DATAGROWTH_CONFIGURATION
+from datagrowth.configuration import DATAGROWTH_CONFIGURATION, ConfigurationType
 from datagrowth.resources import HttpResource, HttpFileResource, file_resource_delete_handler
-from datagrowth.exceptions import DGResourceDoesNotExist, DGHttpError40X
+from datagrowth.resources.http.tasks import download_many
+from datagrowth.exceptions import DGResourceDoesNotExist, DGHttpError40X, DGHttpError50X
 
-from resources.models import HttpImageResourceMock
+from project.mocks.data import MOCK_FILE_DATA
+from resources.models import (HttpImageResourceMock, HttpImageDownloadResourceMock, HttpDownloadResource,
+                              HttpResourceMock)
+from resources.mocks.server import MockFileServer
+
+
+MOCK_FILE_HASH = "0a4c99163006b76842546869fdaa4c10b6886546412637af39785233e39e635e"
+MOCK_FILE_PATH = os.path.join("resources", "downloads", "httpimagedownloadresourcemock", "0", "a4", MOCK_FILE_HASH)
 
 
 class TestHttpImageResourceInterface(TestCase):
@@ -96,6 +108,7 @@ class TestHttpImageResourceInterface(TestCase):
                 instance.save()
                 self.assertEqual(instance.session.send.call_count, 1)
                 self.assert_call_args_get(instance.session.send.call_args, new_url)
+                self.assertEqual(instance.session.send.call_args.kwargs["stream"], True)
                 self.assertEqual(instance.head, self.content_type_header)
                 self.assertEqual(instance.body, expected_file_path)
                 self.assertEqual(instance.status, 200)
@@ -248,8 +261,126 @@ class TestHttpImageResourceInterface(TestCase):
 
     def test_get_file_name(self):
         now = datetime(1970, 1, 1)
-        name = HttpFileResource.get_file_name("test", now)
+        with self.assertWarns(DeprecationWarning):
+            name = HttpFileResource.get_file_name("test", now)
         self.assertEqual(name, "19700101000000000000.test")
+        # Overriding the method warns as well
+        with self.assertWarns(DeprecationWarning):
+            class FileNameResource(HttpFileResource):
+                def get_file_name(self, original, now):
+                    return original
+
+                class Meta:
+                    abstract = True
+                    app_label = "resources"
+
+
+class TestHttpImageDownloadResource(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.model = HttpImageDownloadResourceMock
+        self.download_path = MOCK_FILE_PATH
+
+    @patch("datagrowth.resources.http.files.default_storage.save", side_effect=lambda file_path, file: file_path)
+    @patch("datagrowth.resources.http.files.default_storage.exists", return_value=False)
+    def test_send_get_request(self, storage_exists_mock, storage_save_mock):
+        # Downloads get stored under the hash of their content with the extension from the URL
+        test_data = {
+            "new": f"{self.download_path}.html",
+            "": f"{self.download_path}.html",
+            "new.jpg": f"{self.download_path}.jpg",
+            "aaaaa" + 150 * "b" + ".html": f"{self.download_path}.html",
+        }
+        for term, expected_file_path in test_data.items():
+            instance = self.model().get(f"http://localhost:8000/{term}")
+            self.assertEqual(storage_save_mock.call_args.args[0], expected_file_path)
+            self.assertIsInstance(storage_save_mock.call_args.args[1], ImageFile)
+            self.assertEqual(instance.body, expected_file_path)
+            self.assertEqual(instance.status, 200)
+
+    @patch("datagrowth.resources.http.files.default_storage.save")
+    @patch("datagrowth.resources.http.files.default_storage.exists", return_value=True)
+    def test_send_duplicate_content(self, storage_exists_mock, storage_save_mock):
+        instance = self.model().get("http://localhost:8000/duplicate.png")
+        storage_exists_mock.assert_called_once_with(f"{self.download_path}.png")
+        self.assertFalse(storage_save_mock.called, "Expected content that was stored before to get linked")
+        self.assertEqual(instance.body, f"{self.download_path}.png")
+        self.assertEqual(instance.status, 200)
+
+    @patch("datagrowth.resources.http.files.DOWNLOAD_BUFFER_SIZE", 10)
+    def test_send_large_file(self):
+        saved = []
+
+        def save(file_path, file):
+            # Spilled downloads get closed after saving, so the file gets inspected while saving
+            saved.append((file_path, file.width, file.height, file.file.read(),))
+            return file_path
+
+        with patch("datagrowth.resources.http.files.default_storage.save", side_effect=save):
+            instance = self.model().get("http://localhost:8000/large.png")
+        self.assertEqual(saved, [
+            (f"{self.download_path}.png", 10, 10, MOCK_FILE_DATA,)
+        ])
+        self.assertEqual(instance.body, f"{self.download_path}.png")
+
+
+class TestHttpImageResourceDecoding(TestCase):
+
+    fixtures = ["test-http-image-resource-mock"]
+
+    def setUp(self):
+        super().setUp()
+        media_root = TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.storage = FileSystemStorage(location=media_root.name)
+        storage_patch = patch("datagrowth.resources.http.files.default_storage", self.storage)
+        storage_patch.start()
+        self.addCleanup(storage_patch.stop)
+        self.storage.save("image-file.png", File(BytesIO(MOCK_FILE_DATA)))
+        self.instance = HttpImageResourceMock.objects.get(id=3)  # success with actual content
+        photo = BytesIO()
+        PillowImage.new("RGB", (64, 48), color="red").save(photo, format="JPEG")
+        self.storage.save("photo.jpg", File(photo))
+        self.photo = HttpImageResourceMock.objects.get(id=3)
+        self.photo.body = "photo.jpg"
+
+    def test_get_image_info(self):
+        with patch("datagrowth.resources.http.files.Image.Image.load") as load_mock:
+            info = self.instance.get_image_info()
+        self.assertFalse(load_mock.called, "Expected image information without decoding the image")
+        self.assertEqual(info, {"format": "PNG", "mode": "RGB", "width": 10, "height": 10})
+        self.assertEqual(self.photo.get_image_info()["format"], "JPEG")
+        self.assertIsNone(HttpImageResourceMock.objects.get(id=2).get_image_info())  # fail
+
+    def test_draft_size(self):
+        content_type, image = self.photo.content
+        self.assertEqual(image.size, (64, 48))
+        self.photo.config = {"image_draft_size": [8, 6]}
+        content_type, image = self.photo.content
+        self.assertEqual(image.size, (8, 6))
+        self.assertGreater(image.getpixel((4, 3))[0], 200)
+        # Draft mode only applies to JPEG images
+        self.instance.config = {"image_draft_size": [5, 5]}
+        content_type, image = self.instance.content
+        self.assertEqual(image.size, (10, 10))
+
+    def test_get_thumbnail(self):
+        thumbnail = self.photo.get_thumbnail((16, 16))
+        self.assertEqual(thumbnail.size, (16, 12))
+        self.assertTrue(self.storage.exists("photo.jpg.16x16.jpg"))
+        # Stored thumbnails get read instead of decoding the original again
+        with patch.object(PillowImage.Image, "thumbnail") as thumbnail_mock:
+            thumbnail = self.photo.get_thumbnail((16, 16))
+        self.assertFalse(thumbnail_mock.called)
+        self.assertEqual(thumbnail.size, (16, 12))
+        self.assertEqual(thumbnail.format, "JPEG")
+        self.assertEqual(self.instance.get_thumbnail((5, 5)).size, (5, 5))
+        self.assertEqual(self.photo.get_derived_files(), ["photo.jpg.16x16.jpg"])
+        self.assertIsNone(HttpImageResourceMock.objects.get(id=2).get_thumbnail((5, 5)))  # fail
+        # Thumbnails get deleted together with the downloaded file
+        file_resource_delete_handler(HttpImageResourceMock, self.photo)
+        self.assertEqual(self.storage.listdir("")[1], ["image-file.png", "image-file.png.5x5.png"])
 
 
 class TestFileResourceDeleteHandler(TestCase):
@@ -267,7 +398,113 @@ class TestFileResourceDeleteHandler(TestCase):
         instance.body = ""
         file_resource_delete_handler(HttpImageResourceMock, instance, extra="ignored")
         self.assertEqual(storage_delete_mock.call_count, 0)
+        # Ignore if file is shared with another resource
+        instance.body = "image-file.png"
+        HttpImageResourceMock.objects.filter(id=2).update(body="image-file.png")
+        file_resource_delete_handler(HttpImageResourceMock, instance, extra="ignored")
+        self.assertEqual(storage_delete_mock.call_count, 0)
         # Ignore if file does not exist
         instance.body = "does-not-exist.png"
         file_resource_delete_handler(HttpImageResourceMock, instance, extra="ignored")
         self.assertEqual(storage_delete_mock.call_count, 0)
+
+    @patch("datagrowth.resources.http.files.default_storage.exists", return_value=True)
+    @patch("datagrowth.resources.http.files.default_storage.delete", return_value=None)
+    def test_file_resource_delete_handler_without_derived_files(self, storage_delete_mock, storage_exists_mock):
+        instance = HttpResourceMock(body="resources/bodies/body.json", body_file="resources/bodies/spilled.json")
+        file_resource_delete_handler(HttpResourceMock, instance)
+        self.assertEqual(
+            [call.args[0] for call in storage_delete_mock.call_args_list],
+            ["resources/bodies/body.json", "resources/bodies/spilled.json"]
+        )
+
+
+class TestDownloadMany(TransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.files = {
+            "/large.pdf": bytes(range(256)) * 800,
+            "/small.pdf": b"small",
+            "/copy.pdf": b"small",
+        }
+        media_root = TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.storage = FileSystemStorage(location=media_root.name)
+        storage_patch = patch("datagrowth.resources.http.files.default_storage", self.storage)
+        storage_patch.start()
+        self.addCleanup(storage_patch.stop)
+
+    def assert_downloaded(self, resource, content):
+        self.assertEqual(resource.status, 200)
+        self.assertTrue(resource.id)
+        self.assertIn(hashlib.sha256(content).hexdigest(), resource.body)
+        with self.storage.open(resource.body) as file:
+            self.assertEqual(file.read(), content)
+
+    @patch("datagrowth.resources.http.files.DOWNLOAD_BUFFER_SIZE", 1024)
+    def test_download_many(self):
+        with MockFileServer(self.files, delay=0.1) as server:
+            urls = [server.url(path) for path in ["/large.pdf", "/small.pdf", "/copy.pdf", "/missing.pdf"]]
+            report = HttpDownloadResource.download_many(urls, config={"download_concurrency": 4})
+        self.assertEqual(server.max_in_flight, 4)
+        self.assertEqual([resource.request["url"] for resource in report.resources], urls)
+        large, small, copy, missing = report.resources
+        self.assert_downloaded(large, self.files["/large.pdf"])
+        self.assert_downloaded(small, self.files["/small.pdf"])
+        # Identical content is stored once
+        self.assertEqual(copy.body, small.body)
+        self.assertEqual(len(self.storage.listdir(os.path.dirname(small.body))[1]), 1)
+        self.assertEqual(missing.status, 404)
+        self.assertEqual(report.success, [large, small, copy])
+        self.assertEqual(report.errors, [missing])
+        self.assertEqual(report.size, 256 * 800 + 10 + missing.download_size)
+        self.assertGreater(report.duration, 0)
+        self.assertEqual(report.throughput, report.size / report.duration)
+        # Files that were downloaded before are loaded from the database
+        with MockFileServer(self.files) as server:
+            report = HttpDownloadResource.download_many([urls[0]])
+        self.assertEqual(report.resources[0].id, large.id)
+        self.assertEqual(report.size, 0)
+
+    def test_download_many_per_host(self):
+        with MockFileServer(self.files, delay=0.1) as server:
+            urls = [server.url(path) for path in self.files] * 2
+            HttpDownloadResource.download_many(urls, config={"download_concurrency": 4, "concurrency_per_host": 2})
+        self.assertEqual(server.max_in_flight, 2)
+
+    def test_resume(self):
+        content = self.files["/large.pdf"]
+        with MockFileServer(self.files, interrupted=["/large.pdf"]) as server:
+            resource = HttpDownloadResource().get(server.url("/large.pdf"))
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(server.requests[0], ("/large.pdf", None,))
+        # The range starts at the bytes that were received, which may be less than the bytes that were sent
+        path, range_header = server.requests[1]
+        self.assertEqual(path, "/large.pdf")
+        self.assertRegex(range_header, r"^bytes=\d+-$")
+        self.assertLessEqual(int(range_header[6:-1]), len(content) // 2)
+        self.assertEqual(resource.download_size, len(content))
+        self.assertEqual(resource.head["Content-Length"], str(len(content)))
+        resource.close()
+        self.assert_downloaded(resource, content)
+
+    def test_resume_attempts(self):
+        with MockFileServer(self.files, interrupted=["/large.pdf"]) as server:
+            resource = HttpDownloadResource(config={"download_resume_attempts": 0, "backoff_delays": []})
+            with self.assertRaises(DGHttpError50X):
+                resource.get(server.url("/large.pdf"))
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(resource.status, 502)
+
+    def test_download_many_task(self):
+        config = ConfigurationType(namespace="http_resource", private=["_resource"])
+        config.update({"resource": "resources.HttpDownloadResource"})
+        with MockFileServer(self.files) as server:
+            success, errors = download_many(
+                config=config.to_dict(protected=True, private=True),
+                urls=[server.url("/small.pdf"), server.url("/missing.pdf")]
+            )
+        self.assertEqual(len(success), 1)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(HttpDownloadResource.objects.get(id=success[0]).status, 200)
@@ -4,16 +4,22 @@ Some core functionality shared by all derived classes of HttpResource gets teste
 """
 
 import json
-from unittest.mock import patch, call
+import threading
+from datetime import timedelta
+from unittest.mock import patch, call, NonCallableMock
 
+import requests
 from django.test import TestCase
+from django.utils.timezone import now
 from django.core.exceptions import ValidationError
 
 from datagrowth.resources import HttpResource
-from datagrowth.exceptions import DGResourceDoesNotExist
+from datagrowth.resources.limiters import DATAGROWTH_RATE_LIMITER
+from datagrowth.resources.singleflight import DATAGROWTH_SINGLE_FLIGHT, Flight
+from datagrowth.exceptions import DGResourceDoesNotExist, DGHttpError40X
 
 from resources.models import HttpResourceMock
-from resources.mocks.requests import MOCK_DATA
+from resources.mocks.requests import MOCK_DATA, MockRequests, error_response
 
 
 class TestHttpResourceInterface(TestCase):
@@ -196,6 +202,20 @@ class TestHttpResourceInterface(TestCase):
         self.assertFalse(sleep_mock.called,
                          "When using cache the interval_duration is never necessary and should be ignored")
 
+    @patch.object(DATAGROWTH_RATE_LIMITER, "buckets", {})
+    @patch("datagrowth.resources.limiters.time", return_value=100.0)
+    @patch("datagrowth.resources.limiters.sleep")
+    def test_send_rate_limit(self, limiter_sleep_mock, time_mock):
+        config = {"rate_limit": 2, "rate_limit_burst": 2}
+        for query in ["new", "new2", "new3", "success"]:
+            self.model(config=config).get(query)
+        self.assertEqual(limiter_sleep_mock.call_args_list, [call(0.5)],
+                         "Expected to only wait for the third request and not for cached resources")
+        self.assertEqual(list(DATAGROWTH_RATE_LIMITER.buckets.keys()), ["http://localhost:8000"])
+        # Limits may also be shared by all requests of a resource class
+        self.model(config={"rate_limit": 2, "rate_limit_scope": "class"}).get("new4")
+        self.assertIn(self.model._meta.label, DATAGROWTH_RATE_LIMITER.buckets)
+
     @patch("datagrowth.resources.http.generic.sleep")
     def test_get_retry(self, sleep_mock):
         # Load and retry an existing request
@@ -221,6 +241,58 @@ class TestHttpResourceInterface(TestCase):
         self.assertEqual(instance.request["backoff_delay"], 0)
         self.assertEqual(sleep_mock.call_args_list, [call(0), call(1)], "Expected a call to sleep before each request")
 
+    def expire_resource(self, query, head):
+        resource = self.model().get(query)
+        resource.head.update(head)
+        resource.purge_at = now() - timedelta(days=1)
+        resource.save()
+        return resource
+
+    @patch("datagrowth.resources.http.generic.sleep")
+    def test_get_revalidate(self, sleep_mock):
+        stored = self.expire_resource("success", {"etag": "\"v1\"", "last-modified": "Wed, 21 Oct 2026 07:28:00 GMT"})
+        not_modified = NonCallableMock(spec=requests.Response)
+        not_modified.status_code = 304
+        not_modified.headers = {}
+        not_modified.content = b""
+        with patch.object(MockRequests, "send", return_value=not_modified) as send_mock:
+            instance = self.model(config={"purge_after": {"days": 7}}).get("success")
+        # The stored response should be kept and only validated by the server
+        self.assertEqual(send_mock.call_count, 1)
+        prepared_request = send_mock.call_args.args[0]
+        self.assertEqual(prepared_request.headers["If-None-Match"], "\"v1\"")
+        self.assertEqual(prepared_request.headers["If-Modified-Since"], "Wed, 21 Oct 2026 07:28:00 GMT")
+        self.assertEqual(instance.id, stored.id)
+        self.assertEqual(instance.status, 200)
+        self.assertEqual(instance.head["etag"], "\"v1\"")
+        self.assertJSONEqual(instance.body, json.dumps(MOCK_DATA))
+        self.assertFalse(instance.is_revalidating)
+        self.assertNotIn("If-None-Match", instance.request["headers"], "Conditional headers shouldn't get stored")
+        instance.close()
+        instance.refresh_from_db()
+        self.assertGreater(instance.purge_at, now())
+        self.assertGreater(instance.modified_at, stored.modified_at)
+        # Modified responses replace the stored response
+        self.expire_resource("success", {"etag": "\"v1\""})
+        instance = self.model().get("success")
+        self.assertEqual(instance.id, stored.id)
+        self.assertEqual(instance.session.send.call_count, 1)
+        self.assertNotIn("etag", instance.head)
+        self.assertIsNone(instance.purge_at)
+
+    @patch("datagrowth.resources.http.generic.sleep")
+    def test_get_expired_without_validators(self, sleep_mock):
+        stored = self.expire_resource("success", {})
+        instance = self.model().get("success")
+        self.assertEqual(instance.session.send.call_count, 1)
+        self.assertIsNone(instance.id, "Expected expired resources without validators to get deleted")
+        self.assertFalse(self.model.objects.filter(id=stored.id).exists())
+        # Revalidation can be disabled
+        stored = self.expire_resource("success", {"etag": "\"v1\""})
+        instance = self.model(config={"revalidate": False}).get("success")
+        self.assertIsNone(instance.id)
+        self.assertFalse(self.model.objects.filter(id=stored.id).exists())
+
     def test_get_invalid(self):
         # Invalid invoke of get
         try:
@@ -236,6 +308,77 @@ class TestHttpResourceInterface(TestCase):
         except ValidationError:
             pass
 
+    def test_get_single_flight(self):
+        instance = self.model().get("success")
+        # Resources that send while the same request is in flight get a copy of the resulting resource
+
+        def share(key, function, share):
+            return share(instance), True
+
+        with patch.object(DATAGROWTH_SINGLE_FLIGHT, "do", side_effect=share) as do_mock:
+            shared = self.model().get("success")
+        self.assertEqual(do_mock.call_args.args[0], instance.get_cache_key())
+        self.assertIsNot(shared, instance)
+        self.assertEqual(shared.id, instance.id)
+        # Single flight is skipped when it is disabled or when only the cache gets used
+        with patch.object(DATAGROWTH_SINGLE_FLIGHT, "do") as do_mock:
+            self.model(config={"single_flight": False}).get("success")
+            self.model(config={"cache_only": True}).get("success")
+        do_mock.assert_not_called()
+
+    def test_get_single_flight_copies(self):
+        # Copies of a new resource that waiting callers receive insert a single row
+        instance = self.model().get("new")
+        self.assertIsNone(instance.id)
+        copies = [HttpResource._copy_shared(instance) for _ in range(2)]
+        for resource in copies + [instance]:
+            resource.close()
+        self.assertEqual(self.model.objects.filter(uri=instance.uri).count(), 1)
+        self.assertEqual({resource.id for resource in copies + [instance]}, {instance.id})
+        # Waiting callers get their own copy of errors and the resource of errors
+        with self.assertRaises(DGHttpError40X) as context:
+            self.model().get("404")
+        error = context.exception
+        shared = HttpResource._copy_shared(error)
+        self.assertIsInstance(shared, DGHttpError40X)
+        self.assertIsNot(shared, error)
+        self.assertIsNot(shared.resource, error.resource)
+        self.assertEqual(shared.resource.status, 404)
+        shared.resource.close()
+        error.resource.close()
+        self.assertEqual(self.model.objects.filter(uri=error.resource.uri).count(), 1)
+
+    def test_get_single_flight_defer_retries(self):
+        # A resource that defers its retries doesn't wait for a leader that is in flight for the same request
+        leader = Flight()
+        follower = self.model()
+        follower.defer_retries = True
+        key = follower.prepare("get", "500").get_cache_key()
+        DATAGROWTH_SINGLE_FLIGHT.flights[key] = leader
+        resources = []
+        try:
+            with patch.object(error_response, "status_code", 503):
+                thread = threading.Thread(target=lambda: resources.append(follower.get()))
+                thread.start()
+                thread.join(timeout=5)
+            self.assertFalse(thread.is_alive(), "Expected a deferring resource to send without waiting")
+        finally:
+            leader.done.set()
+            del DATAGROWTH_SINGLE_FLIGHT.flights[key]
+        resource = resources[0]
+        self.assertEqual(resource.session.send.call_count, 1)
+        self.assertIsNotNone(resource.retry_delay)
+        self.assertEqual(resource.retry_attempt, 1)
+        # Copies of a deferring resource don't continue its retries and get their own request
+        shared = HttpResource._copy_shared(resource)
+        self.assertFalse(shared.defer_retries)
+        self.assertIsNone(shared.retry_delay)
+        self.assertEqual(shared.retry_attempt, 0)
+        shared.request["backoff_delay"] = 10
+        shared.head["x-shared"] = "1"
+        self.assertNotEqual(resource.request["backoff_delay"], 10)
+        self.assertNotIn("x-shared", resource.head)
+
     @patch("datagrowth.resources.http.generic.sleep")
     def test_get_cache_only(self, sleep_mock):
         # Load an existing resource from cache
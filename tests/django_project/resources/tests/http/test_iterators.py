@@ -1,13 +1,19 @@
+import json
 from types import GeneratorType
-from unittest.mock import patch
+from time import sleep
+from threading import Lock
+from unittest.mock import patch, Mock, NonCallableMock
 
-from django.test import TestCase
+import requests
+from django.test import TestCase, TransactionTestCase
 
 from datagrowth.configuration import ConfigurationType
 from datagrowth.resources.http import send_iterator, send_serie_iterator
+from datagrowth.resources.http.iterators import get_prepared_resource_links
 from datagrowth.exceptions import DGResourceException
 
-from resources.mocks.requests import MockRequests, MockRequestsWithAgent
+from project.mocks.data import MOCK_DATA_WITH_NEXT
+from resources.mocks.requests import MockRequests, MockRequestsWithAgent, prepare_request, return_response
 
 
 class TestHttpResourceIteratorBase(TestCase):
@@ -101,6 +107,7 @@ class TestSendSerieIterator(TestHttpResourceIteratorBase):
 
     @patch("datagrowth.resources.http.iterators.get_resource_link")
     def test_success_injected_session_provider(self, get_resource_link_mock):
+        get_resource_link_mock.return_value.request = None  # prevents cache lookups with mocked uri and data_hash
         args_list = [("test",), ("test",)]
         kwargs_list = [{}, {}]
         resource_generator = send_serie_iterator(
@@ -121,6 +128,38 @@ class TestSendSerieIterator(TestHttpResourceIteratorBase):
         )
         self.check_resources(resource_iterator, 3, 200)
 
+    def test_batched_cache_lookups(self):
+        args_list = [("success",), ("success",), ("new",)]
+        kwargs_list = [{}, {}, {}]
+        # One query to lookup all cached resources and one query per resource to store it
+        with self.assertNumQueries(4):
+            resources = list(send_serie_iterator(
+                args_list, kwargs_list,
+                method="get", config=self.config, session=self.session
+            ))
+        self.assertEqual([resource.id for resource in resources[:2]], [1, 1])
+        self.assertNotEqual(resources[2].id, 1)
+        self.assertEqual(self.session.send.call_count, 1)
+
+    def test_batched_cache_lookups_duplicate_input(self):
+        args_list = [("new",), ("new",)]
+        kwargs_list = [{}, {}]
+        resources = self.check_resources(
+            send_serie_iterator(args_list, kwargs_list, method="get", config=self.config, session=self.session),
+            2, 200
+        )
+        self.assertEqual(resources[0].id, resources[1].id)
+        self.assertEqual(self.session.send.call_count, 1, "Expected the second resource to come from cache")
+
+    def test_batched_cache_lookups_batch_size(self):
+        self.config.batch_size = 2
+        args_list = [("success",), ("next",), ("fail",)]
+        kwargs_list = [{}, {}, {}]
+        with self.assertNumQueries(2):
+            links = get_prepared_resource_links(self.config, args_list, kwargs_list, method="get")
+        self.assertEqual([link.prefetched_resources.get((link.uri, link.data_hash,)).id for link in links], [1, 3, 2])
+        self.assertIs(links[0].prefetched_resources, links[2].prefetched_resources)
+
     def test_error_requests(self):
         args_list = [("500",), ("500",)]
         kwargs_list = [{}, {}]
@@ -139,3 +178,181 @@ class TestSendSerieIterator(TestHttpResourceIteratorBase):
             DGResourceException,
             lambda: list(send_serie_iterator(args_list, kwargs_list, method="get", config=config, session=self.session))
         )
+
+
+class TestConcurrentSendSerieIterator(TransactionTestCase):
+
+    fixtures = ["test-http-resource-mock"]
+
+    def setUp(self):
+        super().setUp()
+        self.config = ConfigurationType(
+            namespace="http_resource",
+            private=["_resource", "_continuation_limit"],
+        )
+        self.config.update({
+            "resource": "resources.HttpResourceMock",
+            "continuation_limit": 10,
+            "concurrency": 4
+        })
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = Lock()
+        self.session = NonCallableMock(spec=requests)
+        self.session.send = Mock(side_effect=self.slow_response)
+        self.session.prepare_request = Mock(side_effect=prepare_request)
+
+    def slow_response(self, prepared_request, proxies, verify, timeout, allow_redirects):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.in_flight, self.max_in_flight)
+        sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        return return_response(prepared_request, proxies, verify, timeout, allow_redirects)
+
+    def test_concurrent_requests(self):
+        queries = ["test{}".format(ix) for ix in range(8)] + ["next", "500"]
+        args_list = [(query,) for query in queries]
+        kwargs_list = [{} for _ in queries]
+        resources = list(send_serie_iterator(
+            args_list, kwargs_list,
+            method="get", config=self.config, session=self.session
+        ))
+        self.assertEqual(len(resources), 11, "Expected one continuation resource for the next query")
+        self.assertEqual(self.max_in_flight, 4)
+        # Resources should follow input order and continuations should follow their origin
+        self.assertEqual([resource.request["args"][1] for resource in resources[:9]], queries[:9])
+        self.assertIn("next=1", resources[9].request["url"])
+        self.assertEqual(resources[10].status, 500)
+        for resource in resources:
+            self.assertIsNotNone(resource.id)
+
+    def test_concurrency_per_host(self):
+        self.config.concurrency_per_host = 2
+        args_list = [("test{}".format(ix),) for ix in range(6)]
+        kwargs_list = [{} for _ in args_list]
+        resources = list(send_serie_iterator(
+            args_list, kwargs_list,
+            method="get", config=self.config, session=self.session
+        ))
+        self.assertEqual(len(resources), 6)
+        self.assertEqual(self.max_in_flight, 2)
+
+    def test_deferred_retries(self):
+        self.config.concurrency = 2
+        self.config.backoff_delays = [0.3]
+        sent_urls = []
+        busy_response = NonCallableMock(spec=requests.Response)
+        busy_response.headers = {"content-type": "application/json"}
+        busy_response.content = "{}"
+        busy_response.status_code = 503
+
+        def busy_once(prepared_request, proxies, verify, timeout, allow_redirects):
+            is_retry = prepared_request.url in sent_urls
+            sent_urls.append(prepared_request.url)
+            if "busy" in prepared_request.url and not is_retry:
+                return busy_response
+            return self.slow_response(prepared_request, proxies, verify, timeout, allow_redirects)
+
+        self.session.send = Mock(side_effect=busy_once)
+        queries = ["busy", "test0", "test1", "test2"]
+        args_list = [(query,) for query in queries]
+        kwargs_list = [{} for _ in queries]
+        resources = list(send_serie_iterator(
+            args_list, kwargs_list,
+            method="get", config=self.config, session=self.session
+        ))
+        # Other requests should get send while the busy request waits for its retry
+        self.assertEqual(len(sent_urls), 5)
+        self.assertEqual(len([url for url in sent_urls if "busy" in url]), 2)
+        self.assertIn("busy", sent_urls[-1])
+        # Resources should still follow input order
+        self.assertEqual([resource.request["args"][1] for resource in resources], queries)
+        self.assertEqual(resources[0].status, 200)
+        self.assertEqual(resources[0].request["backoff_delay"], 0.3)
+        for resource in resources:
+            self.assertIsNotNone(resource.id)
+            self.assertIsNone(resource.retry_delay)
+
+    def test_serial_requests(self):
+        self.config.concurrency = 1
+        args_list = [("test{}".format(ix),) for ix in range(3)]
+        kwargs_list = [{} for _ in args_list]
+        resources = list(send_serie_iterator(
+            args_list, kwargs_list,
+            method="get", config=self.config, session=self.session
+        ))
+        self.assertEqual(len(resources), 3)
+        self.assertEqual(self.max_in_flight, 1)
+
+
+class TestPrefetchSendIterator(TransactionTestCase):
+
+    fixtures = ["test-http-resource-mock"]
+
+    def setUp(self):
+        super().setUp()
+        self.config = ConfigurationType(
+            namespace="http_resource",
+            private=["_resource", "_continuation_limit"],
+        )
+        self.config.update({
+            "resource": "resources.HttpResourceMock",
+            "continuation_limit": 10,
+            "continuation_prefetch": 1
+        })
+        self.events = []
+        self.paged_response = NonCallableMock(spec=requests.Response)
+        self.paged_response.headers = {"content-type": "application/json"}
+        self.paged_response.content = json.dumps(MOCK_DATA_WITH_NEXT)
+        self.paged_response.status_code = 200
+        self.session = NonCallableMock(spec=requests)
+        self.session.send = Mock(side_effect=self.record_response)
+        self.session.prepare_request = Mock(side_effect=prepare_request)
+
+    def record_response(self, prepared_request, proxies, verify, timeout, allow_redirects):
+        sleep(0.05)
+        self.events.append("send")
+        if "paged" in prepared_request.url and "next=1" not in prepared_request.url:
+            return self.paged_response
+        return return_response(prepared_request, proxies, verify, timeout, allow_redirects)
+
+    def consume(self, resource_iterator):
+        resources = []
+        for resource in resource_iterator:
+            sleep(0.2)
+            self.events.append("processed")
+            resources.append(resource)
+        return resources
+
+    def test_prefetch(self):
+        resources = self.consume(send_iterator("paged", method="get", config=self.config, session=self.session))
+        self.assertEqual(len(resources), 2)
+        self.assertIn("next=1", resources[1].request["url"])
+        self.assertEqual(self.events, ["send", "send", "processed", "processed"],
+                         "Expected the next request to get send while the first resource was processed")
+        for resource in resources:
+            self.assertIsNotNone(resource.id)
+
+    def test_prefetch_disabled(self):
+        self.config.continuation_prefetch = 0
+        resources = self.consume(send_iterator("paged", method="get", config=self.config, session=self.session))
+        self.assertEqual(len(resources), 2)
+        self.assertEqual(self.events, ["send", "processed", "send", "processed"])
+
+    def test_prefetch_continuation_limit(self):
+        self.config.continuation_limit = 2
+        self.config.continuation_prefetch = 5
+        resource_iterator = send_iterator("paged", method="get", config=self.config, session=self.session)
+        first = next(resource_iterator)
+        self.assertIsNotNone(first.id)
+        resource_iterator.close()
+        sleep(0.2)
+        self.assertLessEqual(self.events.count("send"), 2)
+
+    def test_prefetch_errors(self):
+        config = self.config.to_dict(protected=True, private=True)
+        config["resource_exception_reraise"] = True
+        with self.assertRaises(DGResourceException):
+            list(send_iterator("500", method="get", config=config, session=self.session))
@@ -7,6 +7,7 @@ import json
 from django.test import TestCase
 
 from datagrowth.resources import HttpResource
+from datagrowth.resources.http.balancers import DATAGROWTH_HOST_BALANCERS
 
 from resources.models import MicroServiceResourceMock
 from resources.mocks.requests import MOCK_DATA
@@ -78,3 +79,27 @@ class TestMicroServiceResourceInterface(TestCase):
         self.assertEqual(instance.status, 200)
         self.assertTrue(instance.id)
         self.assertTrue(instance.data_hash)
+
+    def test_send_multiple_hosts(self):
+        DATAGROWTH_HOST_BALANCERS.reset()
+        config = {
+            "connections": {
+                "service_mock": {
+                    "protocol": "http",
+                    "hosts": ["localhost:8001", "localhost:8002"],
+                    "path": "/service",
+                }
+            }
+        }
+        urls = []
+        for _ in range(3):
+            instance = self.model(config=config).get()
+            self.assertEqual(instance.uri, "service_mock/service",
+                             "Expected the micro service name to replace the host in the uri")
+            args, kwargs = instance.session.send.call_args
+            urls.append(args[0].url)
+        self.assertEqual(urls, [
+            "http://localhost:8001/service",
+            "http://localhost:8002/service",
+            "http://localhost:8001/service",
+        ])
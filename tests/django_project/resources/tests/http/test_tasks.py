@@ -141,7 +141,7 @@ class TestLoadSession(TestCase):
 
     def test_load_session(self):
         config, session = load_session_function(self.config)
-        self.assertIsInstance(session, requests.Session)
+        self.assertIsNone(session, "Expected no session to be injected to let resources use the session pool")
         preload_session = requests.Session()
         preload_session.preload = True
         config, session = load_session_function(self.config, session=preload_session)
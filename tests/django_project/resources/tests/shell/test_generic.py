@@ -10,6 +10,7 @@ from django.core.exceptions import ValidationError
 
 from datagrowth.configuration import DATAGROWTH_CONFIGURATION
 from datagrowth.resources import ShellResource
+from datagrowth.resources.limiters import DATAGROWTH_RATE_LIMITER
 from datagrowth.exceptions import DGResourceDoesNotExist
 
 from resources.models import ShellResourceMock
@@ -78,6 +79,19 @@ class TestShellResourceInterface(TestCase):
         self.assertTrue(instance.id)
         self.assertEqual(sleep_mock.call_args_list, [], "When no interval_duration is specified sleep is not used")
 
+    @patch.object(DATAGROWTH_RATE_LIMITER, "buckets", {})
+    @patch("datagrowth.resources.limiters.time", return_value=100.0)
+    @patch("datagrowth.resources.limiters.sleep")
+    @patch("datagrowth.resources.shell.generic.subprocess.run", return_value=SubprocessResult(0, b"out", b""))
+    def test_run_rate_limit(self, subprocess_mock, limiter_sleep_mock, time_mock):
+        config = {"rate_limit": 4}
+        for query in ["test", "test2", "success", "test3"]:
+            self.model(config=config).run(query, ".", context=5)
+        self.assertEqual(subprocess_mock.call_count, 3)
+        self.assertEqual(limiter_sleep_mock.call_args_list, [call(0.25), call(0.5)],
+                         "Expected to wait for all but the first command and not for cached resources")
+        self.assertEqual(list(DATAGROWTH_RATE_LIMITER.buckets.keys()), [self.model._meta.label])
+
     @patch("datagrowth.resources.shell.generic.sleep")
     @patch("datagrowth.resources.shell.generic.subprocess.run", return_value=SubprocessResult(0, b"out", b""))
     def test_run_success(self, subprocess_mock, sleep_mock):
@@ -1,9 +1,9 @@
-from unittest.mock import patch, call
+from unittest.mock import patch, call, ANY
 
 from django.test import TestCase
 
 from datagrowth.configuration import ConfigurationType
-from datagrowth.resources.shell.tasks import run, run_serie
+from datagrowth.resources.shell.tasks import run, run_serie, _run
 
 from resources.models import ShellResourceMock
 
@@ -46,6 +46,14 @@ class TestRunTask(TestCase):
             "Expected three ShellResourceMock instances. Two from cache and one new"
         )
 
+    @patch.object(ShellResourceMock, "run", autospec=True, side_effect=ShellResourceMock.run)
+    def test_run_buffer_argument(self, run_mock):
+        # A buffer keyword argument belongs to the command like any other keyword argument
+        scc, err = run("test", context=5, buffer=1, config=self.config)
+        run_mock.assert_called_once_with(ANY, "test", context=5, buffer=1)
+        self.check_results(scc, 1)
+        self.check_results(err, 0)
+
 
 class TestRunSerieTask(TestCase):
 
@@ -72,13 +80,22 @@ class TestRunSerieTask(TestCase):
             self.assertIsInstance(pk, int)
             self.assertGreater(pk, 0)
 
-    @patch("datagrowth.resources.shell.tasks.run", wraps=run)
+    @patch("datagrowth.resources.shell.tasks._run", wraps=_run)
     def test_run_serie(self, run_mock):
+        self.config.update({"resource_buffer_size": 100})
         scc, err = run_serie(self.args_list, self.kwargs_list, config=self.config)
         self.check_results(scc, 2)
         self.check_results(err, 1)
         run_mock.assert_has_calls([
-            call("test", context=5, config=self.config),
-            call("success", context=5, config=self.config),
-            call("fail", context=5, config=self.config)
+            call(self.config, ANY, "test", context=5),
+            call(self.config, ANY, "success", context=5),
+            call(self.config, ANY, "fail", context=5)
         ])
+        # The buffer inserted the new Resources in bulk
+        self.assertEqual(ShellResourceMock.objects.count(), 3)
+
+    def test_run_serie_unbuffered(self):
+        self.config.update({"resource_buffer_size": 0})
+        scc, err = run_serie(self.args_list, self.kwargs_list, config=self.config)
+        self.check_results(scc, 2)
+        self.check_results(err, 1)
@@ -0,0 +1,111 @@
+from unittest.mock import patch, PropertyMock
+
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from datagrowth.configuration import ConfigurationType
+from datagrowth.resources.buffers import ResourceBuffer
+from datagrowth.resources.http.tasks import send_serie
+
+from resources.models import HttpResourceMock
+from resources.mocks.requests import MockRequests
+
+
+class TestResourceBuffer(TestCase):
+
+    fixtures = ["test-http-resource-mock"]
+
+    def get_resources(self, queries, config=None):
+        return [
+            HttpResourceMock(config=config or {}, session=MockRequests).get(query)
+            for query in queries
+        ]
+
+    def test_flush(self):
+        resources = self.get_resources(["test", "test2"])
+        stored = HttpResourceMock.objects.get(id=1)
+        modified_at = stored.modified_at
+        stored.status = 201
+        buffer = ResourceBuffer(batch_size=10)
+        for resource in resources + [stored, resources[0]]:
+            buffer.add(resource)
+        self.assertIsNone(resources[0].id, "Expected resources to get written upon flush only")
+        with CaptureQueriesContext(connection) as queries:
+            buffer.flush()
+        statements = [query["sql"].split(" ")[0] for query in queries.captured_queries]
+        self.assertEqual(statements.count("INSERT"), 1)
+        self.assertEqual(statements.count("UPDATE"), 1)
+        self.assertEqual(HttpResourceMock.objects.filter(id__in=[resource.id for resource in resources]).count(), 2)
+        stored.refresh_from_db()
+        self.assertEqual(stored.status, 201)
+        self.assertGreater(stored.modified_at, modified_at)
+        # Flushing again does nothing, because the buffer is empty
+        with self.assertNumQueries(0):
+            buffer.flush()
+
+    def test_batch_size(self):
+        with ResourceBuffer(batch_size=2) as buffer:
+            resources = self.get_resources(["test", "test2", "test3"])
+            for resource in resources:
+                buffer.add(resource)
+            self.assertIsNotNone(resources[0].id)
+            self.assertIsNotNone(resources[1].id)
+            self.assertIsNone(resources[2].id)
+        self.assertIsNotNone(resources[2].id, "Expected the buffer to flush when exiting its context")
+
+    @patch("datagrowth.resources.buffers.monotonic", side_effect=[0, 0, 5, 5])
+    def test_interval(self, monotonic_mock):
+        buffer = ResourceBuffer(batch_size=10, interval=5)
+        first, second = self.get_resources(["test", "test2"])
+        buffer.add(first)
+        self.assertIsNone(first.id)
+        buffer.add(second)
+        self.assertIsNotNone(first.id)
+        self.assertIsNotNone(second.id)
+
+    def test_body_compression(self):
+        resource, = self.get_resources(["test"], config={"body_compression": "zlib"})
+        body = resource.body
+        with ResourceBuffer() as buffer:
+            buffer.add(resource)
+        self.assertEqual(resource.body, body)
+        stored = HttpResourceMock.objects.filter(id=resource.id).values("body", "body_compressed").get()
+        self.assertIsNone(stored["body"])
+        self.assertIsNotNone(stored["body_compressed"])
+        self.assertEqual(HttpResourceMock.objects.get(id=resource.id).body, body)
+
+    def test_without_returning(self):
+        resources = self.get_resources(["test", "test2"])
+        features = type(connection.features)
+        with patch.object(features, "can_return_rows_from_bulk_insert", new_callable=PropertyMock, return_value=False):
+            with ResourceBuffer() as buffer:
+                for resource in resources:
+                    buffer.add(resource)
+        for resource in resources:
+            self.assertIsInstance(resource.id, int)
+
+    def test_send_serie(self):
+        config = ConfigurationType(namespace="http_resource", private=["_resource", "_continuation_limit"])
+        config.update({"resource": "resources.HttpResourceMock", "resource_buffer_size": 100})
+        args_list = [["test"], ["test2"], ["test3"], ["404"]]
+        kwargs_list = [{}, {}, {}, {}]
+        with CaptureQueriesContext(connection) as queries:
+            success, errors = send_serie(args_list, kwargs_list, method="get", config=config, session=MockRequests)
+        inserts = [query for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(len(success), 3)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(HttpResourceMock.objects.filter(id__in=success + errors).count(), 4)
+
+    def test_send_serie_unbuffered(self):
+        config = ConfigurationType(namespace="http_resource", private=["_resource", "_continuation_limit"])
+        config.update({"resource": "resources.HttpResourceMock"})
+        args_list = [["test"], ["test2"]]
+        kwargs_list = [{}, {}]
+        # Without a configured buffer size every resource gets saved through close
+        with patch.object(HttpResourceMock, "close", autospec=True, side_effect=HttpResourceMock.close) as close_mock:
+            success, errors = send_serie(args_list, kwargs_list, method="get", config=config, session=MockRequests)
+        self.assertEqual(close_mock.call_count, 2)
+        self.assertEqual(len(success), 2)
+        self.assertEqual(errors, [])
@@ -0,0 +1,112 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from datagrowth.resources.cache import DATAGROWTH_RESOURCE_CACHE
+from datagrowth.resources.buffers import ResourceBuffer
+from datagrowth.exceptions import DGResourceDoesNotExist
+
+from resources.models import HttpResourceMock, ShellResourceMock
+from resources.mocks.requests import MockRequests
+
+
+class TestResourceCache(TestCase):
+
+    fixtures = ["test-http-resource-mock", "test-shell-resource-mock"]
+
+    def setUp(self):
+        super().setUp()
+        DATAGROWTH_RESOURCE_CACHE.clear()
+        self.addCleanup(DATAGROWTH_RESOURCE_CACHE.clear)
+        self.config = {"resource_cache_size": 2}
+
+    def get(self, query, config=None):
+        return HttpResourceMock(config=self.config if config is None else config, session=MockRequests).get(query)
+
+    def lookup(self, query):
+        return HttpResourceMock(config=self.config).prepare("get", query).get_cached_resource()
+
+    def test_disabled(self):
+        self.get("success", config={})
+        with self.assertNumQueries(1):
+            self.get("success", config={})
+        self.assertEqual(len(DATAGROWTH_RESOURCE_CACHE), 0)
+        self.assertEqual(DATAGROWTH_RESOURCE_CACHE.info(), {"hits": 0, "misses": 0, "size": 0})
+
+    def test_send(self):
+        first = self.get("success")
+        with self.assertNumQueries(0):
+            second = self.get("success")
+        self.assertEqual(first.id, second.id)
+        self.assertIsNot(first, second, "Expected the cache to hand out copies of resources")
+        self.assertEqual(second.status, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(DATAGROWTH_RESOURCE_CACHE.info(), {"hits": 1, "misses": 1, "size": 1})
+        self.assertEqual(first.get_cache_key(), ("resources.HttpResourceMock", first.uri, first.data_hash,))
+
+    def test_lru(self):
+        self.get("success")
+        self.get("fail")
+        self.get("success")
+        self.get("next")
+        self.assertEqual(len(DATAGROWTH_RESOURCE_CACHE), 2)
+        with self.assertNumQueries(0):
+            self.get("success")
+        with self.assertNumQueries(1):
+            self.get("fail")
+
+    @patch("datagrowth.resources.cache.monotonic", side_effect=[0, 299, 301, 301])
+    def test_ttl(self, monotonic_mock):
+        self.get("success")
+        with self.assertNumQueries(0):
+            self.get("success")
+        with self.assertNumQueries(1):
+            self.get("success")
+        self.assertEqual(DATAGROWTH_RESOURCE_CACHE.info(), {"hits": 1, "misses": 2, "size": 1})
+
+    def test_negative(self):
+        config = {"resource_cache_size": 2, "resource_cache_negative": True, "cache_only": True}
+        with self.assertRaises(DGResourceDoesNotExist):
+            self.get("new", config=config)
+        with self.assertNumQueries(0), self.assertRaises(DGResourceDoesNotExist):
+            self.get("new", config=config)
+        # Lookups without cache_only ignore missing resources, because they create the resource themselves
+        resource = self.get("new")
+        self.assertIsNone(resource.id)
+        resource.close()
+        self.assertEqual(self.get("new", config=config).id, resource.id)
+        # Without resource_cache_negative missing resources don't get cached
+        config["resource_cache_negative"] = False
+        with self.assertRaises(DGResourceDoesNotExist):
+            self.get("new2", config=config)
+        with self.assertNumQueries(1), self.assertRaises(DGResourceDoesNotExist):
+            self.get("new2", config=config)
+
+    def test_invalidation(self):
+        resource = self.get("success")
+        resource.status = 201
+        resource.save()
+        self.assertEqual(self.lookup("success").status, 201)
+        resource.delete()
+        self.assertIsNone(self.lookup("success"))
+        # Resources written by a buffer get removed as well
+        stored = self.lookup("fail")
+        stored.status = 503
+        with ResourceBuffer() as buffer:
+            buffer.add(stored)
+        self.assertEqual(self.lookup("fail").status, 503)
+
+    @patch("datagrowth.resources.shell.generic.subprocess.run")
+    def test_run(self, subprocess_mock):
+        first = ShellResourceMock(config=self.config).run("success", ".", context=5)
+        with self.assertNumQueries(0):
+            second = ShellResourceMock(config=self.config).run("success", ".", context=5)
+        self.assertFalse(subprocess_mock.called)
+        self.assertEqual(first.id, second.id)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.stdout, "out")
+        self.assertEqual(DATAGROWTH_RESOURCE_CACHE.info(), {"hits": 1, "misses": 1, "size": 1})
+        stdin_resource = ShellResourceMock(config=self.config, stdin="input")
+        stdin_resource.command = stdin_resource._create_command("success", ".", context=5)
+        stdin_resource.clean()
+        self.assertNotEqual(stdin_resource.get_cache_key(), first.get_cache_key())
@@ -7,6 +7,8 @@ from resources.models import (
     EntityDetailResource,
     EntityIdListResource,
     EntityListResource,
+    HttpDownloadResource,
+    HttpImageDownloadResourceMock,
     HttpImageResourceMock,
     HttpResourceMock,
     MicroServiceResourceMock,
@@ -24,6 +26,8 @@ class TestDatagrowthResourceDjangoConfig(TestCase):
             "resources.httpresourcemock": HttpResourceMock,
             "resources.urlresourcemock": URLResourceMock,
             "resources.httpimageresourcemock": HttpImageResourceMock,
+            "resources.httpimagedownloadresourcemock": HttpImageDownloadResourceMock,
+            "resources.httpdownloadresource": HttpDownloadResource,
             "resources.microserviceresourcemock": MicroServiceResourceMock,
             "resources.shellresourcemock": ShellResourceMock,
             "resources.entitylistresource": EntityListResource,
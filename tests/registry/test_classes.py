@@ -1,6 +1,9 @@
+from unittest.mock import patch
+
 import pytest
 
 from datagrowth.registry import Registry, Tag
+from datagrowth.registry.types import _import_class
 
 
 class TestClass:
@@ -49,3 +52,18 @@ def test_get_class_reports_type_mismatch(registry: Registry) -> None:
 
     with pytest.raises(TypeError, match="Expected class import from path"):
         registry.get_class(tag)
+
+
+class OtherClass:
+    pass
+
+
+def test_get_class_remembers_imports(registry: Registry) -> None:
+    tag = registry.register_class("test:class", TestClass)
+    with patch("datagrowth.registry.types._import_class", wraps=_import_class) as import_class:
+        assert registry.get_class("test:class") is TestClass
+        assert registry.get_class(tag) is TestClass
+        assert import_class.call_count == 1
+        registry.register_class("test:class", OtherClass)
+        assert registry.get_class(tag) is OtherClass, "Expected register_class to forget earlier imports"
+        assert import_class.call_count == 2
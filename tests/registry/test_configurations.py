@@ -52,3 +52,19 @@ def test_get_configuration_merges_base_and_overrides(registry: Registry) -> None
     result = registry.get_configuration(tag, overrides)
     assert result.batch_size == 50
     assert result.sample_size == 10
+
+
+def test_get_configuration_notices_base_changes(registry: Registry) -> None:
+    tag = Tag(category="test", value="value")
+    registry.configurations[tag] = create_config("test", {"batch_size": 99})
+    first = registry.get_configuration(tag)
+    second = registry.get_configuration(tag)
+    assert first is not second, "Expected a new configuration for every call"
+    first.update({"batch_size": 1})
+    assert second.batch_size == 99
+    assert registry.get_configuration(tag).batch_size == 99
+    # Changing the base configuration in place or replacing it changes new configurations
+    registry.configurations[tag].update({"batch_size": 75})
+    assert registry.get_configuration(tag).batch_size == 75
+    registry.configurations[tag] = create_config("test", {"batch_size": 50})
+    assert registry.get_configuration(tag).batch_size == 50
@@ -110,6 +110,34 @@ def test_get_extractor_with_tag_object(registry: Registry) -> None:
     assert extractor.config.continuation_limit == 99
 
 
+def test_get_shared_extractor(registry: Registry) -> None:
+    registry.register_extractor("extractor:test", MockExtractor, {"continuation_limit": 99})
+    extractor = registry.get_shared_extractor("extractor:test")
+    assert isinstance(extractor, MockExtractor)
+    assert extractor.config.continuation_limit == 99
+    assert registry.get_shared_extractor(Tag.from_string("extractor:test")) is extractor
+    overridden = registry.get_shared_extractor("extractor:test", {"continuation_limit": 5})
+    assert overridden is not extractor
+    assert overridden.config.continuation_limit == 5
+    assert registry.get_shared_extractor("extractor:test", create_config("http_resource", {
+        "continuation_limit": 5
+    })) is overridden
+    assert registry.get_extractor("extractor:test") is not extractor, "Expected get_extractor to create instances"
+
+
+def test_get_shared_extractor_after_register(registry: Registry) -> None:
+    registry.register_extractor("extractor:test", MockExtractor, {"continuation_limit": 99})
+    extractor = registry.get_shared_extractor("extractor:test")
+    registry.register_extractor("extractor:test", MockExtractor, {"continuation_limit": 5})
+    registered = registry.get_shared_extractor("extractor:test")
+    assert registered is not extractor
+    assert registered.config.continuation_limit == 5
+    registry.clear_shared()
+    assert registry.get_shared_extractor("extractor:test") is not registered
+    registry.unregister_extractor("extractor:test")
+    assert registry.shared == {}
+
+
 def test_extractor_methods_raise_for_wrong_category(registry: Registry) -> None:
     expected = "Expected a tag with 'extractor' category but found 'wrong'"
     with pytest.raises(ValueError, match=expected):
@@ -118,3 +146,5 @@ def test_extractor_methods_raise_for_wrong_category(registry: Registry) -> None:
         registry.unregister_extractor("wrong:test")
     with pytest.raises(ValueError, match=expected):
         registry.get_extractor("wrong:test")
+    with pytest.raises(ValueError, match=expected):
+        registry.get_shared_extractor("wrong:test")
@@ -123,6 +123,19 @@ def test_get_storage_with_tag_object(registry: Registry) -> None:
     assert storage.config.batch_size == 99
 
 
+def test_get_shared_storage(registry: Registry) -> None:
+    registry.register_storage("storage:test", MockStorage, {"batch_size": 99})
+    storage = registry.get_shared_storage("storage:test")
+    assert isinstance(storage, MockStorage)
+    assert storage.config.batch_size == 99
+    assert registry.get_shared_storage("storage:test") is storage
+    overridden = registry.get_shared_storage("storage:test", {"batch_size": 5})
+    assert overridden is not storage
+    assert overridden.config.batch_size == 5
+    registry.register_storage("storage:test", MockStorage)
+    assert registry.get_shared_storage("storage:test") is not storage, "Expected register to clear shared storages"
+
+
 def test_storage_methods_raise_for_wrong_category(registry: Registry) -> None:
     expected = "Expected a tag with 'storage' category but found 'wrong'"
     with pytest.raises(ValueError, match=expected):
@@ -131,3 +144,5 @@ def test_storage_methods_raise_for_wrong_category(registry: Registry) -> None:
         registry.unregister_storage("wrong:test")
     with pytest.raises(ValueError, match=expected):
         registry.get_storage("wrong:test")
+    with pytest.raises(ValueError, match=expected):
+        registry.get_shared_storage("wrong:test")
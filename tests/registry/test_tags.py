@@ -46,6 +46,13 @@ def test_tag_from_string_lowercase() -> None:
     assert str(tag) == "test:value"
 
 
+def test_tag_from_string_interned() -> None:
+    tag = Tag.from_string("Test:Interned")
+    assert Tag.from_string("Test:Interned") is tag
+    assert Tag.from_string("test:interned") == tag
+    assert hash(Tag.from_string("test:interned")) == hash(Tag(category="test", value="interned"))
+
+
 def test_tags_by_category(registry: Registry) -> None:
     test_tags = registry.tags_by_category("test")
     assert test_tags == [
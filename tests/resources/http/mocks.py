@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Any, TypeVar
+from unittest.mock import Mock
+
+import requests
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from datagrowth.resources.http.pydantic import HttpResource
+
+
+HttpResourceType = TypeVar("HttpResourceType", bound=HttpResource)
+
+
+def make_response(status_code: int, body: bytes | str = b"{}", headers: dict[str, str] | None = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {"content-type": "application/json"})
+    response._content = body.encode("utf-8") if isinstance(body, str) else body  # noqa: SLF001
+    return response
+
+
+def make_session() -> Mock:
+    # A session that prepares requests for real, but doesn't send them
+    session = Mock(spec=requests.Session)
+    session.prepare_request.side_effect = requests.Session().prepare_request
+    return session
+
+
+def make_resource(resource_class: type[HttpResourceType], extractor: Any) -> HttpResourceType:
+    # Resources get their own extractor, such that tests can configure it without affecting shared extractors
+    resource = resource_class()
+    resource.set_extractor(extractor)
+    return resource
@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+from datagrowth.resources.http.balancers import HostBalancer, HostBalancerPool
+
+
+def test_round_robin() -> None:
+    balancer = HostBalancer(["host-1", "host-2", "host-3"])
+    hosts = []
+    for _ in range(4):
+        host = balancer.acquire()
+        hosts.append(host)
+        balancer.release(host)
+    assert hosts == ["host-1", "host-2", "host-3", "host-1"]
+    assert balancer.outstanding == {"host-1": 0, "host-2": 0, "host-3": 0}
+
+
+def test_least_outstanding() -> None:
+    balancer = HostBalancer(["host-1", "host-2"], strategy="least_outstanding")
+    first = balancer.acquire()
+    second = balancer.acquire()
+    assert {first, second} == {"host-1", "host-2"}
+    balancer.release(second)
+    assert balancer.acquire() == second, "Expected the host without outstanding requests to get selected"
+    assert balancer.outstanding == {first: 1, second: 1}
+
+
+@patch("datagrowth.resources.http.balancers.monotonic")
+def test_ejection(monotonic_mock) -> None:
+    monotonic_mock.return_value = 100.0
+    balancer = HostBalancer(["host-1", "host-2"], ejection_duration=10)
+    host = balancer.acquire()
+    assert host == "host-1"
+    balancer.release(host, failed=True)
+    assert balancer.get_available_hosts() == ["host-2"]
+    assert [balancer.acquire() for _ in range(3)] == ["host-2", "host-2", "host-2"]
+    # Ejected hosts return after the ejection duration
+    monotonic_mock.return_value = 110.0
+    assert balancer.get_available_hosts() == ["host-1", "host-2"]
+    # Hosts return immediately after a successful request
+    monotonic_mock.return_value = 100.0
+    balancer.release("host-2", failed=True)
+    assert balancer.get_available_hosts() == ["host-1", "host-2"], "Expected all hosts when all hosts are ejected"
+    balancer.release("host-1")
+    assert balancer.get_available_hosts() == ["host-1"]
+
+
+def test_replace_host() -> None:
+    assert HostBalancer.replace_host("http://tika/rmeta/text?q=1", "localhost:9998") == \
+        "http://localhost:9998/rmeta/text?q=1"
+
+
+def test_get_balancer() -> None:
+    pool = HostBalancerPool()
+    assert pool.get_balancer("tika", {"host": "localhost:9998"}) is None
+    connection = {"hosts": ["tika-1", "tika-2"], "balancing": "least_outstanding", "ejection_duration": 5}
+    balancer = pool.get_balancer("tika", connection)
+    assert balancer is not None
+    assert balancer.hosts == ["tika-1", "tika-2"]
+    assert balancer.strategy == "least_outstanding"
+    assert balancer.ejection_duration == 5
+    assert pool.get_balancer("tika", dict(connection)) is balancer
+    assert pool.get_balancer("other", connection) is not balancer
+    pool.reset()
+    assert pool.get_balancer("tika", connection) is not balancer
@@ -0,0 +1,158 @@
+from typing import ClassVar
+from unittest.mock import Mock, patch
+
+import pytest
+
+from datagrowth.registry import DATAGROWTH_REGISTRY, Tag
+from datagrowth.exceptions import DGHttpError50X
+from datagrowth.resources.http.breakers import CIRCUIT_OPEN_STATUS, CircuitBreaker, is_breaker_failure
+from datagrowth.resources.http.extractors.requests import RequestsExtractor
+from datagrowth.resources.http.pydantic import HttpResource
+from datagrowth.resources.pydantic import Resource
+
+from resources.http.mocks import make_resource, make_response, make_session
+
+
+class BreakerResourceMock(HttpResource):
+
+    NAMESPACE: ClassVar[Tag] = Tag(category="namespace", value="resource_breaker_mock")
+    URI_TEMPLATE: ClassVar[str] = "https://{}/items/{slug}"
+
+
+def test_is_breaker_failure() -> None:
+    assert [is_breaker_failure(status) for status in [200, 404, 429, 496, 500, 502, 503, 504, 601, None]] == \
+        [False, False, False, True, True, True, True, True, False, False]
+
+
+@patch("datagrowth.resources.http.breakers.monotonic")
+def test_circuit_breaker(monotonic_mock) -> None:
+    monotonic_mock.return_value = 100.0
+    breaker = CircuitBreaker(3, cooldown=10)
+    # Successes reset the consecutive failures
+    for failed in [True, True, False, True, True]:
+        acquired = breaker.acquire()
+        assert acquired == CircuitBreaker.CLOSED
+        breaker.release(acquired, failed=failed)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 2
+    # The breaker opens at the threshold and fails requests until the cooldown passes
+    acquired = breaker.acquire()
+    assert acquired == CircuitBreaker.CLOSED
+    breaker.release(acquired, failed=True)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.acquire() is None
+    monotonic_mock.return_value = 105.0
+    assert breaker.get_info() == {
+        "state": CircuitBreaker.OPEN,
+        "failures": 3,
+        "retry_in": 5.0,
+        "outstanding_probes": 0,
+        "trips": 1,
+    }
+    # After the cooldown a single probe gets allowed and a failed probe opens the breaker again
+    monotonic_mock.return_value = 110.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    acquired = breaker.acquire()
+    assert acquired == CircuitBreaker.HALF_OPEN
+    assert breaker.acquire() is None, "Expected only one probe at the same time"
+    breaker.release(acquired, failed=True)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.get_info()["trips"] == 2
+    # A successful probe closes the breaker
+    monotonic_mock.return_value = 120.0
+    acquired = breaker.acquire()
+    assert acquired == CircuitBreaker.HALF_OPEN
+    breaker.release(acquired, failed=False)
+    assert breaker.get_info() == {
+        "state": CircuitBreaker.CLOSED,
+        "failures": 0,
+        "retry_in": 0.0,
+        "outstanding_probes": 0,
+        "trips": 2,
+    }
+
+
+@patch("datagrowth.resources.http.breakers.monotonic")
+def test_circuit_breaker_probes(monotonic_mock) -> None:
+    monotonic_mock.return_value = 100.0
+    breaker = CircuitBreaker(1, cooldown=10, probes=2)
+    breaker.release(CircuitBreaker.CLOSED, failed=True)
+    monotonic_mock.return_value = 110.0
+    acquired = [breaker.acquire() for _ in range(3)]
+    assert acquired == [CircuitBreaker.HALF_OPEN, CircuitBreaker.HALF_OPEN, None]
+    breaker.release(CircuitBreaker.HALF_OPEN, failed=False)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.acquire() == CircuitBreaker.CLOSED
+
+
+@patch("datagrowth.resources.http.breakers.monotonic")
+def test_circuit_breaker_release_after_cooldown(monotonic_mock) -> None:
+    monotonic_mock.return_value = 100.0
+    breaker = CircuitBreaker(1, cooldown=10)
+    slow_request = breaker.acquire()
+    assert slow_request == CircuitBreaker.CLOSED
+    breaker.release(CircuitBreaker.CLOSED, failed=True)
+    # A request that got allowed before the breaker opened isn't a probe when it finishes during the half open state
+    monotonic_mock.return_value = 110.0
+    probe = breaker.acquire()
+    assert probe == CircuitBreaker.HALF_OPEN
+    breaker.release(slow_request, failed=True)
+    assert breaker.get_info()["outstanding_probes"] == 1
+    assert breaker.get_info()["trips"] == 1
+    assert breaker.acquire() is None, "Expected the probe to keep its slot"
+    breaker.release(probe, failed=False)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.fixture
+def session() -> Mock:
+    return make_session()
+
+
+@pytest.fixture
+def extractor(session: Mock) -> RequestsExtractor:
+    extractor = DATAGROWTH_REGISTRY.get_extractor(RequestsExtractor.tag)
+    assert isinstance(extractor, RequestsExtractor)
+    extractor.set_session(session)
+    extractor.config.update({
+        "backoff_delays": [0, 0, 0, 0],
+        "user_agent": "DataGrowth (test)",
+        "circuit_breaker_threshold": 3,
+        "circuit_breaker_cooldown": 60,
+    })
+    return extractor
+
+
+def test_extract_fails_fast_when_breaker_opens(extractor: RequestsExtractor, session: Mock) -> None:
+    session.send.return_value = make_response(503)
+    # The breaker opens during retries and stops the remaining retries
+    with pytest.raises(DGHttpError50X) as exc_info:
+        make_resource(BreakerResourceMock, extractor).extract("get", "down.example.com", slug="first")
+    assert session.send.call_count == 3
+    assert exc_info.value.resource.status == CIRCUIT_OPEN_STATUS
+    # Later extractions for the host don't send anything
+    session.send.reset_mock()
+    signature = make_resource(BreakerResourceMock, extractor).prepare_inputs("get", "down.example.com", slug="second")
+    resource = extractor.extract(signature)
+    assert isinstance(resource, Resource)
+    assert resource.status == CIRCUIT_OPEN_STATUS
+    assert resource.result is not None
+    assert resource.result.errors == "Circuit breaker is open for down.example.com"
+    session.send.assert_not_called()
+    # Other hosts have their own breaker
+    session.send.return_value = make_response(200)
+    assert make_resource(BreakerResourceMock, extractor).extract("get", "up.example.com", slug="first").status == 200
+    info = extractor.get_breaker_info()
+    assert info["down.example.com"]["state"] == CircuitBreaker.OPEN
+    assert info["down.example.com"]["trips"] == 1
+    assert info["up.example.com"]["state"] == CircuitBreaker.CLOSED
+
+
+def test_extract_without_breaker(extractor: RequestsExtractor, session: Mock) -> None:
+    extractor.config.update({"circuit_breaker_threshold": None})
+    session.send.return_value = make_response(503)
+    with pytest.raises(DGHttpError50X) as exc_info:
+        make_resource(BreakerResourceMock, extractor).extract("get", "down.example.com", slug="first")
+    assert exc_info.value.resource.status == 503
+    assert session.send.call_count == 5
+    assert extractor.get_breaker_info() == {}
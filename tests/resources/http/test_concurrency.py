@@ -0,0 +1,28 @@
+import asyncio
+
+from datagrowth.resources.http.concurrency import HostConcurrencyLimiter
+
+
+def test_limit_per_host() -> None:
+    limiter = HostConcurrencyLimiter()
+    with limiter.limit("https://example.com/path", 2):
+        semaphore = limiter.semaphores["https://example.com"]
+        # Requests with another limit for the same host share the slots of the first limit
+        with limiter.limit("https://example.com/other", 4):
+            assert limiter.semaphores == {"https://example.com": semaphore}
+            assert not semaphore.acquire(blocking=False)
+    with limiter.limit("https://example.org/path", None):
+        assert "https://example.org" not in limiter.semaphores
+
+
+def test_alimit_per_host() -> None:
+    limiter = HostConcurrencyLimiter()
+
+    async def main() -> None:
+        async with limiter.alimit("https://example.com/path", 2):
+            semaphores = limiter.async_semaphores[asyncio.get_running_loop()]
+            async with limiter.alimit("https://example.com/other", 4):
+                assert list(semaphores) == ["https://example.com"]
+                assert semaphores["https://example.com"].locked()
+
+    asyncio.run(main())
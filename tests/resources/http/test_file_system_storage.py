@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import ClassVar
+from typing import ClassVar, cast
 from unittest.mock import Mock
 from pathlib import Path
 
@@ -8,11 +8,14 @@ import pytest
 import requests
 from requests.models import Response
 from requests.structures import CaseInsensitiveDict
+from pydantic import ValidationError
 
-from datagrowth.registry import Tag
+from datagrowth.registry import DATAGROWTH_REGISTRY, Tag
+from datagrowth.exceptions import DGHttpError40X
 from datagrowth.resources.http.extractors.requests import RequestsExtractor
 from datagrowth.resources.http.pydantic import HttpResource
 from datagrowth.resources.http.signature import HttpMode
+from datagrowth.resources.pydantic import Resource
 from datagrowth.resources.storage.file_system import FileSystemStorage
 
 
@@ -57,6 +60,8 @@ def mocked_session() -> Mock:
 @pytest.fixture
 def resource(mocked_session: Mock) -> HttpResourceMock:
     resource = HttpResourceMock()
+    resource.set_storage(DATAGROWTH_REGISTRY.get_storage(FileSystemStorage.tag))
+    resource.set_extractor(DATAGROWTH_REGISTRY.get_extractor(RequestsExtractor.tag))
     assert isinstance(resource.extractor, RequestsExtractor)
     resource.extractor.set_session(mocked_session)
     resource.extractor.config.update({
@@ -280,3 +285,101 @@ def test_storage_read_rejects_reserved_data_json(resource: HttpResourceMock, moc
     assert extracted.signature is not None
     with pytest.raises(ValueError, match="reserved"):
         resource.storage.read(extracted.signature, "data.json")
+
+
+# ==============================
+# extract_many
+# ==============================
+
+
+def respond_by_slug(request: requests.PreparedRequest, **kwargs: object) -> Response:
+    assert request.url is not None
+    if "/missing?" in request.url:
+        return make_response(404, "{\"ok\": false}")
+    return make_response(200, "{\"url\": \"" + request.url.split("?")[0] + "\"}")
+
+
+def test_extract_many_keeps_order_of_inputs(resource: HttpResourceMock, mocked_session: Mock, tmp_path: Path) -> None:  # noqa: E501
+    mocked_session.send.side_effect = respond_by_slug
+    configure_storage(resource, root=tmp_path)
+
+    outcomes = resource.extract_many([
+        (("get", "books",), {"slug": "python", "page": "1"},),
+        (("delete", "books",), {"slug": "python", "page": "1"},),
+        resource.validate_inputs("get", "authors", slug="guido", page="1"),
+        (("get", "books",), {"slug": "missing", "page": "1"},),
+    ], concurrency=4)
+
+    assert len(outcomes) == 4
+    first, invalid, second, missing = outcomes
+    assert isinstance(first, HttpResourceMock)
+    assert first.content == ("application/json", {"url": "https://example.com/books/python"})
+    assert isinstance(invalid, ValidationError)
+    assert isinstance(second, HttpResourceMock)
+    assert second.content == ("application/json", {"url": "https://example.com/authors/guido"})
+    assert isinstance(missing, DGHttpError40X)
+    assert mocked_session.send.call_count == 3
+    for extracted in [first, second]:
+        assert extracted.signature is not None
+        assert (tmp_path / "data" / "httpresourcemock" / str(extracted.signature.hash) / "data.json").exists()
+
+
+def test_extract_many_extracts_identical_inputs_once(resource: HttpResourceMock, mocked_session: Mock, tmp_path: Path) -> None:  # noqa: E501
+    mocked_session.send.side_effect = respond_by_slug
+    configure_storage(resource, root=tmp_path)
+
+    outcomes = resource.extract_many([
+        (("get", "books",), {"slug": "python", "page": str(page)},)
+        for page in [1, 2, 1, 1]
+    ], concurrency=2)
+
+    assert mocked_session.send.call_count == 2
+    assert all(isinstance(outcome, HttpResourceMock) for outcome in outcomes)
+    first, second, third, fourth = cast(list[HttpResourceMock], outcomes)
+    assert first is not third and third is not fourth
+    assert first.signature is not None and third.signature is not None and second.signature is not None
+    assert first.signature.hash == third.signature.hash
+    assert first.signature.hash != second.signature.hash
+    assert third.content == first.content
+
+
+def test_extract_many_loads_stored_resources(resource: HttpResourceMock, mocked_session: Mock, tmp_path: Path) -> None:  # noqa: E501
+    mocked_session.send.side_effect = respond_by_slug
+    configure_storage(resource, root=tmp_path)
+    stored = resource.extract("get", "books", slug="python", page="1")
+    stored.close()
+    mocked_session.send.reset_mock()
+
+    outcomes = resource.extract_many([
+        (("get", "books",), {"slug": "python", "page": "1"},),
+        (("get", "books",), {"slug": "django", "page": "1"},),
+    ])
+
+    assert mocked_session.send.call_count == 1
+    loaded, extracted = cast(list[HttpResourceMock], outcomes)
+    assert loaded.signature is not None and stored.signature is not None
+    assert loaded.signature.hash == stored.signature.hash
+    assert loaded.result == stored.result
+    assert extracted.content == ("application/json", {"url": "https://example.com/books/django"})
+
+
+def test_storage_save_many_and_load_many(resource: HttpResourceMock, mocked_session: Mock, tmp_path: Path) -> None:  # noqa: E501
+    mocked_session.send.side_effect = respond_by_slug
+    configure_storage(resource, root=tmp_path)
+    assert isinstance(resource.storage, FileSystemStorage)
+    resources = [resource.extract("get", "books", slug=slug, page="1") for slug in ["python", "django"]]
+
+    signatures = resource.storage.save_many(resources)
+    unknown = resource.prepare_inputs("get", "books", slug="unknown", page="1")
+    loaded = resource.storage.load_many([*signatures, unknown])
+
+    assert len(loaded) == 3
+    assert loaded[2] is None
+    for original, stored in zip(resources, loaded[:2]):
+        assert isinstance(stored, Resource) and stored.signature is not None and original.signature is not None
+        assert stored.signature.hash == original.signature.hash
+        assert stored.result == original.result
+
+    configure_storage(resource, root=tmp_path, allow_load=False)
+    with pytest.raises(PermissionError, match="allow_load=false"):
+        resource.storage.load_many(signatures)
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import asyncio
+from typing import Any, ClassVar
+
+import pytest
+
+from datagrowth.registry import DATAGROWTH_REGISTRY, Tag
+from datagrowth.exceptions import DGHttpError50X
+from datagrowth.resources.http.breakers import CIRCUIT_OPEN_STATUS
+from datagrowth.resources.http.extractors.httpx import HttpxExtractor
+from datagrowth.resources.http.extractors.requests import RequestsExtractor
+from datagrowth.resources.http.pydantic import HttpResource
+from datagrowth.resources.http.sessions import DATAGROWTH_ASYNC_CLIENT_POOL
+from datagrowth.resources.http.signature import HttpMode
+from datagrowth.resources.pydantic import Resource
+
+from resources.http.mocks import make_resource, make_response, make_session
+
+
+pytest.importorskip("httpx")
+
+
+class AsyncHttpResourceMock(HttpResource):
+
+    NAMESPACE: ClassVar[Tag] = Tag(category="namespace", value="resource_async_http_mock")
+    EXTRACTOR: ClassVar[Tag | None] = HttpxExtractor.tag
+    URI_TEMPLATE: ClassVar[str] = "http://{}/items/{slug}"
+    HEADERS: ClassVar[dict[str, str]] = {
+        "Accept": "application/json"
+    }
+    MODE: ClassVar[HttpMode] = HttpMode.JSON
+
+
+class MockAsyncServer:
+    """
+    A minimal HTTP/1.1 server on the running event loop that answers with JSON describing the request.
+    Statuses can be queued to answer the next requests with.
+    """
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.statuses: list[int] = []
+        self.requests: list[tuple[str, str, bytes]] = []
+        self.connections = 0
+        self.server: asyncio.Server | None = None
+
+    @property
+    def host(self) -> str:
+        assert self.server is not None
+        return "127.0.0.1:{}".format(self.server.sockets[0].getsockname()[1])
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("ascii").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    key, value = line.decode("latin-1").split(":", 1)
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests.append((method, path, body,))
+                await asyncio.sleep(self.delay)
+                status = self.statuses.pop(0) if self.statuses else 200
+                content = json.dumps({"method": method, "path": path}).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} Status\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n\r\n".encode("ascii") + content
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def __aenter__(self) -> MockAsyncServer:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await DATAGROWTH_ASYNC_CLIENT_POOL.aclose()
+        assert self.server is not None
+        self.server.close()
+        await self.server.wait_closed()
+
+
+@pytest.fixture
+def extractor() -> HttpxExtractor:
+    extractor = DATAGROWTH_REGISTRY.get_extractor(HttpxExtractor.tag)
+    assert isinstance(extractor, HttpxExtractor)
+    extractor.config.update({
+        "backoff_delays": [],
+        "user_agent": "DataGrowth (test)",
+    })
+    return extractor
+
+
+def test_aextract(extractor: HttpxExtractor) -> None:
+    async def main() -> tuple[AsyncHttpResourceMock, MockAsyncServer]:
+        async with MockAsyncServer() as server:
+            resource = await make_resource(AsyncHttpResourceMock, extractor).aextract("get", server.host, slug="first")
+            return resource, server
+
+    resource, server = asyncio.run(main())
+    assert resource.status == 200
+    assert resource.success
+    assert resource.content == ("application/json", {"method": "GET", "path": "/items/first"})
+    assert resource.signature is not None
+    assert resource.signature.url.endswith("/items/first")
+    assert server.requests == [("GET", "/items/first", b"",)]
+
+
+def test_aextract_post(extractor: HttpxExtractor) -> None:
+    async def main() -> MockAsyncServer:
+        async with MockAsyncServer() as server:
+            resource = make_resource(AsyncHttpResourceMock, extractor)
+            await resource.aextract("post", server.host, slug="new", query="test")
+            return server
+
+    server = asyncio.run(main())
+    method, path, body = server.requests[0]
+    assert method == "POST"
+    assert json.loads(body) == {"query": "test"}
+
+
+def test_aextract_shares_connections(extractor: HttpxExtractor) -> None:
+    async def main() -> tuple[list[AsyncHttpResourceMock], MockAsyncServer]:
+        async with MockAsyncServer(delay=0.05) as server:
+            # Sequential extractions reuse the connection of the pooled client
+            for slug in ["first", "second", "third"]:
+                await make_resource(AsyncHttpResourceMock, extractor).aextract("get", server.host, slug=slug)
+            assert server.connections == 1
+            # Extractions on the same event loop run concurrently
+            resources = await asyncio.gather(*[
+                make_resource(AsyncHttpResourceMock, extractor).aextract("get", server.host, slug=f"item-{ix}")
+                for ix in range(20)
+            ])
+            return resources, server
+
+    resources, server = asyncio.run(main())
+    assert [resource.content[1]["path"] for resource in resources] == [f"/items/item-{ix}" for ix in range(20)]
+    assert len(server.requests) == 23
+    assert 1 < server.connections <= 11, "Expected concurrent extractions to use multiple pooled connections"
+
+
+def test_aextract_retries(extractor: HttpxExtractor) -> None:
+    extractor.config.update({"backoff_delays": [0]})
+
+    async def main() -> tuple[AsyncHttpResourceMock, MockAsyncServer]:
+        async with MockAsyncServer() as server:
+            server.statuses = [503]
+            resource = await make_resource(AsyncHttpResourceMock, extractor).aextract("get", server.host, slug="retry")
+            return resource, server
+
+    resource, server = asyncio.run(main())
+    assert resource.status == 200
+    assert len(server.requests) == 2
+
+
+def test_aextract_connection_error(extractor: HttpxExtractor) -> None:
+    async def main() -> None:
+        async with MockAsyncServer() as server:
+            host = server.host
+        with pytest.raises(DGHttpError50X):
+            await make_resource(AsyncHttpResourceMock, extractor).aextract("get", host, slug="closed")
+        signature = make_resource(AsyncHttpResourceMock, extractor).prepare_inputs("get", host, slug="closed")
+        resource = await extractor.aextract(signature)
+        assert isinstance(resource, Resource)
+        assert resource.status == 502
+        await DATAGROWTH_ASYNC_CLIENT_POOL.aclose()
+
+    asyncio.run(main())
+
+
+def test_aextract_with_synchronous_extractor() -> None:
+    session = make_session()
+    session.send.return_value = make_response(200, "{\"ok\": true}")
+    extractor = DATAGROWTH_REGISTRY.get_extractor(RequestsExtractor.tag)
+    assert isinstance(extractor, RequestsExtractor)
+    extractor.set_session(session)
+    extractor.config.update({"backoff_delays": [], "user_agent": "DataGrowth (test)"})
+
+    # Extractors without aextract extract in a thread
+    resource = asyncio.run(make_resource(AsyncHttpResourceMock, extractor).aextract("get", "example.com", slug="sync"))
+    assert resource.status == 200
+    assert resource.content == ("application/json", {"ok": True})
+    session.send.assert_called_once()
+
+
+def test_aextract_circuit_breaker(extractor: HttpxExtractor) -> None:
+    extractor.config.update({"circuit_breaker_threshold": 2, "circuit_breaker_cooldown": 60})
+
+    async def main() -> tuple[list[int], MockAsyncServer]:
+        async with MockAsyncServer() as server:
+            server.statuses = [500, 500]
+            statuses = []
+            for slug in ["first", "second", "third"]:
+                resource = make_resource(AsyncHttpResourceMock, extractor)
+                signature = resource.prepare_inputs("get", server.host, slug=slug)
+                extracted = await extractor.aextract(signature)
+                assert isinstance(extracted, Resource)
+                statuses.append(extracted.status)
+            return statuses, server
+
+    statuses, server = asyncio.run(main())
+    assert statuses == [500, 500, CIRCUIT_OPEN_STATUS]
+    assert len(server.requests) == 2
+    assert [info["state"] for info in extractor.get_breaker_info().values()] == ["open"]
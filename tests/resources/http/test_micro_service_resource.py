@@ -5,8 +5,12 @@ from unittest.mock import Mock
 
 import pytest
 import requests
+from requests import Response
+from requests.structures import CaseInsensitiveDict
 
 from datagrowth.configuration import ConfigurationType
+from datagrowth.registry import DATAGROWTH_REGISTRY
+from datagrowth.resources.http.balancers import DATAGROWTH_HOST_BALANCERS
 from datagrowth.resources.http.extractors.requests import RequestsExtractor
 from datagrowth.resources.http.pydantic import MicroServiceResource
 from datagrowth.resources.http.signature import HttpMode, HttpSignature
@@ -29,6 +33,14 @@ class MockMicroDoesNotExistServiceResource(MicroServiceResource):
     MICRO_SERVICE: ClassVar[str | None] = "does_not_exist"
 
 
+def make_response(status_code: int, body: str) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict({"content-type": "application/json"})
+    response._content = body.encode("utf-8")  # noqa: SLF001
+    return response
+
+
 @pytest.fixture
 def mocked_session() -> Mock:
     session = Mock(spec=requests.Session)
@@ -55,6 +67,7 @@ def micro_service_config() -> ConfigurationType:
 @pytest.fixture
 def resource(mocked_session: Mock, micro_service_config: ConfigurationType) -> MockMicroTikaResource:
     resource = MockMicroTikaResource(config=micro_service_config)
+    resource.set_extractor(DATAGROWTH_REGISTRY.get_extractor(RequestsExtractor.tag))
     assert isinstance(resource.extractor, RequestsExtractor)
     resource.extractor.set_session(mocked_session)
     resource.extractor.config.update({
@@ -149,3 +162,59 @@ def test_prepare_inputs_kwarg_overrides_connection_fields(resource: MockMicroTik
     signature = resource.prepare_inputs("get", protocol="https", host="tika.example.com", path="/custom")
 
     assert signature.url == "https://tika.example.com/custom"
+
+
+# ==============================
+# Multiple hosts
+# ==============================
+
+
+def test_extract_balances_hosts(resource: MockMicroTikaResource, mocked_session: Mock,
+                                micro_service_config: ConfigurationType) -> None:
+    connections = {
+        "tika": {
+            "protocol": "http",
+            "hosts": ["tika-1:9998", "tika-2:9998"],
+            "path": "/rmeta/text",
+        },
+    }
+    micro_service_config.update({"connections": connections})
+    assert resource.extractor is not None
+    resource.extractor.config.update({"connections": connections})
+    DATAGROWTH_HOST_BALANCERS.reset()
+    mocked_session.send.side_effect = lambda *args, **kwargs: make_response(200, "{\"ok\": true}")
+    signature = resource.prepare_inputs("get")
+    assert signature.url == "http://tika/rmeta/text", "Expected the service name to replace the host in signatures"
+    assert signature.uri == "tika/rmeta/text"
+
+    for _ in range(2):
+        resource.extract("get")
+    # Signatures that went through serialization still get balanced
+    resource.extractor.extract(HttpSignature(**signature.model_dump()))
+    # Hosts given as keyword arguments don't get balanced
+    resource.extract("get", host="tika.example.com")
+    urls = [call.args[0].url for call in mocked_session.send.call_args_list]
+    assert urls == [
+        "http://tika-1:9998/rmeta/text",
+        "http://tika-2:9998/rmeta/text",
+        "http://tika-1:9998/rmeta/text",
+        "http://tika.example.com/rmeta/text",
+    ]
+
+
+def test_shared_extractor_connections() -> None:
+    # Resources share extractors with the connections from their configuration
+    extractors = []
+    for hosts in [["tika-1:9998"], ["tika-2:9998"], ["tika-2:9998"]]:
+        config = ConfigurationType(namespace=["micro_service", "http_resource", "global"])
+        config.update({
+            "connections": {
+                "tika": {"protocol": "http", "hosts": hosts, "path": "/rmeta/text"},
+            },
+        })
+        extractor = MockMicroTikaResource(config=config).extractor
+        assert isinstance(extractor, RequestsExtractor)
+        assert extractor.config.connections == config.connections
+        extractors.append(extractor)
+    assert extractors[0] is not extractors[1]
+    assert extractors[1] is extractors[2]
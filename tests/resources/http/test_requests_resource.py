@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import json
 import base64
+from io import BytesIO
 from typing import Any, ClassVar
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from pathlib import Path
 
 import pytest
@@ -13,12 +14,15 @@ from requests.structures import CaseInsensitiveDict
 
 from pydantic import ValidationError
 
-from datagrowth.registry import Tag
+from datagrowth.registry import DATAGROWTH_REGISTRY, Tag
 from datagrowth.exceptions import DGHttpError40X, DGHttpError50X
 from datagrowth.resources.http.extractors.requests import RequestsExtractor
 from datagrowth.resources.http.pydantic import HttpResource
 from datagrowth.resources.http.signature import HttpAuth, HttpMode, HttpSignature
+from datagrowth.resources.http.streaming import BODY_TOO_LARGE_STATUS
 from datagrowth.resources.pydantic import Result
+from datagrowth.resources.storage.file_system import FileSystemStorage
+from datagrowth.resources.singleflight import DATAGROWTH_SINGLE_FLIGHT
 
 
 class HttpResourceMock(HttpResource):
@@ -86,6 +90,7 @@ def mocked_session() -> Mock:
 @pytest.fixture
 def resource(mocked_session: Mock) -> HttpResourceMock:
     resource = HttpResourceMock()
+    resource.set_extractor(DATAGROWTH_REGISTRY.get_extractor(RequestsExtractor.tag))
     assert isinstance(resource.extractor, RequestsExtractor)
     resource.extractor.set_session(mocked_session)
     resource.extractor.config.update({
@@ -102,6 +107,8 @@ def resource(mocked_session: Mock) -> HttpResourceMock:
 @pytest.fixture
 def data_resource(mocked_session: Mock, tmp_path: Path) -> HttpResourceDataMock:
     resource = HttpResourceDataMock()
+    resource.set_storage(DATAGROWTH_REGISTRY.get_storage(FileSystemStorage.tag))
+    resource.set_extractor(DATAGROWTH_REGISTRY.get_extractor(RequestsExtractor.tag))
     assert isinstance(resource.extractor, RequestsExtractor)
     resource.extractor.set_session(mocked_session)
     resource.extractor.config.update({
@@ -174,6 +181,7 @@ def test_prepare_inputs_rejects_invalid_url_placeholders(resource: HttpResourceM
 
 def test_prepare_inputs_includes_auth_but_excludes_it_from_dump(mocked_session: Mock) -> None:
     resource = HttpResourceAuthMock()
+    resource.set_extractor(DATAGROWTH_REGISTRY.get_extractor(RequestsExtractor.tag))
     assert isinstance(resource.extractor, RequestsExtractor)
     resource.extractor.set_session(mocked_session)
     signature = resource.prepare_inputs("get", "books", slug="python", page="2")
@@ -217,6 +225,7 @@ def test_resource_extract_get_uses_requests_extractor(resource: HttpResourceMock
 def test_resource_extract_applies_auth_to_request_not_signature_dump(mocked_session: Mock) -> None:
     mocked_session.send.return_value = make_response(200, "{\"ok\": true}")
     resource = HttpResourceAuthMock()
+    resource.set_extractor(DATAGROWTH_REGISTRY.get_extractor(RequestsExtractor.tag))
     assert isinstance(resource.extractor, RequestsExtractor)
     resource.extractor.set_session(mocked_session)
     resource.extractor.config.update({
@@ -253,6 +262,7 @@ def test_resource_extract_post_sends_json_data(resource: HttpResourceMock, mocke
 def test_resource_extract_data_mode_requires_open_signature(mocked_session: Mock) -> None:
     mocked_session.send.return_value = make_response(200, "{\"ok\": true}")
     resource = HttpResourceDataNoStorageMock()
+    resource.set_extractor(DATAGROWTH_REGISTRY.get_extractor(RequestsExtractor.tag))
     assert isinstance(resource.extractor, RequestsExtractor)
     resource.extractor.set_session(mocked_session)
     resource.extractor.config.update({
@@ -291,6 +301,49 @@ def test_resource_extract_retries_on_retryable_status(resource: HttpResourceMock
     assert extracted_resource.status == 200
     assert mocked_session.send.call_count == 2
 
+
+@patch("datagrowth.resources.http.extractors.requests.sleep")
+def test_resource_extract_retries_after_retry_after_header(sleep_mock: Mock, resource: HttpResourceMock,
+                                                           mocked_session: Mock) -> None:
+    assert isinstance(resource.extractor, RequestsExtractor)
+    resource.extractor.config.update({"backoff_delays": [1, 2], "backoff_jitter": 0})
+    mocked_session.send.side_effect = [
+        make_response(429, "{\"error\": true}", headers={"content-type": "application/json", "Retry-After": "7"}),
+        make_response(503, "{\"error\": true}"),
+        make_response(200, "{\"ok\": true}"),
+    ]
+
+    extracted_resource = resource.extract("get", "books", slug="python", page="1")
+
+    assert extracted_resource.status == 200
+    assert mocked_session.send.call_count == 3
+    assert [call.args[0] for call in sleep_mock.call_args_list] == [7, 2]
+
+
+def test_resource_extract_stream(resource: HttpResourceMock, mocked_session: Mock) -> None:
+    def make_streamed_response(*args: Any, **kwargs: Any) -> Response:
+        assert kwargs["stream"] is True
+        # A response that didn't read its content yet, which streams its body from raw
+        response = Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({"content-type": "application/json"})
+        response.raw = BytesIO(b"{\"ok\": true}")
+        return response
+    mocked_session.send.side_effect = make_streamed_response
+    assert isinstance(resource.extractor, RequestsExtractor)
+    resource.extractor.config.update({"stream": True})
+
+    extracted_resource = resource.extract("get", "books", slug="python", page="1")
+    assert extracted_resource.status == 200
+    assert extracted_resource.content[1] == {"ok": True}
+
+    resource.extractor.config.update({"max_body_size": 5})
+    with pytest.raises(DGHttpError50X) as exc_info:
+        resource.extract("get", "books", slug="python", page="2")
+    assert exc_info.value.resource.status == BODY_TOO_LARGE_STATUS
+    assert exc_info.value.resource.result.errors == "Response body exceeds max_body_size"
+
+
 # ==============================
 # results, success, errors
 # ==============================
@@ -319,6 +372,64 @@ def test_resource_content_parses_body_on_non_success(resource: HttpResourceMock)
     assert data == {"ok": False}
 
 
+def test_resource_extract_single_flight(resource: HttpResourceMock, mocked_session: Mock) -> None:
+    mocked_session.send.return_value = make_response(200, "{\"ok\": true}")
+    extracted_resource = resource.extract("get", "books", slug="python", page="1")
+    assert extracted_resource.signature is not None
+    extracted_resource.content
+
+    # Resources that extract while the same signature is in flight get a copy of the extracted resource
+    def share(key, function, share):
+        return share(extracted_resource), True
+
+    with patch.object(DATAGROWTH_SINGLE_FLIGHT, "do", side_effect=share) as do_mock:
+        shared_resource = HttpResourceMock().extract("get", "books", slug="python", page="1")
+    assert do_mock.call_args.args[0] == (HttpResourceMock, extracted_resource.signature.hash,)
+    assert shared_resource is not extracted_resource
+    assert shared_resource.id == extracted_resource.id
+    assert shared_resource._content_cache is None  # noqa: SLF001
+    assert shared_resource.result is not extracted_resource.result
+    assert shared_resource.result == extracted_resource.result
+    assert shared_resource.signature is not extracted_resource.signature
+    assert shared_resource.metadata is not extracted_resource.metadata
+    # Errors are copied as well, such that every caller raises its own exception with its own resource
+    error = DGHttpError40X("Not found", extracted_resource)
+    shared_error = HttpResourceMock._copy_shared(error)  # noqa: SLF001
+    assert isinstance(shared_error, DGHttpError40X)
+    assert shared_error is not error
+    assert shared_error.resource is not extracted_resource
+    assert shared_error.resource.id == extracted_resource.id
+    # Single flight can be disabled through the configuration
+    with patch.object(DATAGROWTH_SINGLE_FLIGHT, "do") as do_mock:
+        resource.config.update({"single_flight": False})
+        resource.extract("get", "books", slug="python", page="1")
+    do_mock.assert_not_called()
+
+
+def test_resource_content_cache(resource: HttpResourceMock) -> None:
+    resource.config.update({"content_cache": True})
+    resource.status = 200
+    resource.result = Result(content_type="application/json", body="{\"ok\": true}")
+    content_type, data = resource.content
+    assert resource.content[1] is data
+    # Replacing the result invalidates the cache
+    resource.result = resource.result.model_copy(update={"body": "{\"ok\": false}"})
+    assert resource.content[1] == {"ok": False}
+    resource.config.update({"content_read_only": True})
+    with pytest.raises(TypeError):
+        resource.content[1]["ok"] = True
+
+
+def test_resource_content_mutations(resource: HttpResourceMock) -> None:
+    resource.status = 200
+    resource.result = Result(content_type="application/json", body="{\"ok\": true, \"items\": [1]}")
+    # Without content caching every read parses a new copy of the content
+    content_type, data = resource.content
+    data.pop("ok")
+    data["items"].append(2)
+    assert resource.content[1] == {"ok": True, "items": [1]}
+
+
 def test_resource_handle_errors_raises_40x(resource: HttpResourceMock) -> None:
     resource.status = 404
     resource.result = Result(content_type="application/json", body="missing", errors=None)
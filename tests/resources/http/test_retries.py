@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+from datagrowth.configuration import create_config
+from datagrowth.resources.http.retries import RetryPolicy
+
+
+def test_from_config() -> None:
+    policy = RetryPolicy.from_config(create_config("http_resource", {
+        "backoff_delays": [1, 2],
+        "backoff_jitter": 0.5,
+        "backoff_max_delay": 10,
+        "backoff_retry_after": False
+    }))
+    assert policy.delays == [1, 2]
+    assert policy.jitter == 0.5
+    assert policy.max_delay == 10
+    assert policy.retry_after is False
+
+
+def test_should_retry() -> None:
+    policy = RetryPolicy([1, 2])
+    assert policy.should_retry(503, 0)
+    assert policy.should_retry(429, 1)
+    assert not policy.should_retry(429, 2), "Expected no retries after all delays were used"
+    assert not policy.should_retry(200, 0)
+    assert not policy.should_retry(500, 0)
+    assert not policy.should_retry(None, 0)
+    assert not RetryPolicy([]).should_retry(503, 0)
+
+
+def test_parse_retry_after() -> None:
+    assert RetryPolicy.parse_retry_after({"retry-after": "120"}) == 120.0
+    assert RetryPolicy.parse_retry_after({"retry-after": 5}) == 5.0
+    retry_at = datetime.now(tz=timezone.utc) + timedelta(seconds=30)
+    delay = RetryPolicy.parse_retry_after({"retry-after": format_datetime(retry_at, usegmt=True)})
+    assert delay is not None and 28 <= delay <= 30
+    past = datetime.now(tz=timezone.utc) - timedelta(seconds=30)
+    assert RetryPolicy.parse_retry_after({"retry-after": format_datetime(past, usegmt=True)}) == 0.0
+    assert RetryPolicy.parse_retry_after({"retry-after": "soon"}) is None
+    assert RetryPolicy.parse_retry_after({}) is None
+    assert RetryPolicy.parse_retry_after(None) is None
+
+
+def test_get_delay() -> None:
+    policy = RetryPolicy([1, 2], max_delay=30)
+    assert policy.get_delay(0) == 1
+    assert policy.get_delay(1, {"content-type": "application/json"}) == 2
+    # Retry-After headers replace the configured delays, but never exceed the maximum delay
+    assert policy.get_delay(0, {"retry-after": "10"}) == 10
+    assert policy.get_delay(0, {"retry-after": "3600"}) == 30
+    policy.retry_after = False
+    assert policy.get_delay(0, {"retry-after": "10"}) == 1
+
+
+@patch("datagrowth.resources.http.retries.random.uniform", side_effect=lambda low, high: high)
+def test_get_delay_jitter(uniform_mock) -> None:
+    policy = RetryPolicy([2, 4], jitter=0.5, max_delay=5)
+    assert policy.get_delay(0) == 3
+    uniform_mock.assert_called_once_with(0, 1.0)
+    assert policy.get_delay(1) == 5
+    assert RetryPolicy([0], jitter=0.5).get_delay(0) == 0
@@ -0,0 +1,109 @@
+import os
+import asyncio
+from email.message import Message
+from types import SimpleNamespace
+from typing import Iterator
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import extract_cookies_to_jar
+
+from datagrowth.configuration import create_config
+from datagrowth.resources.http.sessions import HttpSessionPool, AsyncHttpClientPool
+
+
+@pytest.fixture
+def pool() -> Iterator[HttpSessionPool]:
+    pool = HttpSessionPool()
+    yield pool
+    pool.clear()
+
+
+def test_get_session_per_host(pool: HttpSessionPool) -> None:
+    session = pool.get_session("https://example.com/path?q=1")
+    assert isinstance(session, requests.Session)
+    assert pool.get_session("https://example.com/other") is session
+    assert pool.get_session("http://example.com/path") is not session
+    assert pool.get_session("https://example.org/path") is not session
+    assert pool.get_session() is not session
+    assert len(pool) == 4
+
+
+def test_get_session_configuration(pool: HttpSessionPool) -> None:
+    session = pool.get_session("https://example.com/", {"session_pool_maxsize": 20})
+    adapter = session.get_adapter("https://example.com/")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 20
+    assert adapter.poolmanager.pools._maxsize == 10
+    assert session.verify is True
+    unverified_config = create_config("http_resource", {
+        "requests_verify": False,
+        "requests_proxies": {"https": "http://localhost:3128"}
+    })
+    unverified_session = pool.get_session("https://example.com/", unverified_config)
+    assert unverified_session is not session
+    assert unverified_session.verify is False
+    assert unverified_session.proxies == {"https": "http://localhost:3128"}
+    assert pool.get_session("https://example.com/", unverified_config) is unverified_session
+
+
+def test_get_session_ignores_cookies(pool: HttpSessionPool) -> None:
+    request = requests.Request("GET", "https://example.com/").prepare()
+    headers = Message()
+    headers["Set-Cookie"] = "sessionid=secret; Path=/"
+    # Requests extracts cookies from the headers of the underlying http.client response
+    response = SimpleNamespace(_original_response=SimpleNamespace(msg=headers))
+    # Unpooled sessions remember cookies for any following requests
+    session = requests.Session()
+    extract_cookies_to_jar(session.cookies, request, response)
+    assert session.cookies.get("sessionid") == "secret"
+    # Pooled sessions get shared between resources and shouldn't remember cookies
+    session = pool.get_session("https://example.com/")
+    extract_cookies_to_jar(session.cookies, request, response)
+    assert not session.cookies
+    session.cookies.set("manual", "1")
+    assert session.cookies.get("manual") == "1", "Expected explicitly set cookies to be kept"
+
+
+def test_get_client_ignores_cookies() -> None:
+    httpx = pytest.importorskip("httpx")
+
+    async def get_cookies() -> dict[str, str]:
+        pool = AsyncHttpClientPool()
+        client = pool.get_client("https://example.com/")
+        request = httpx.Request("GET", "https://example.com/")
+        client.cookies.extract_cookies(httpx.Response(200, headers={"set-cookie": "sessionid=secret"}, request=request))
+        cookies = dict(client.cookies)
+        await pool.aclose()
+        return cookies
+
+    assert asyncio.run(get_cookies()) == {}
+
+
+def test_clear_and_reset(pool: HttpSessionPool) -> None:
+    session = pool.get_session("https://example.com/")
+    pool.clear()
+    assert len(pool) == 0
+    assert pool.get_session("https://example.com/") is not session
+    pool.reset()
+    assert len(pool) == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Forking is not supported on this platform")
+def test_fork_resets_global_pool() -> None:
+    from datagrowth.resources.http.sessions import DATAGROWTH_SESSION_POOL
+    DATAGROWTH_SESSION_POOL.get_session("https://example.com/")
+    assert len(DATAGROWTH_SESSION_POOL)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child process
+        os.close(read_fd)
+        os.write(write_fd, str(len(DATAGROWTH_SESSION_POOL)).encode())
+        os._exit(0)
+    os.close(write_fd)
+    child_size = os.read(read_fd, 16).decode()
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    assert child_size == "0"
+    assert len(DATAGROWTH_SESSION_POOL)
@@ -0,0 +1,59 @@
+import asyncio
+import hashlib
+from typing import AsyncIterator
+
+import pytest
+
+from datagrowth.resources.http.streaming import ResponseBody, BodyTooLarge, read_body, aread_body
+
+
+def test_read_body() -> None:
+    body = read_body([b"data", b" growth"], {})
+    assert not body.is_spilled
+    assert body.content == b"data growth"
+    assert body.size == 11
+
+
+def test_read_body_spill() -> None:
+    body = read_body([b"data", b" growth", b"!"], {}, spill_size=5)
+    assert body.is_spilled
+    assert body.open().read() == b"data growth!"
+    with pytest.raises(AssertionError):
+        body.content
+    body.close()
+    assert body.file is None
+
+
+def test_read_body_hasher() -> None:
+    body = read_body([b"data", b" growth"], {}, spill_size=5, hasher=hashlib.sha256())
+    assert body.hexdigest == hashlib.sha256(b"data growth").hexdigest()
+    body.close()
+    with pytest.raises(AssertionError):
+        read_body([b"data"], {}).hexdigest
+
+
+def test_read_body_max_size() -> None:
+    read_body([b"data", b" growth"], {}, max_size=11)
+    with pytest.raises(BodyTooLarge):
+        read_body([b"data", b" growth"], {}, max_size=10)
+    # Bodies with a Content-Length that is too large are rejected before reading
+    chunks = iter([b"data"])
+    with pytest.raises(BodyTooLarge):
+        read_body(chunks, {"content-length": "11"}, max_size=10)
+    assert next(chunks) == b"data"
+    # Invalid Content-Length headers are ignored
+    body = ResponseBody(max_size=10)
+    body.check_length({"content-length": "invalid"})
+
+
+def test_aread_body() -> None:
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for chunk in [b"data", b" growth"]:
+            yield chunk
+
+    body = asyncio.run(aread_body(chunks(), {}, spill_size=5))
+    assert body.open().read() == b"data growth"
+    body.close()
+    with pytest.raises(BodyTooLarge):
+        asyncio.run(aread_body(chunks(), {}, max_size=5))
@@ -9,7 +9,7 @@ from pydantic import ValidationError
 from requests.models import Response
 from requests.structures import CaseInsensitiveDict
 
-from datagrowth.registry import Tag
+from datagrowth.registry import DATAGROWTH_REGISTRY, Tag
 from datagrowth.resources.http.extractors.requests import RequestsExtractor
 from datagrowth.resources.http.pydantic import URLResource
 from datagrowth.resources.http.signature import HttpMethod, HttpSignature
@@ -38,6 +38,7 @@ def mocked_session() -> Mock:
 @pytest.fixture
 def resource(mocked_session: Mock) -> URLResourceMock:
     resource = URLResourceMock()
+    resource.set_extractor(DATAGROWTH_REGISTRY.get_extractor(RequestsExtractor.tag))
     assert isinstance(resource.extractor, RequestsExtractor)
     resource.extractor.set_session(mocked_session)
     resource.extractor.config.update({
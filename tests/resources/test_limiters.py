@@ -0,0 +1,61 @@
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from datagrowth.configuration import create_config
+from datagrowth.resources.limiters import (TokenBucketLimiter, FileTokenBucketLimiter, DATAGROWTH_RATE_LIMITER,
+                                           get_rate_limiter)
+
+
+def test_take_token() -> None:
+    bucket, wait = TokenBucketLimiter.take_token(None, 100.0, rate=1.0, burst=2)
+    assert bucket == (1.0, 100.0,)
+    assert wait == 0
+    bucket, wait = TokenBucketLimiter.take_token(bucket, 100.0, rate=1.0, burst=2)
+    assert wait == 0
+    # An empty bucket reserves tokens from the future
+    bucket, wait = TokenBucketLimiter.take_token(bucket, 100.0, rate=1.0, burst=2)
+    assert wait == 1.0
+    bucket, wait = TokenBucketLimiter.take_token(bucket, 100.0, rate=1.0, burst=2)
+    assert wait == 2.0
+    # Buckets refill over time, but never beyond the burst size
+    bucket, wait = TokenBucketLimiter.take_token(bucket, 110.0, rate=1.0, burst=2)
+    assert bucket == (1.0, 110.0,)
+    assert wait == 0
+
+
+@patch("datagrowth.resources.limiters.sleep")
+@patch("datagrowth.resources.limiters.time", return_value=100.0)
+def test_acquire(time_mock: Mock, sleep_mock: Mock) -> None:
+    limiter = TokenBucketLimiter()
+    waits = [limiter.acquire("example.com", rate=4.0, burst=2) for _ in range(4)]
+    assert waits == [0, 0, 0.25, 0.5]
+    assert sleep_mock.call_count == 2
+    # Buckets are kept per key
+    assert limiter.acquire("example.org", rate=4.0, burst=2) == 0
+    time_mock.return_value = 101.0
+    assert limiter.acquire("example.com", rate=4.0, burst=2) == 0
+
+
+@patch("datagrowth.resources.limiters.sleep")
+@patch("datagrowth.resources.limiters.time", return_value=100.0)
+def test_file_limiter_shares_buckets(time_mock: Mock, sleep_mock: Mock, tmp_path: Path) -> None:
+    first = FileTokenBucketLimiter(tmp_path)
+    second = FileTokenBucketLimiter(tmp_path)
+    assert first.acquire("example.com", rate=1.0, burst=2) == 0
+    assert second.acquire("example.com", rate=1.0, burst=2) == 0
+    assert first.acquire("example.com", rate=1.0, burst=2) == 1.0
+    assert second.acquire("example.com", rate=1.0, burst=2) == 2.0
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_get_rate_limiter(tmp_path: Path) -> None:
+    assert get_rate_limiter(create_config("global", {})) is DATAGROWTH_RATE_LIMITER
+    file_config = create_config("global", {"rate_limit_backend": "file", "rate_limit_directory": str(tmp_path)})
+    file_limiter = get_rate_limiter(file_config)
+    assert isinstance(file_limiter, FileTokenBucketLimiter)
+    assert file_limiter.directory == tmp_path
+    assert get_rate_limiter(file_config) is file_limiter
+    with pytest.raises(ValueError):
+        get_rate_limiter(create_config("global", {"rate_limit_backend": "redis"}))
@@ -1,7 +1,9 @@
 from datagrowth.configuration import ConfigurationProperty, ConfigurationType
 from datagrowth.registry import DATAGROWTH_REGISTRY, Tag
 from datagrowth.resources.pydantic import Resource
+from datagrowth.resources.protocols import ResourceExtractorProtocol, ResourceStorageProtocol
 from datagrowth.signatures import Signature
+from typing import cast
 from unittest.mock import patch
 
 
@@ -43,11 +45,40 @@ def test_resource_without_storage_or_extractor_tag_keeps_none() -> None:
 
 def test_resource_post_init_resolves_storage_and_extractor_from_registry() -> None:
     with (
-        patch.object(DATAGROWTH_REGISTRY, "get_storage", return_value=MockStorage(config={})) as get_storage,
-        patch.object(DATAGROWTH_REGISTRY, "get_extractor", return_value=MockExtractor(config={})) as get_extractor,
+        patch.object(DATAGROWTH_REGISTRY, "get_shared_storage", return_value=MockStorage(config={})) as get_storage,
+        patch.object(DATAGROWTH_REGISTRY, "get_shared_extractor",
+                     return_value=MockExtractor(config={})) as get_extractor,
     ):
         resource = MockResource()
         assert isinstance(resource.storage, MockStorage)
         assert isinstance(resource.extractor, MockExtractor)
         get_storage.assert_called_once_with(MockResource.STORAGE)
         get_extractor.assert_called_once_with(MockResource.EXTRACTOR)
+
+
+def test_resource_shares_storage_and_extractor() -> None:
+    # The mocks only implement the parts of the storage and extractor protocols that resources use
+    storage_tag = DATAGROWTH_REGISTRY.register_storage(
+        "storage:mock-resource-config", cast(type[ResourceStorageProtocol], MockStorage)
+    )
+    extractor_tag = DATAGROWTH_REGISTRY.register_extractor(
+        "extractor:mock-resource-config", cast(type[ResourceExtractorProtocol], MockExtractor)
+    )
+    try:
+        first = MockResource()
+        second = MockResource()
+        assert isinstance(first.storage, MockStorage)
+        assert isinstance(first.extractor, MockExtractor)
+        assert second.storage is first.storage
+        assert second.extractor is first.extractor
+        # Resources can use their own storage and extractor
+        storage = cast(ResourceStorageProtocol, MockStorage(config={}))
+        extractor = cast(ResourceExtractorProtocol, MockExtractor(config={}))
+        second.set_storage(storage)
+        second.set_extractor(extractor)
+        assert second.storage is storage
+        assert second.extractor is extractor
+        assert MockResource().extractor is first.extractor
+    finally:
+        DATAGROWTH_REGISTRY.unregister_storage(storage_tag)
+        DATAGROWTH_REGISTRY.unregister_extractor(extractor_tag)
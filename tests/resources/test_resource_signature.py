@@ -145,3 +145,14 @@ def test_resource_inequality_by_id_when_no_signatures(resource_tag: Tag) -> None
     r1 = Resource(type=resource_tag)
     r2 = Resource(type=resource_tag)
     assert r1 != r2
+
+
+def test_signature_hash_algorithm() -> None:
+    s1 = Signature(uri="example://resource", data={"a": 1})
+    s2 = Signature(uri="example://resource", data={"a": 1}, hash_algorithm="blake2b")
+    assert s1.hash_algorithm == "sha256"
+    assert s2.hash_algorithm == "blake2b"
+    assert s1.hash != s2.hash
+    assert Signature(**s2.model_dump(mode="json")).hash == s2.hash
+    with pytest.raises(ValidationError):
+        Signature(uri="example://resource", hash_algorithm="md5")
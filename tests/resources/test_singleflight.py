@@ -0,0 +1,231 @@
+import asyncio
+import threading
+from copy import copy
+from time import sleep
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from datagrowth.resources.singleflight import SingleFlight
+
+
+class CountingEvent(threading.Event):
+
+    waiters = 0
+
+    def wait(self, timeout: float | None = None) -> bool:
+        CountingEvent.waiters += 1
+        return super().wait(timeout)
+
+
+def wait_for_waiters(count: int) -> None:
+    for _ in range(1000):
+        if CountingEvent.waiters >= count:
+            return
+        sleep(0.001)
+    pytest.fail("Expected followers to wait for the first caller")
+
+
+@patch("datagrowth.resources.singleflight.Event", CountingEvent)
+def test_do() -> None:
+    CountingEvent.waiters = 0
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    outcomes = []
+
+    def work() -> str:
+        calls.append(threading.current_thread().name)
+        release.wait()
+        return "result"
+
+    def call() -> None:
+        outcomes.append(single_flight.do("key", work))
+
+    leader = threading.Thread(target=call, name="leader")
+    leader.start()
+    while not calls:
+        sleep(0.001)
+    followers = [threading.Thread(target=call, name=f"follower-{ix}") for ix in range(3)]
+    for follower in followers:
+        follower.start()
+    wait_for_waiters(3)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+    assert calls == ["leader"]
+    assert sorted(outcomes) == [("result", False,), ("result", True,), ("result", True,), ("result", True,)]
+    assert single_flight.flights == {}
+    # Finished work isn't remembered
+    assert single_flight.do("key", lambda: "other") == ("other", False,)
+
+
+@patch("datagrowth.resources.singleflight.Event", CountingEvent)
+def test_do_exception() -> None:
+    CountingEvent.waiters = 0
+    single_flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def work() -> None:
+        release.wait()
+        raise ValueError("failed")
+
+    def call() -> None:
+        try:
+            single_flight.do("key", work)
+        except ValueError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    wait_for_waiters(1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 2
+    assert errors[0] is errors[1]
+    assert single_flight.flights == {}
+
+
+def test_do_reentrant() -> None:
+    single_flight = SingleFlight()
+
+    def work() -> str:
+        # A call for the same key from within the work doesn't wait for itself
+        inner, inner_shared = single_flight.do("key", lambda: "inner")
+        assert not inner_shared
+        return inner + "-outer"
+
+    assert single_flight.do("key", work) == ("inner-outer", False,)
+    assert single_flight.flights == {}
+
+
+def test_ado() -> None:
+    single_flight = SingleFlight()
+    calls = []
+
+    async def main() -> tuple[Any, ...]:
+        release = asyncio.Event()
+
+        async def work() -> str:
+            calls.append(None)
+            await release.wait()
+            return "result"
+
+        outcomes = asyncio.gather(
+            single_flight.ado("key", work),
+            single_flight.ado("key", work),
+            single_flight.ado("other", work),
+        )
+        await asyncio.sleep(0)
+        release.set()
+        return await outcomes
+
+    results = asyncio.run(main())
+    assert results == [("result", False,), ("result", True,), ("result", False,)]
+    assert len(calls) == 2
+
+
+def test_ado_reentrant() -> None:
+    single_flight = SingleFlight()
+
+    async def inner() -> str:
+        return "inner"
+
+    async def work() -> str:
+        result, is_shared = await single_flight.ado("key", inner)
+        assert not is_shared
+        return result + "-outer"
+
+    async def main() -> tuple[Any, bool]:
+        return await asyncio.wait_for(single_flight.ado("key", work), timeout=5)
+
+    assert asyncio.run(main()) == ("inner-outer", False,)
+
+
+def test_ado_exception() -> None:
+    single_flight = SingleFlight()
+
+    async def work() -> None:
+        await asyncio.sleep(0)
+        raise ValueError("failed")
+
+    async def main() -> tuple[Any, ...]:
+        return await asyncio.gather(
+            single_flight.ado("key", work),
+            single_flight.ado("key", work),
+            return_exceptions=True
+        )
+
+    first, second = asyncio.run(main())
+    assert isinstance(first, ValueError)
+    assert first is second
+
+
+@patch("datagrowth.resources.singleflight.Event", CountingEvent)
+def test_do_share() -> None:
+    CountingEvent.waiters = 0
+    single_flight = SingleFlight()
+    release = threading.Event()
+    outcomes = []
+
+    def work() -> list:
+        release.wait()
+        if outcomes:
+            raise ValueError("failed")
+        return ["result"]
+
+    def call() -> None:
+        try:
+            outcomes.append(single_flight.do("key", work, share=copy))
+        except ValueError as exc:
+            outcomes.append(exc)
+
+    # Followers receive the copy that the share function returns
+    for expected_waiters in [1, 2]:
+        threads = [threading.Thread(target=call) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        wait_for_waiters(expected_waiters)
+        release.set()
+        for thread in threads:
+            thread.join()
+        release.clear()
+    (first, first_shared), (second, second_shared) = sorted(outcomes[:2], key=lambda outcome: outcome[1])
+    assert first == second == ["result"]
+    assert first is not second
+    assert not first_shared and second_shared
+    first_error, second_error = outcomes[2:]
+    assert isinstance(first_error, ValueError) and isinstance(second_error, ValueError)
+    assert first_error is not second_error
+
+
+def test_ado_share() -> None:
+    single_flight = SingleFlight()
+
+    async def work() -> list:
+        await asyncio.sleep(0)
+        return ["result"]
+
+    async def fail() -> None:
+        await asyncio.sleep(0)
+        raise ValueError("failed")
+
+    async def main() -> tuple[Any, ...]:
+        return await asyncio.gather(
+            single_flight.ado("key", work, share=copy),
+            single_flight.ado("key", work, share=copy),
+            single_flight.ado("error", fail, share=copy),
+            single_flight.ado("error", fail, share=copy),
+            return_exceptions=True
+        )
+
+    (first, first_shared), (second, second_shared), first_error, second_error = asyncio.run(main())
+    assert first == second == ["result"]
+    assert first is not second
+    assert not first_shared and second_shared
+    assert isinstance(first_error, ValueError) and isinstance(second_error, ValueError)
+    assert first_error is not second_error
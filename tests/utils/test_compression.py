@@ -0,0 +1,32 @@
+from unittest import TestCase, skipIf
+
+from datagrowth.utils.compression import compress, decompress, detect_compression, zstandard
+
+
+class TestCompression(TestCase):
+
+    data = "{\"text\": \"Some repetitive text. Some repetitive text. Some repetitive text.\"}".encode("utf-8")
+
+    def test_compress_zlib(self):
+        compressed = compress(self.data, "zlib")
+        self.assertLess(len(compressed), len(self.data))
+        self.assertEqual(detect_compression(compressed), "zlib")
+        self.assertEqual(decompress(compressed), self.data)
+
+    def test_compress_lzma(self):
+        compressed = compress(self.data, "lzma")
+        self.assertEqual(detect_compression(compressed), "lzma")
+        self.assertEqual(decompress(compressed), self.data)
+
+    @skipIf(zstandard is None, "The zstandard package is required for zstd compression")
+    def test_compress_zstd(self):
+        compressed = compress(self.data, "zstd")
+        self.assertEqual(detect_compression(compressed), "zstd")
+        self.assertEqual(decompress(compressed), self.data)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            compress(self.data, "rar")
+        self.assertIsNone(detect_compression(self.data))
+        with self.assertRaises(ValueError):
+            decompress(self.data)
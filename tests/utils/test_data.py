@@ -1,7 +1,11 @@
+import copy
+import pickle
 from typing import Any
 from unittest import TestCase
+from unittest.mock import Mock
 
 from datagrowth.utils import reach, override_dict, is_json_mimetype
+from datagrowth.utils.data import ReadOnlyDict, ReadOnlyList, read_only_view, ContentCache
 
 
 class TestPythonReach(TestCase):
@@ -133,3 +137,65 @@ class TestIsJSONMimetype(TestCase):
         self.assertTrue(is_json_mimetype("application/vnd.api+json"))
         self.assertFalse(is_json_mimetype("application/pdf"))
         self.assertFalse(is_json_mimetype("text/html"))
+
+
+class TestReadOnlyView(TestCase):
+
+    def test_read_only_view(self):
+        data = read_only_view({"list": [{"test": "test"}], "value": 1})
+        self.assertIsInstance(data, ReadOnlyDict)
+        self.assertIsInstance(data["list"], ReadOnlyList)
+        self.assertIsInstance(data["list"][0], ReadOnlyDict)
+        self.assertEqual(data, {"list": [{"test": "test"}], "value": 1})
+        with self.assertRaises(TypeError):
+            data["value"] = 2
+        with self.assertRaises(TypeError):
+            data.pop("value")
+        with self.assertRaises(TypeError):
+            data["list"].append(1)
+        with self.assertRaises(TypeError):
+            data["list"][0]["test"] = "changed"
+
+    def test_copies(self):
+        data = read_only_view({"list": [{"test": "test"}]})
+        mutable = copy.deepcopy(data)
+        self.assertIs(type(mutable), dict)
+        self.assertIs(type(mutable["list"]), list)
+        mutable["list"][0]["test"] = "changed"
+        self.assertEqual(data["list"][0]["test"], "test")
+        self.assertIs(type(copy.copy(data["list"])), list)
+        self.assertEqual(pickle.loads(pickle.dumps(data)), data)
+
+
+class TestContentCache(TestCase):
+
+    def test_get(self):
+        cache = ContentCache()
+        body = "{\"test\": 1}"
+        parse = Mock(return_value=("application/json", {"test": 1},))
+        self.assertEqual(cache.get((200, body,), parse), ("application/json", {"test": 1},))
+        self.assertEqual(cache.get((200, body,), parse), ("application/json", {"test": 1},))
+        self.assertEqual(parse.call_count, 1)
+        # Changing sources invalidates the cache
+        cache.get((404, body,), parse)
+        self.assertEqual(parse.call_count, 2)
+        cache.get((404, "{\"test\": 2}",), parse)
+        self.assertEqual(parse.call_count, 3)
+        # Changes inside sources invalidate the cache as well
+        command = {"args": ["first"]}
+        cache.get((0, command,), parse)
+        cache.get((0, command,), parse)
+        self.assertEqual(parse.call_count, 4)
+        command["args"].append("second")
+        cache.get((0, command,), parse)
+        self.assertEqual(parse.call_count, 5)
+
+    def test_get_read_only(self):
+        cache = ContentCache()
+        parse = Mock(return_value=("application/json", {"test": [1]},))
+        content_type, data = cache.get((200,), parse, read_only=True)
+        self.assertIsInstance(data, ReadOnlyDict)
+        self.assertIsInstance(data["test"], ReadOnlyList)
+        content_type, data = cache.get((200,), parse)
+        self.assertNotIsInstance(data, ReadOnlyDict)
+        self.assertEqual(parse.call_count, 2)
@@ -0,0 +1,68 @@
+from unittest import TestCase, skipIf
+
+from datagrowth.utils.fingerprints import (get_hasher, normalize_uri, normalize_legacy_uri, hash_legacy_data,
+                                           hash_signature, xxhash)
+
+
+class TestFingerprints(TestCase):
+
+    data = {"b": {"d": 1, "c": [1, 2]}, "a": "é", "e": {}}
+
+    def test_normalize_uri(self):
+        self.assertEqual(normalize_uri("http://localhost:8000/?z=z&a=a"), "localhost:8000/?a=a&z=z")
+        self.assertEqual(
+            normalize_uri("https://example.com/path?b=2&a=1&b=3&flag"),
+            "example.com/path?a=1&b=2&b=3&flag="
+        )
+        self.assertEqual(normalize_uri("example.com/?b=1&a=2"), "example.com/?a=2&b=1")
+        self.assertEqual(normalize_uri("http://example.com/path"), "example.com/path")
+
+    def test_normalize_legacy_uri(self):
+        # These outputs match the URLObject based normalization that legacy resources used before
+        self.assertEqual(normalize_legacy_uri("http://localhost:8000/?z=z&a=a"), "localhost:8000/?a=a&z=z")
+        self.assertEqual(normalize_legacy_uri("https://example.com/path?b=2;a=1&b=3"), "example.com/path?a=1&b=3")
+        self.assertEqual(
+            normalize_legacy_uri("http://example.com/?flag&empty=&q=a+b%20c"),
+            "example.com/?empty=&flag=None&q=a+b+c"
+        )
+        self.assertEqual(normalize_legacy_uri("example.com/?b=1&a=2"), "example.com/?a=2&b=1")
+        self.assertEqual(
+            normalize_legacy_uri("http://example.com/search?q=caf%C3%A9#results"),
+            "example.com/search?q=caf%C3%A9#results"
+        )
+
+    def test_hash_legacy_data(self):
+        self.assertEqual(hash_legacy_data({}), "")
+        self.assertEqual(hash_legacy_data(None, "blake2b"), "")
+        self.assertEqual(hash_legacy_data(self.data), "df5f54430c92527b19b62ce37db6ec48e1a4706d")
+        self.assertEqual(hash_legacy_data(self.data), hash_legacy_data(dict(reversed(self.data.items()))))
+        blake2b_hash = hash_legacy_data(self.data, "blake2b")
+        self.assertTrue(blake2b_hash.startswith("blake2b:"))
+        self.assertEqual(len(blake2b_hash), len("blake2b:") + 64)
+
+    def test_hash_signature(self):
+        data = {"b": (1, b"bytes"), "a": {"c": None}}
+        self.assertEqual(
+            hash_signature("example://resource", data),
+            28784510532938570837755707555896261346425026593899368394901694039267561161085
+        )
+        self.assertEqual(hash_signature("example://resource", data), hash_signature("example://resource", {
+            "a": {"c": None},
+            "b": [1, b"bytes"]
+        }))
+        self.assertNotEqual(hash_signature("example://resource", data, "blake2b"),
+                            hash_signature("example://resource", data))
+        with self.assertRaises(TypeError):
+            hash_signature("example://resource", {"a": object()})
+
+    @skipIf(xxhash is None, "The xxhash package is required for the xxh3_128 algorithm")
+    def test_xxhash(self):
+        self.assertEqual(len(hash_legacy_data(self.data, "xxh3_128")), len("xxh3_128:") + 32)
+        self.assertIsInstance(hash_signature("example://resource", self.data, "xxh3_128"), int)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            get_hasher("md5")
+        if xxhash is None:
+            with self.assertRaises(RuntimeError):
+                get_hasher("xxh3_128")
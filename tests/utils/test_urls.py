@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from datagrowth.utils.urls import parse_query, build_query, set_query_params, delete_query_params
+
+
+class TestURLs(TestCase):
+
+    def test_parse_query(self):
+        self.assertEqual(parse_query(""), [])
+        self.assertEqual(
+            parse_query("a=1&b=x+y;flag&empty=&a=%C3%A9"),
+            [("a", "1"), ("b", "x y"), ("flag", None), ("empty", ""), ("a", "é")]
+        )
+
+    def test_build_query(self):
+        self.assertEqual(build_query([]), "")
+        self.assertEqual(
+            build_query([("a", "x y"), ("flag", None), ("list", ["1", "2"]), ("number", 1), ("b", "é")]),
+            "a=x+y&flag&list=1&list=2&number=1&b=%C3%A9"
+        )
+
+    def test_set_query_params(self):
+        # These outputs match the outputs of URLObject.set_query_params
+        self.assertEqual(
+            set_query_params("http://example.com/path?b=2&a=1#results", {"b": "3", "c": "x y"}),
+            "http://example.com/path?b=3&a=1&c=x+y#results"
+        )
+        self.assertEqual(set_query_params("http://example.com/path", {}), "http://example.com/path")
+        self.assertEqual(set_query_params("http://example.com/?q=a%20b&flag", {}), "http://example.com/?q=a+b&flag")
+
+    def test_delete_query_params(self):
+        self.assertEqual(
+            delete_query_params("http://example.com/?key=secret&q=1&key=other", {"key": "secret"}),
+            "http://example.com/?q=1"
+        )
+        self.assertEqual(delete_query_params("http://example.com/?key=secret", ["key"]), "http://example.com/")